@@ -45,6 +45,7 @@ INSTALLED_APPS = [
     "ai_api_key",
     # "notifications",
     "appointments",
+    "jobs",
 ]
 
 MIDDLEWARE = [
@@ -122,12 +123,57 @@ TIME_ZONE = "UTC"
 USE_I18N = True
 
 USE_TZ = True
+# Must be shared by every process (web workers and the run_jobs worker):
+# dashboard, price quote and repair type name invalidation goes through
+# it. The database cache needs no extra service; its table is created by
+# migrate (callLogs 0014). Point CACHE_BACKEND / CACHE_LOCATION at Redis
+# (django.core.cache.backends.redis.RedisCache) for heavier traffic.
 CACHES = {
     "default": {
-        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
-        "LOCATION": "otp-cache",
+        "BACKEND": config(
+            "CACHE_BACKEND", default="django.core.cache.backends.db.DatabaseCache"
+        ),
+        "LOCATION": config("CACHE_LOCATION", default="django_cache"),
     }
 }
+if CACHES["default"]["BACKEND"].endswith(".DatabaseCache"):
+    # culls a third of its rows past MAX_ENTRIES (300 by default): room
+    # for every store's dashboard entries
+    CACHES["default"]["OPTIONS"] = {
+        "MAX_ENTRIES": config("CACHE_MAX_ENTRIES", default=10000, cast=int)
+    }
+# Processes read shared generation counters (api.generations) from the
+# default cache at most this often and reuse the last read in between
+CACHE_GENERATION_CHECK_SECONDS = config(
+    "CACHE_GENERATION_CHECK_SECONDS", default=1.0, cast=float
+)
+
+# Country calling code assumed for phone numbers stored without one
+DEFAULT_PHONE_COUNTRY_CODE = config("DEFAULT_PHONE_COUNTRY_CODE", default="1")
+
+# Call transcripts older than this are moved to the cold archive
+# (per-store override: CallRetentionPolicy)
+CALL_TRANSCRIPT_RETENTION_DAYS = config(
+    "CALL_TRANSCRIPT_RETENTION_DAYS", default=365, cast=int
+)
+CALL_ARCHIVE_ROOT = config("CALL_ARCHIVE_ROOT", default=str(BASE_DIR / "archive"))
+
+# Run background jobs right after commit (debounced ones after their delay,
+# on a timer thread) instead of queueing them for the run_jobs worker
+# (development without a worker); failures are logged only
+JOBS_EAGER = config("JOBS_EAGER", default=False, cast=bool)
+
+# AI RAG / system refreshes triggered within this many seconds of the first
+# one are sent as a single request per store
+AI_TRIGGER_DEBOUNCE_SECONDS = config(
+    "AI_TRIGGER_DEBOUNCE_SECONDS", default=10, cast=int
+)
+
+# AI service endpoints told to refresh a store's price list (RAG) and
+# behavior config (system). Only the refresh jobs need them, so management
+# commands run without.
+AI_RAG_URL = config("AI_RAG_URL", default="")
+AI_SYSTEM_URL = config("AI_SYSTEM_URL", default="")
 
 
 # Static files (CSS, JavaScript, Images)
@@ -0,0 +1,46 @@
+from django.contrib.auth.models import AnonymousUser
+from rest_framework.authentication import BaseAuthentication
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.settings import api_settings
+from ai_api_key.models import APIKey
+
+API_KEY_HEADER = "X-API-Key"
+
+
+class StoreAPIKeyAuthentication(BaseAuthentication):
+    """
+    Requests of the AI service, sent with "X-API-Key: <key>" of an active
+    APIKey. There is no user: request.auth is the APIKey and the request
+    may only touch the key's store.
+
+    Not a default authentication class: request.user is anonymous, so it is
+    only set on the AI-facing views (AI_AUTHENTICATION_CLASSES), which check
+    request_api_key before reading user.role.
+    """
+
+    def authenticate(self, request):
+        key = request.headers.get(API_KEY_HEADER)
+        if not key:
+            return None
+
+        api_key = APIKey.objects.filter(api_key=key, active=True).first()
+        if api_key is None:
+            raise AuthenticationFailed("Invalid API key.")
+        return AnonymousUser(), api_key
+
+    def authenticate_header(self, request):
+        return API_KEY_HEADER
+
+
+# the default authentication plus the AI service's key
+AI_AUTHENTICATION_CLASSES = [
+    *api_settings.DEFAULT_AUTHENTICATION_CLASSES,
+    StoreAPIKeyAuthentication,
+]
+
+
+def request_api_key(request):
+    """
+    The APIKey a request was authenticated with, or None
+    """
+    return request.auth if isinstance(request.auth, APIKey) else None
@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class AiBehaviorConfig(AppConfig):
     name = 'ai_behavior'
+
+    def ready(self):
+        import ai_behavior.jobs
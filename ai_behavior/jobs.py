@@ -0,0 +1,7 @@
+from ai_behavior.services.ai_system_trigger import trigger_ai_system_update
+from jobs.services.queue import job
+
+
+@job("ai_behavior.ai_system_update")
+def ai_system_update(store_id):
+    trigger_ai_system_update(store_id)
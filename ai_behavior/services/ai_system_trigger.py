@@ -1,13 +1,30 @@
-import requests
-import logging
-from decouple import config
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from jobs.services.http import session
+from jobs.services.queue import enqueue_debounced
 
-logger = logging.getLogger(__name__)
-AI_SYSTEM_URL = config("AI_SYSTEM_URL")
 
+def trigger_ai_system_update(store_id):
+    """
+    Ask the AI to reload a store's behavior config. Raises on failure so
+    the job is retried.
+    """
+    if not settings.AI_SYSTEM_URL:
+        raise ImproperlyConfigured("AI_SYSTEM_URL is not set.")
+    response = session.post(
+        settings.AI_SYSTEM_URL, json={"store_id": store_id}, timeout=5
+    )
+    response.raise_for_status()
 
-def trigger_ai_system_update():
-    try:
-        requests.post(AI_SYSTEM_URL, timeout=5)
-    except Exception as e:
-        logger.error(f"AI system update failed: {str(e)}")
+
+def schedule_ai_system_update(store_id):
+    """
+    Queue a system refresh for the store; refreshes scheduled within
+    AI_TRIGGER_DEBOUNCE_SECONDS of each other are sent once
+    """
+    enqueue_debounced(
+        "ai_behavior.ai_system_update",
+        f"store:{store_id}",
+        settings.AI_TRIGGER_DEBOUNCE_SECONDS,
+        store_id=store_id,
+    )
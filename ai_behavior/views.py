@@ -9,8 +9,7 @@ from ai_behavior.serializers import (
 )
 from api.permissions import AIBehaviorPermission
 from drf_yasg.utils import swagger_auto_schema
-import threading
-from ai_behavior.services.ai_system_trigger import trigger_ai_system_update
+from ai_behavior.services.ai_system_trigger import schedule_ai_system_update
 
 
 ###### --> Custom mixin ##########
@@ -74,7 +73,7 @@ class AutoTransferKeywordListCreateView(
         if not ai_behavior_config:
             raise serializers.ValidationError("Invalid store or AI config not found.")
         serializer.save(ai_behavior_config=ai_behavior_config)
-        threading.Thread(target=trigger_ai_system_update).start()
+        schedule_ai_system_update(ai_behavior_config.store_id)
 
 
 class AutoTransferKeywordDetailView(
@@ -130,7 +129,7 @@ class AutoTransferKeywordDetailView(
 
     def perform_destroy(self, instance):
         instance.delete()
-        threading.Thread(target=trigger_ai_system_update).start()
+        schedule_ai_system_update(self.get_ai_behavior_config().store_id)
 
 
 class AIBehaviorConfigCreateView(generics.CreateAPIView):
@@ -157,7 +156,7 @@ class AIBehaviorConfigCreateView(generics.CreateAPIView):
             )
 
         serializer.save(store_id=store_id)
-        threading.Thread(target=trigger_ai_system_update).start()
+        schedule_ai_system_update(serializer.instance.store_id)
 
 
 class AIBehaviorConfigDetailView(generics.RetrieveUpdateAPIView):
@@ -201,4 +200,4 @@ class AIBehaviorConfigDetailView(generics.RetrieveUpdateAPIView):
 
     def perform_update(self, serializer):
         serializer.save()
-        threading.Thread(target=trigger_ai_system_update).start()
+        schedule_ai_system_update(serializer.instance.store_id)
@@ -0,0 +1,58 @@
+import time
+from django.conf import settings
+from django.core.cache import cache
+
+# Generation counters in the default cache, which is shared by every web
+# worker and the run_jobs worker (checked by callLogs.checks). A process
+# reads a counter from the cache at most once per
+# CACHE_GENERATION_CHECK_SECONDS and serves its last read in between, so
+# a hot path costs no cache round trip; a bump made elsewhere is seen
+# within that interval. Bumps made by this process are seen at once.
+
+# key -> (monotonic time of the read, generation)
+_seen = {}
+
+
+def _new_generation():
+    # time based: a generation lost to eviction never comes back with an
+    # old value, so what was built under it can not be served again
+    return time.time_ns()
+
+
+def get_generations(keys):
+    """
+    Current generation of each key, created on first use
+    """
+    now = time.monotonic()
+    interval = settings.CACHE_GENERATION_CHECK_SECONDS
+    generations = {}
+    stale = []
+    for key in keys:
+        seen = _seen.get(key)
+        if seen is not None and now - seen[0] < interval:
+            generations[key] = seen[1]
+        else:
+            stale.append(key)
+
+    if stale:
+        fetched = cache.get_many(stale)
+        for key in stale:
+            if key not in fetched:
+                cache.add(key, _new_generation(), None)
+                fetched[key] = cache.get(key)
+            generations[key] = fetched[key]
+            _seen[key] = (now, fetched[key])
+    return [generations[key] for key in keys]
+
+
+def bump_generations(keys):
+    """
+    Give every key a new generation
+    """
+    # a plain set, not incr: incr is a read-modify-write in most backends,
+    # and any new value makes what was built under the old one unreachable
+    generation = _new_generation()
+    cache.set_many({key: generation for key in keys}, None)
+    now = time.monotonic()
+    for key in keys:
+        _seen[key] = (now, generation)
@@ -1,5 +1,6 @@
 from rest_framework.permissions import BasePermission, SAFE_METHODS
 from accounts.models import UserRole
+from ai_api_key.authentication import request_api_key
 
 
 class PriceListPermission(BasePermission):
@@ -35,6 +36,17 @@ class PriceListPermission(BasePermission):
         return False
 
 
+class IsAuthenticatedOrStoreAPIKey(BasePermission):
+    """
+    Logged in users, or the AI service with its store's X-API-Key
+    """
+
+    def has_permission(self, request, view):
+        return bool(request.user and request.user.is_authenticated) or (
+            request_api_key(request) is not None
+        )
+
+
 class PriceListReadOnlyPermission(BasePermission):
     def has_permission(self, request, view):
         return request.method in SAFE_METHODS
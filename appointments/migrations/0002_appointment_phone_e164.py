@@ -0,0 +1,24 @@
+# Generated by Django 6.0 on 2026-10-17 23:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('appointments', '0001_initial'),
+        ('price_list', '0004_alter_pricelist_unique_together'),
+        ('store', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='appointment',
+            name='phone_e164',
+            field=models.CharField(blank=True, default='', max_length=16),
+        ),
+        migrations.AddIndex(
+            model_name='appointment',
+            index=models.Index(fields=['store', 'phone_e164', '-date'], name='appointment_store_phone_idx'),
+        ),
+    ]
@@ -3,6 +3,7 @@ from django.core.exceptions import ValidationError
 from store.models import Store
 from price_list.models import RepairType, DeviceModel, Brand, Category
 from datetime import datetime, timedelta
+from callLogs.utils import normalize_phone
 
 
 class StoreSchedule(models.Model):
@@ -62,6 +63,7 @@ class Appointment(models.Model):
     client_name = models.CharField(max_length=200)
     client_email = models.EmailField()
     client_phone = models.CharField(max_length=20)
+    phone_e164 = models.CharField(max_length=16, blank=True, default="")
 
     repair_type = models.ForeignKey(RepairType, on_delete=models.CASCADE)
     category = models.ForeignKey(Category, on_delete=models.CASCADE)
@@ -77,10 +79,23 @@ class Appointment(models.Model):
 
     class Meta:
         unique_together = ("store", "date", "start_time")
+        indexes = [
+            models.Index(
+                fields=["store", "phone_e164", "-date"],
+                name="appointment_store_phone_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.client_name} - {self.store.name} - {self.date} {self.start_time}"
 
+    def save(self, *args, **kwargs):
+        self.phone_e164 = normalize_phone(self.client_phone)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "client_phone" in update_fields:
+            kwargs["update_fields"] = {*update_fields, "phone_e164"}
+        super().save(*args, **kwargs)
+
 
 def generate_available_slots(store, target_date):
     schedule = store.schedules.filter(day=target_date.weekday(), is_open=True).first()
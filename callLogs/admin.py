@@ -1,6 +1,13 @@
 from django.contrib import admin
-from callLogs.models import CallSession, CallTranscript
+from callLogs.models import (
+    CallSession,
+    CallTranscript,
+    CallDailyRollup,
+    CallRetentionPolicy,
+)
 
 # Register your models here.
 admin.site.register(CallSession)
 admin.site.register(CallTranscript)
+admin.site.register(CallDailyRollup)
+admin.site.register(CallRetentionPolicy)
@@ -3,3 +3,8 @@ from django.apps import AppConfig
 
 class CalllogsConfig(AppConfig):
     name = 'callLogs'
+
+    def ready(self):
+        import callLogs.checks
+        import callLogs.jobs
+        import callLogs.signals
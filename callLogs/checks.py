@@ -0,0 +1,27 @@
+from django.conf import settings
+from django.core.checks import Error, register
+
+# caches that are not shared between processes
+LOCAL_CACHES = (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+)
+
+
+@register()
+def check_shared_cache(app_configs, **kwargs):
+    backend = settings.CACHES.get("default", {}).get("BACKEND")
+    if backend not in LOCAL_CACHES:
+        return []
+    return [
+        Error(
+            f"The default cache ({backend}) is not shared between processes.",
+            hint=(
+                "Cached dashboards, price quotes and repair type names are "
+                "invalidated through the default cache, so web workers and "
+                "the run_jobs worker must share it: use the database cache "
+                "or Redis."
+            ),
+            id="callLogs.E001",
+        )
+    ]
@@ -0,0 +1,21 @@
+from django.db import transaction
+from callLogs.services.dashboard_cache import bump_store_generations
+from callLogs.services.funnel import invalidate_call_funnel_days
+from callLogs.services.rollups import call_from_values, record_calls
+from jobs.services.queue import job
+
+
+@job("callLogs.record_rollups")
+def record_call_rollups(added=(), removed=()):
+    """
+    Apply finished / updated / deleted calls to the rollups. added and
+    removed are rollup_values() taken when the call was written.
+    """
+    calls = [call_from_values(values) for values in added]
+    removed = [call_from_values(values) for values in removed]
+    record_calls(calls, removed)
+
+    # dashboards read the rollups: drop what was cached before this update
+    store_ids = {call.store_id for call in calls + removed}
+    transaction.on_commit(lambda: bump_store_generations(store_ids))
+    transaction.on_commit(lambda: invalidate_call_funnel_days(calls + removed))
@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand
+from callLogs.services.archive import archive_transcripts, retention_cutoffs
+
+
+class Command(BaseCommand):
+    help = (
+        "Move call transcripts older than the store's retention period into "
+        "gzip NDJSON archive files (per store and month) and delete the rows"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--store", type=int, action="append", help="Only archive these store IDs"
+        )
+        parser.add_argument(
+            "--batch-size", type=int, default=500, help="Calls per archive batch"
+        )
+
+    def handle(self, *args, **options):
+        total_calls = 0
+        total_transcripts = 0
+
+        for store_id, cutoff in retention_cutoffs(options["store"]).items():
+            calls, transcripts = archive_transcripts(
+                store_id, cutoff, batch_size=options["batch_size"]
+            )
+            if calls:
+                self.stdout.write(
+                    f"Store {store_id}: archived {transcripts} transcripts "
+                    f"of {calls} calls started before {cutoff:%Y-%m-%d}"
+                )
+            total_calls += calls
+            total_transcripts += transcripts
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Done: {total_transcripts} transcripts of {total_calls} calls archived"
+            )
+        )
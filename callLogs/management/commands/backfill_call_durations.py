@@ -0,0 +1,65 @@
+from django.core.management.base import BaseCommand
+from callLogs.models import CallSession
+from callLogs.services.rollups import rebuild_rollups
+from callLogs.utils import parse_duration
+
+
+class Command(BaseCommand):
+    help = (
+        "Fill CallSession.duration_seconds from the duration string in batches "
+        "and rebuild the rollups of the stores it filled"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=2000)
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        last_id = 0
+        updated = 0
+        skipped = 0
+        store_ids = set()
+
+        while True:
+            # keyset walk over pk so each batch is an index range scan
+            batch = list(
+                CallSession.objects.filter(
+                    pk__gt=last_id, duration_seconds__isnull=True
+                )
+                .order_by("pk")
+                .values_list("pk", "store_id", "duration")[:batch_size]
+            )
+            if not batch:
+                break
+
+            last_id = batch[-1][0]
+            calls = []
+            for pk, store_id, duration in batch:
+                try:
+                    seconds = parse_duration(duration)
+                except ValueError:
+                    seconds = None
+
+                if seconds is None:
+                    skipped += 1
+                    continue
+                calls.append(CallSession(pk=pk, duration_seconds=seconds))
+                store_ids.add(store_id)
+
+            CallSession.objects.bulk_update(calls, ["duration_seconds"])
+            updated += len(calls)
+            self.stdout.write(f"Backfilled {updated} calls (last id {last_id})")
+
+        # bulk_update sends no signals: the rollups of these calls still
+        # count them without a duration
+        if store_ids:
+            rebuilt = rebuild_rollups(store_ids=sorted(store_ids))
+            self.stdout.write(
+                f"Rebuilt {rebuilt} rollup rows of {len(store_ids)} stores"
+            )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Done: {updated} calls updated, {skipped} without a usable duration"
+            )
+        )
@@ -0,0 +1,50 @@
+from django.core.management.base import BaseCommand
+from appointments.models import Appointment
+from callLogs.models import CallSession
+from callLogs.services.funnel import invalidate_funnel_stores
+from callLogs.utils import normalize_phone
+
+
+class Command(BaseCommand):
+    help = (
+        "Fill CallSession.phone_e164 and Appointment.phone_e164 from the "
+        "free-form phone numbers in batches"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=2000)
+
+    def handle(self, *args, **options):
+        self.backfill(CallSession, "phone_number", options["batch_size"])
+        self.backfill(Appointment, "client_phone", options["batch_size"])
+        # bookings are attributed to calls by phone_e164
+        invalidate_funnel_stores()
+
+    def backfill(self, model, phone_field, batch_size):
+        name = model._meta.verbose_name_plural
+        last_id = 0
+        updated = 0
+
+        while True:
+            # keyset walk over pk so each batch is an index range scan
+            batch = list(
+                model.objects.filter(pk__gt=last_id, phone_e164="")
+                .order_by("pk")
+                .values_list("pk", phone_field)[:batch_size]
+            )
+            if not batch:
+                break
+
+            last_id = batch[-1][0]
+            rows = [
+                model(pk=pk, phone_e164=phone_e164)
+                for pk, phone in batch
+                if (phone_e164 := normalize_phone(phone))
+            ]
+
+            # bulk_update skips save(), so no signals or re-normalizing
+            model.objects.bulk_update(rows, ["phone_e164"])
+            updated += len(rows)
+            self.stdout.write(f"Backfilled {updated} {name} (last id {last_id})")
+
+        self.stdout.write(self.style.SUCCESS(f"Done: {updated} {name} updated"))
@@ -0,0 +1,133 @@
+import random
+import time
+from datetime import timedelta
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils import timezone
+from callLogs.models import CallSession, CallType
+from callLogs.utils import day_start
+from store.models import Store
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a throwaway CallSession dataset and compare query plans and "
+        "timings of the call log hot filters with and without the composite "
+        "indexes. Everything is rolled back at the end."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=1_000_000)
+        parser.add_argument("--stores", type=int, default=200)
+        parser.add_argument("--days", type=int, default=365)
+        parser.add_argument("--batch-size", type=int, default=10_000)
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            store_id = self.seed(options)
+            queries = self.hot_queries(store_id)
+
+            self.stdout.write(self.style.MIGRATE_HEADING("With composite indexes"))
+            self.run_queries(queries, options["repeat"])
+
+            with connection.cursor() as cursor:
+                for index in CallSession._meta.indexes:
+                    cursor.execute(
+                        f"DROP INDEX {connection.ops.quote_name(index.name)}"
+                    )
+            self.analyze()
+
+            self.stdout.write(self.style.MIGRATE_HEADING("Without composite indexes"))
+            self.run_queries(queries, options["repeat"])
+
+            transaction.set_rollback(True)
+
+    def seed(self, options):
+        stores = Store.objects.bulk_create(
+            [
+                Store(name=f"Bench store {i}", location="bench")
+                for i in range(options["stores"])
+            ]
+        )
+        store_ids = [store.id for store in stores]
+        call_types = [choice for choice, _ in CallType.choices]
+        now = timezone.now()
+        seconds_range = options["days"] * 86400
+
+        self.stdout.write(f"Seeding {options['rows']} calls ...")
+        remaining = options["rows"]
+        while remaining > 0:
+            size = min(options["batch_size"], remaining)
+            batch = []
+            for _ in range(size):
+                started_at = now - timedelta(seconds=random.randint(0, seconds_range))
+                batch.append(
+                    CallSession(
+                        store_id=random.choice(store_ids),
+                        phone_number="+15550000000",
+                        call_type=random.choice(call_types),
+                        duration="02:00",
+                        duration_seconds=120,
+                        started_at=started_at,
+                    )
+                )
+            CallSession.objects.bulk_create(batch)
+            remaining -= size
+
+        # created_at is auto_now_add, spread it like started_at for realistic plans
+        CallSession.objects.filter(store_id__in=store_ids).update(
+            created_at=F("started_at")
+        )
+        self.analyze()
+        return store_ids[0]
+
+    def analyze(self):
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+    def hot_queries(self, store_id):
+        today = timezone.localdate()
+        start_month = today.replace(day=1)
+        tomorrow = day_start(today + timedelta(days=1))
+        calls = CallSession.objects.filter(store_id=store_id)
+
+        return [
+            (
+                "list today (created_at__date)",
+                calls.filter(created_at__date=today),
+            ),
+            (
+                "list today (half-open range)",
+                calls.filter(created_at__gte=day_start(today), created_at__lt=tomorrow),
+            ),
+            (
+                "dashboard month (started_at__date__gte)",
+                calls.filter(started_at__date__gte=start_month),
+            ),
+            (
+                "dashboard month (half-open range)",
+                calls.filter(started_at__gte=day_start(start_month)),
+            ),
+            (
+                "dashboard month by call_type (half-open range)",
+                calls.filter(
+                    call_type=CallType.AI_RESOLVED,
+                    started_at__gte=day_start(start_month),
+                ),
+            ),
+        ]
+
+    def run_queries(self, queries, repeat):
+        for label, qs in queries:
+            timings = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                count = qs.count()
+                timings.append(time.perf_counter() - started)
+
+            self.stdout.write(
+                f"{label}: {count} rows, best {min(timings) * 1000:.2f} ms"
+            )
+            self.stdout.write(f"    {qs.explain()}")
@@ -0,0 +1,137 @@
+import random
+import time
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from callLogs.models import CallSession, CallTranscript, CallType, Speaker
+from callLogs.services import transcript_search
+from store.models import Store
+
+VOCABULARY = (
+    "phone screen camera speaker microphone button replace repair price quote "
+    "today tomorrow appointment warranty iphone samsung galaxy pixel ipad "
+    "tablet laptop console software update broken dropped slow hello thanks "
+    "please how much does it cost can you fix my the a is on with for"
+).split() + [f"word{i}" for i in range(5000)]
+
+# one message in this many mentions one of the benchmark queries
+HIT_RATE = 1000
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a throwaway transcript corpus and compare the full-text index "
+        "against an icontains scan. Everything is rolled back at the end."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--messages", type=int, default=10_000_000)
+        parser.add_argument("--messages-per-call", type=int, default=40)
+        parser.add_argument("--stores", type=int, default=50)
+        parser.add_argument("--batch-size", type=int, default=20_000)
+        parser.add_argument("--repeat", type=int, default=3)
+        parser.add_argument(
+            "--query",
+            action="append",
+            help="Query to benchmark (default: a few typical manager searches)",
+        )
+
+    def handle(self, *args, **options):
+        if transcript_search.search_backend() is None:
+            raise CommandError("No full-text index on this database")
+
+        queries = options["query"] or [
+            "water damage",
+            "cracked back glass",
+            "swollen battery",
+        ]
+
+        with transaction.atomic():
+            store_id = self.seed(options, queries)
+
+            for query in queries:
+                words = query.split()
+                for label, scope in [("all stores", None), ("one store", [store_id])]:
+                    fts = self.best_of(
+                        options["repeat"],
+                        lambda: transcript_search.search_transcripts(query, scope),
+                    )
+                    scan = self.best_of(
+                        options["repeat"], lambda: self.scan(words, scope)
+                    )
+                    self.stdout.write(
+                        f"{query!r} ({label}): full-text {fts * 1000:.1f} ms, "
+                        f"icontains {scan * 1000:.1f} ms"
+                    )
+
+            transaction.set_rollback(True)
+
+    def scan(self, words, store_ids):
+        # what ranking needs without an index: every matching message
+        transcripts = CallTranscript.objects.all()
+        for word in words:
+            transcripts = transcripts.filter(message__icontains=word)
+        if store_ids is not None:
+            transcripts = transcripts.filter(call__store_id__in=store_ids)
+        return list(transcripts.values_list("call_id", "message"))
+
+    def best_of(self, repeat, func):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - started)
+        return min(timings)
+
+    def message(self, queries):
+        words = random.choices(VOCABULARY, k=12)
+        if random.randrange(HIT_RATE) == 0:
+            words.append(random.choice(queries))
+        return " ".join(words)
+
+    def seed(self, options, queries):
+        stores = Store.objects.bulk_create(
+            [
+                Store(name=f"Bench store {i}", location="bench")
+                for i in range(options["stores"])
+            ]
+        )
+        store_ids = [store.id for store in stores]
+        now = timezone.now()
+        per_call = options["messages_per_call"]
+        speakers = [Speaker.AI, Speaker.CUSTOMER]
+
+        self.stdout.write(f"Seeding {options['messages']} transcript messages ...")
+        remaining = options["messages"]
+        started = time.perf_counter()
+        while remaining > 0:
+            size = min(options["batch_size"], remaining)
+            calls = CallSession.objects.bulk_create(
+                [
+                    CallSession(
+                        store_id=random.choice(store_ids),
+                        phone_number="+15550000000",
+                        call_type=CallType.AI_RESOLVED,
+                        duration="05:00",
+                        duration_seconds=300,
+                        started_at=now,
+                    )
+                    for _ in range(max(size // per_call, 1))
+                ]
+            )
+            CallTranscript.objects.bulk_create(
+                [
+                    CallTranscript(
+                        call=calls[i % len(calls)],
+                        speaker=speakers[i % 2],
+                        message=self.message(queries),
+                        sequence=i,
+                        timestamp=now,
+                    )
+                    for i in range(size)
+                ]
+            )
+            remaining -= size
+
+        self.stdout.write(f"Seeded in {time.perf_counter() - started:.1f} s")
+        return store_ids[0]
@@ -0,0 +1,144 @@
+import random
+import time
+from django.core.management.base import BaseCommand
+from django.db import DatabaseError, connection, transaction
+from django.db.models import Sum
+from django.db.models.functions import Length
+from django.utils import timezone
+from callLogs.models import (
+    CallSession,
+    CallTranscript,
+    CallTranscriptBlob,
+    CallType,
+    Speaker,
+)
+from callLogs.serializers import CallSessionSerializer
+from callLogs.services.transcript_packing import pack_calls
+from callLogs.views import CallSessionViewSet
+from store.models import Store
+
+WORDS = (
+    "hi thanks for calling how can I help my iphone screen is cracked we can "
+    "replace that today the price is with tax would you like an appointment "
+    "yes please what time works tomorrow morning great see you then"
+).split()
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed throwaway calls and compare transcript rows against packed "
+        "transcript blobs: row counts, table size and retrieve latency. "
+        "Everything is rolled back at the end."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--calls", type=int, default=2000)
+        parser.add_argument("--messages-per-call", type=int, default=200)
+        parser.add_argument("--batch-size", type=int, default=200)
+        parser.add_argument("--samples", type=int, default=200)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            call_ids = self.seed(options)
+            sample = random.sample(call_ids, min(options["samples"], len(call_ids)))
+
+            self.stdout.write(self.style.MIGRATE_HEADING("Transcript rows"))
+            self.report(call_ids, sample)
+
+            started = time.perf_counter()
+            for i in range(0, len(call_ids), options["batch_size"]):
+                pack_calls(call_ids[i : i + options["batch_size"]])
+            self.stdout.write(f"Packed in {time.perf_counter() - started:.1f} s")
+
+            self.stdout.write(self.style.MIGRATE_HEADING("Packed blobs"))
+            self.report(call_ids, sample)
+
+            transaction.set_rollback(True)
+
+    def seed(self, options):
+        store = Store.objects.create(name="Bench store", location="bench")
+        now = timezone.now()
+        speakers = [Speaker.AI, Speaker.CUSTOMER]
+        call_ids = []
+
+        self.stdout.write(
+            f"Seeding {options['calls']} calls x "
+            f"{options['messages_per_call']} messages ..."
+        )
+        remaining = options["calls"]
+        while remaining > 0:
+            size = min(options["batch_size"], remaining)
+            calls = CallSession.objects.bulk_create(
+                [
+                    CallSession(
+                        store=store,
+                        phone_number="+15550000000",
+                        call_type=CallType.AI_RESOLVED,
+                        duration="10:00",
+                        duration_seconds=600,
+                        started_at=now,
+                    )
+                    for _ in range(size)
+                ]
+            )
+            CallTranscript.objects.bulk_create(
+                [
+                    CallTranscript(
+                        call=call,
+                        speaker=speakers[i % 2],
+                        message=" ".join(random.choices(WORDS, k=random.randint(4, 25))),
+                        sequence=i,
+                        timestamp=now,
+                    )
+                    for call in calls
+                    for i in range(options["messages_per_call"])
+                ]
+            )
+            call_ids += [call.id for call in calls]
+            remaining -= size
+        return call_ids
+
+    def report(self, call_ids, sample):
+        rows = CallTranscript.objects.filter(call_id__in=call_ids).count()
+        blobs = CallTranscriptBlob.objects.filter(call_id__in=call_ids).count()
+        self.stdout.write(f"rows: {rows} transcript, {blobs} blob")
+
+        for table in [CallTranscript._meta.db_table, CallTranscriptBlob._meta.db_table]:
+            self.stdout.write(f"{table}: {self.table_size(table)}")
+
+        queryset = CallSessionViewSet.queryset
+        timings = []
+        for call_id in sample:
+            started = time.perf_counter()
+            CallSessionSerializer(queryset.get(pk=call_id)).data
+            timings.append(time.perf_counter() - started)
+        timings.sort()
+        self.stdout.write(
+            f"retrieve: median {timings[len(timings) // 2] * 1000:.2f} ms, "
+            f"p95 {timings[int(len(timings) * 0.95)] * 1000:.2f} ms"
+        )
+
+    def table_size(self, table):
+        with connection.cursor() as cursor:
+            try:
+                if connection.vendor == "postgresql":
+                    cursor.execute("SELECT pg_total_relation_size(%s)", [table])
+                    return f"{cursor.fetchone()[0] / 1024 / 1024:.1f} MB"
+                if connection.vendor == "sqlite":
+                    # savepoint: a missing dbstat table must not break the
+                    # outer transaction
+                    with transaction.atomic():
+                        cursor.execute(
+                            "SELECT SUM(pgsize) FROM dbstat WHERE name = %s", [table]
+                        )
+                        size = cursor.fetchone()[0] or 0
+                    return f"{size / 1024 / 1024:.1f} MB"
+            except DatabaseError:
+                pass
+
+        # no size statistics: payload bytes only
+        if table == CallTranscript._meta.db_table:
+            payload = CallTranscript.objects.aggregate(size=Sum(Length("message")))
+        else:
+            payload = CallTranscriptBlob.objects.aggregate(size=Sum(Length("data")))
+        return f"~{(payload['size'] or 0) / 1024 / 1024:.1f} MB payload"
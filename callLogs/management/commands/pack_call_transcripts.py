@@ -0,0 +1,60 @@
+from datetime import timedelta
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from callLogs.models import CallSession, CallStatus
+from callLogs.services.transcript_packing import pack_calls
+
+
+class Command(BaseCommand):
+    help = (
+        "Pack the transcript rows of finished calls into one compressed blob "
+        "per call. Packed transcripts stay searchable through the blob's "
+        "search text."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--older-than-days",
+            type=int,
+            default=30,
+            help="Only pack calls started more than this many days ago",
+        )
+        parser.add_argument(
+            "--store", type=int, action="append", help="Only pack these store IDs"
+        )
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        calls = CallSession.objects.filter(
+            status=CallStatus.COMPLETED,
+            started_at__lt=timezone.now() - timedelta(days=options["older_than_days"]),
+            transcript_blob__isnull=True,
+            transcript_archive="",
+        )
+        if options["store"]:
+            calls = calls.filter(store_id__in=options["store"])
+
+        packed = 0
+        deleted = 0
+        last_id = 0
+        while True:
+            # keyset walk over pk so each batch is an index range scan
+            batch = list(
+                calls.filter(pk__gt=last_id)
+                .order_by("pk")
+                .values_list("pk", flat=True)[: options["batch_size"]]
+            )
+            if not batch:
+                break
+            last_id = batch[-1]
+
+            batch_packed, batch_deleted = pack_calls(batch)
+            packed += batch_packed
+            deleted += batch_deleted
+            self.stdout.write(f"Packed {packed} calls (last id {last_id})")
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Done: {packed} calls packed, {deleted} transcript rows removed"
+            )
+        )
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+from callLogs.services.rollups import rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = "Rebuild CallDailyRollup rows from the raw CallSession table"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--store", type=int, action="append", help="Only rebuild these store IDs"
+        )
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        created = rebuild_rollups(
+            store_ids=options["store"], batch_size=options["batch_size"]
+        )
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {created} rollup rows"))
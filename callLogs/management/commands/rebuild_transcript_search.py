@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+from django.db import connection
+from callLogs.services.transcript_search import install_search_index
+
+
+class Command(BaseCommand):
+    help = (
+        "(Re)create the transcript full-text indexes and reindex every "
+        "transcript, packed ones included. Run after migrations that rebuild the transcript table "
+        "on SQLite, which drops the sync triggers."
+    )
+
+    def handle(self, *args, **options):
+        if install_search_index(connection):
+            self.stdout.write(self.style.SUCCESS("Transcript search index rebuilt"))
+        else:
+            self.stdout.write(
+                self.style.WARNING(
+                    f"No full-text support on {connection.vendor}, "
+                    "search falls back to icontains"
+                )
+            )
@@ -0,0 +1,18 @@
+# Generated by Django 6.0 on 2026-10-17 23:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('callLogs', '0003_callsession_store'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='callsession',
+            name='duration_seconds',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+    ]
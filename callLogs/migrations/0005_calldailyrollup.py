@@ -0,0 +1,31 @@
+# Generated by Django 6.0 on 2026-10-17 23:38
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('callLogs', '0004_callsession_duration_seconds'),
+        ('store', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CallDailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('call_type', models.CharField(choices=[('AI_RESOLVED', 'AI Resolved'), ('WARM_TRANSFER', 'Warm Transfer'), ('DROPPED', 'Dropped'), ('APPOINTMENT', 'Appointment')], max_length=20)),
+                ('outcome', models.CharField(blank=True, choices=[('QUOTE_PROVIDED', 'Quote Provided'), ('APPOINTMENT_BOOKED', 'Appointment Booked'), ('ESCALATED', 'Escalated to Technician'), ('CALL_DROPPED', 'Call Dropped')], default='', max_length=30)),
+                ('call_count', models.PositiveIntegerField(default=0)),
+                ('duration_total', models.PositiveBigIntegerField(default=0)),
+                ('duration_count', models.PositiveIntegerField(default=0)),
+                ('store', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='call_rollups', to='store.store')),
+            ],
+            options={
+                'unique_together': {('store', 'date', 'call_type', 'outcome')},
+            },
+        ),
+    ]
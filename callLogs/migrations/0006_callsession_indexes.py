@@ -0,0 +1,27 @@
+# Generated by Django 6.0 on 2026-10-17 23:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('callLogs', '0005_calldailyrollup'),
+        ('price_list', '0004_alter_pricelist_unique_together'),
+        ('store', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='callsession',
+            index=models.Index(fields=['store', 'started_at'], name='call_store_started_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='callsession',
+            index=models.Index(fields=['store', 'call_type', 'started_at'], name='call_store_type_started_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='callsession',
+            index=models.Index(fields=['store', 'created_at'], name='call_store_created_idx'),
+        ),
+    ]
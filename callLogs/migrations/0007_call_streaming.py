@@ -0,0 +1,27 @@
+# Generated by Django 6.0 on 2026-10-17 23:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('callLogs', '0006_callsession_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='callsession',
+            name='status',
+            field=models.CharField(choices=[('IN_PROGRESS', 'In Progress'), ('COMPLETED', 'Completed')], default='COMPLETED', max_length=20),
+        ),
+        migrations.AddField(
+            model_name='calltranscript',
+            name='sequence',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddConstraint(
+            model_name='calltranscript',
+            constraint=models.UniqueConstraint(fields=('call', 'sequence'), name='calltranscript_call_sequence_uniq'),
+        ),
+    ]
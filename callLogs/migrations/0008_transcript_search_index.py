@@ -0,0 +1,29 @@
+# Generated by Django 6.0 on 2026-10-17 23:45
+
+from django.db import migrations
+
+from callLogs.services.transcript_search import (
+    install_search_index,
+    uninstall_search_index,
+)
+
+
+def create_search_index(apps, schema_editor):
+    install_search_index(schema_editor.connection)
+
+
+def drop_search_index(apps, schema_editor):
+    uninstall_search_index(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY on PostgreSQL can not run in a transaction
+    atomic = False
+
+    dependencies = [
+        ('callLogs', '0007_call_streaming'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
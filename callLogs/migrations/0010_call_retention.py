@@ -0,0 +1,37 @@
+# Generated by Django 6.0 on 2026-10-17 23:52
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('callLogs', '0009_callsession_phone_e164'),
+        ('store', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='callsession',
+            name='transcript_archive',
+            field=models.CharField(blank=True, default='', max_length=255),
+        ),
+        migrations.AddField(
+            model_name='callsession',
+            name='transcript_archive_offset',
+            field=models.PositiveBigIntegerField(blank=True, null=True),
+        ),
+        migrations.CreateModel(
+            name='CallRetentionPolicy',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('transcript_days', models.PositiveIntegerField(help_text='Transcripts of calls older than this are archived')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('store', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='call_retention_policy', to='store.store')),
+            ],
+            options={
+                'verbose_name_plural': 'call retention policies',
+            },
+        ),
+    ]
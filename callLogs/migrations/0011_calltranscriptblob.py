@@ -0,0 +1,23 @@
+# Generated by Django 6.0 on 2026-10-17 23:53
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('callLogs', '0010_call_retention'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CallTranscriptBlob',
+            fields=[
+                ('call', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='transcript_blob', serialize=False, to='callLogs.callsession')),
+                ('data', models.BinaryField()),
+                ('message_count', models.PositiveIntegerField()),
+                ('packed_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+    ]
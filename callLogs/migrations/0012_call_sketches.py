@@ -0,0 +1,28 @@
+# Generated by Django 6.0 on 2026-10-18 00:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('callLogs', '0011_calltranscriptblob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='calldailyrollup',
+            name='answer_sketch',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.AddField(
+            model_name='calldailyrollup',
+            name='duration_sketch',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.AddField(
+            model_name='callsession',
+            name='answered_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 6.0 on 2026-10-18 00:10
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    # Dashboards read CallDailyRollup only. The rows for calls stored before
+    # the rollups existed are not built here: that is a scan of the whole
+    # call table inside migrate, and duration_seconds of old calls is only
+    # filled by backfill_call_durations. Run, after migrating:
+    #
+    #     manage.py backfill_call_durations   (rebuilds the stores it fills)
+    #     manage.py rebuild_call_rollups      (if it had nothing to fill)
+
+    dependencies = [
+        ('callLogs', '0012_call_sketches'),
+    ]
+
+    operations = []
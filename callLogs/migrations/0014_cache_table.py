@@ -0,0 +1,21 @@
+# Generated by Django 6.0 on 2026-10-18 00:12
+
+from django.core.management import call_command
+from django.db import migrations
+
+
+def create_cache_table(apps, schema_editor):
+    # the default cache is the database cache unless CACHE_BACKEND says
+    # otherwise; createcachetable skips other backends and existing tables
+    call_command("createcachetable", database=schema_editor.connection.alias)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('callLogs', '0013_backfill_call_rollups'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_cache_table, migrations.RunPython.noop),
+    ]
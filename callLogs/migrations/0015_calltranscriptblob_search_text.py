@@ -0,0 +1,51 @@
+# Generated by Django 6.0 on 2026-10-18 00:14
+
+from django.db import migrations, models
+
+from callLogs.services.transcript_packing import search_text, unpack
+from callLogs.services.transcript_search import (
+    install_blob_search_index,
+    uninstall_blob_search_index,
+)
+
+
+def fill_search_text(apps, schema_editor):
+    CallTranscriptBlob = apps.get_model("callLogs", "CallTranscriptBlob")
+
+    batch = []
+    for blob in CallTranscriptBlob.objects.only("call_id", "data").iterator(
+        chunk_size=500
+    ):
+        blob.search_text = search_text(t.message for t in unpack(bytes(blob.data)))
+        batch.append(blob)
+        if len(batch) >= 500:
+            CallTranscriptBlob.objects.bulk_update(batch, ["search_text"])
+            batch = []
+    CallTranscriptBlob.objects.bulk_update(batch, ["search_text"])
+
+
+def create_search_index(apps, schema_editor):
+    install_blob_search_index(schema_editor.connection)
+
+
+def drop_search_index(apps, schema_editor):
+    uninstall_blob_search_index(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY on PostgreSQL can not run in a transaction
+    atomic = False
+
+    dependencies = [
+        ('callLogs', '0014_cache_table'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='calltranscriptblob',
+            name='search_text',
+            field=models.TextField(blank=True, default=''),
+        ),
+        migrations.RunPython(fill_search_text, migrations.RunPython.noop, atomic=True),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 6.0 on 2026-10-18 14:10
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('callLogs', '0015_calltranscriptblob_search_text'),
+        ('store', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CallFunnelDay',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('calls', models.PositiveIntegerField(default=0)),
+                ('quotes_provided', models.PositiveIntegerField(default=0)),
+                ('appointments_booked', models.PositiveIntegerField(default=0)),
+                ('appointments_kept', models.PositiveIntegerField(default=0)),
+                ('appointments_upcoming', models.PositiveIntegerField(default=0)),
+                ('computed_at', models.DateTimeField(blank=True, null=True)),
+                ('invalidated_at', models.DateTimeField(blank=True, null=True)),
+                ('store', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='call_funnel_days', to='store.store')),
+            ],
+            options={
+                'unique_together': {('store', 'date')},
+            },
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 6.0 on 2026-10-18 14:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('callLogs', '0016_callfunnelday'),
+        ('price_list', '0007_catalogchange'),
+        ('store', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='callsession',
+            index=models.Index(fields=['started_at', 'id'], name='call_started_id_idx'),
+        ),
+    ]
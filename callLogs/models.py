@@ -1,6 +1,7 @@
 from django.db import models
 from price_list.models import RepairType
 from store.models import Store
+from callLogs.utils import normalize_phone
 
 
 class CallOutcome(models.TextChoices):
@@ -17,6 +18,11 @@ class CallType(models.TextChoices):
     APPOINTMENT = "APPOINTMENT", "Appointment"
 
 
+class CallStatus(models.TextChoices):
+    IN_PROGRESS = "IN_PROGRESS", "In Progress"
+    COMPLETED = "COMPLETED", "Completed"
+
+
 class Speaker(models.TextChoices):
     AI = "AI", "AI"
     CUSTOMER = "CUSTOMER", "Customer"
@@ -25,6 +31,7 @@ class Speaker(models.TextChoices):
 class CallSession(models.Model):
     store = models.ForeignKey(Store, on_delete=models.CASCADE, related_name="calls")
     phone_number = models.CharField(max_length=20)
+    phone_e164 = models.CharField(max_length=16, blank=True, default="")
     issue = models.ForeignKey(
         RepairType,
         null=True,
@@ -38,14 +45,48 @@ class CallSession(models.Model):
         max_length=30, choices=CallOutcome.choices, null=True, blank=True
     )
     duration = models.CharField(max_length=10)
+    duration_seconds = models.PositiveIntegerField(null=True, blank=True)
+    status = models.CharField(
+        max_length=20, choices=CallStatus.choices, default=CallStatus.COMPLETED
+    )
     started_at = models.DateTimeField()
+    # when the assistant picked up; started_at is when the call came in
+    answered_at = models.DateTimeField(null=True, blank=True)
     ended_at = models.DateTimeField(null=True, blank=True)
     audio_url = models.URLField(blank=True, null=True)
+    # cold archive pointer: file under CALL_ARCHIVE_ROOT and the offset of
+    # the gzip member holding this call's transcripts ("-": nothing to
+    # archive, see services/archive.py)
+    transcript_archive = models.CharField(max_length=255, blank=True, default="")
+    transcript_archive_offset = models.PositiveBigIntegerField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["store", "started_at"], name="call_store_started_idx"),
+            # keyset pages of CallSessionCursorPagination across stores
+            models.Index(fields=["started_at", "id"], name="call_started_id_idx"),
+            models.Index(
+                fields=["store", "call_type", "started_at"],
+                name="call_store_type_started_idx",
+            ),
+            models.Index(fields=["store", "created_at"], name="call_store_created_idx"),
+            models.Index(
+                fields=["store", "phone_e164", "-started_at"],
+                name="call_store_phone_idx",
+            ),
+        ]
+
     def __str__(self):
         return f"{self.phone_number} - {self.call_type}"
 
+    def save(self, *args, **kwargs):
+        self.phone_e164 = normalize_phone(self.phone_number)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "phone_number" in update_fields:
+            kwargs["update_fields"] = {*update_fields, "phone_e164"}
+        super().save(*args, **kwargs)
+
 
 class CallTranscript(models.Model):
     call = models.ForeignKey(
@@ -53,7 +94,105 @@ class CallTranscript(models.Model):
     )
     speaker = models.CharField(max_length=10, choices=Speaker.choices)
     message = models.TextField()
+    sequence = models.PositiveIntegerField(null=True, blank=True)
     timestamp = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["call", "sequence"], name="calltranscript_call_sequence_uniq"
+            )
+        ]
+
     def __str__(self):
         return f"{self.speaker}: {self.message[:30]}"
+
+
+class CallTranscriptBlob(models.Model):
+    """
+    A finished call's transcript packed into one compressed blob
+    (see services/transcript_packing.py) instead of a row per utterance
+    """
+
+    call = models.OneToOneField(
+        CallSession,
+        primary_key=True,
+        on_delete=models.CASCADE,
+        related_name="transcript_blob",
+    )
+    data = models.BinaryField()
+    message_count = models.PositiveIntegerField()
+    # every message, one per line, for the transcript search index
+    search_text = models.TextField(blank=True, default="")
+    packed_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.call_id}: {self.message_count} messages"
+
+
+class CallDailyRollup(models.Model):
+    store = models.ForeignKey(
+        Store, on_delete=models.CASCADE, related_name="call_rollups"
+    )
+    date = models.DateField()
+    call_type = models.CharField(max_length=20, choices=CallType.choices)
+    outcome = models.CharField(
+        max_length=30, choices=CallOutcome.choices, blank=True, default=""
+    )
+
+    call_count = models.PositiveIntegerField(default=0)
+    duration_total = models.PositiveBigIntegerField(default=0)
+    duration_count = models.PositiveIntegerField(default=0)
+    # QuantileSketch.to_dict() of duration_seconds / seconds to answer
+    duration_sketch = models.JSONField(default=dict, blank=True)
+    answer_sketch = models.JSONField(default=dict, blank=True)
+
+    class Meta:
+        unique_together = ("store", "date", "call_type", "outcome")
+
+    def __str__(self):
+        return f"{self.store_id} - {self.date} - {self.call_type}: {self.call_count}"
+
+
+class CallFunnelDay(models.Model):
+    """
+    Funnel stages of a past (store, day), kept by build_call_funnel. Reused
+    while the day is closed (no upcoming appointments when computed) and
+    computed_at is later than invalidated_at, which writes to the day
+    stamp once they are committed.
+    """
+
+    store = models.ForeignKey(
+        Store, on_delete=models.CASCADE, related_name="call_funnel_days"
+    )
+    date = models.DateField()
+    calls = models.PositiveIntegerField(default=0)
+    quotes_provided = models.PositiveIntegerField(default=0)
+    appointments_booked = models.PositiveIntegerField(default=0)
+    appointments_kept = models.PositiveIntegerField(default=0)
+    appointments_upcoming = models.PositiveIntegerField(default=0)
+    # start of the computation the stages come from
+    computed_at = models.DateTimeField(null=True, blank=True)
+    invalidated_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        unique_together = ("store", "date")
+
+    def __str__(self):
+        return f"{self.store_id} - {self.date}"
+
+
+class CallRetentionPolicy(models.Model):
+    store = models.OneToOneField(
+        Store, on_delete=models.CASCADE, related_name="call_retention_policy"
+    )
+    transcript_days = models.PositiveIntegerField(
+        help_text="Transcripts of calls older than this are archived"
+    )
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name_plural = "call retention policies"
+
+    def __str__(self):
+        return f"{self.store_id}: {self.transcript_days} days"
@@ -0,0 +1,108 @@
+from datetime import datetime
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import Cursor, CursorPagination
+
+
+class CallSessionCursorPagination(CursorPagination):
+    """
+    Keyset pagination over (started_at, id), newest first.
+
+    DRF's cursor only keeps the first ordering field and steps over ties
+    with an offset. Here the cursor is the (started_at, id) of the last
+    (or first) row shown, and a page is the rows strictly past it: a range
+    seek on the (started_at, id) / (store, started_at) indexes, so deep
+    pages cost the same as the first one and calls sharing a started_at
+    are neither skipped nor repeated.
+    """
+
+    ordering = ("-started_at", "-id")
+    page_size = 50
+    page_size_query_param = "page_size"
+    max_page_size = 200
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.cursor = self.decode_cursor(request)
+        reverse = self.cursor is not None and self.cursor.reverse
+        position = self.cursor and self.parse_position(self.cursor.position)
+
+        if reverse:
+            # the rows before the first one shown, nearest first
+            queryset = queryset.order_by("started_at", "id")
+            if position:
+                started_at, pk = position
+                queryset = queryset.filter(started_at__gte=started_at).exclude(
+                    Q(started_at=started_at, id__lte=pk)
+                )
+        else:
+            queryset = queryset.order_by(*self.ordering)
+            if position:
+                # started_at <= x bounds the index range; the tie on x is
+                # cut by id
+                started_at, pk = position
+                queryset = queryset.filter(started_at__lte=started_at).exclude(
+                    Q(started_at=started_at, id__gte=pk)
+                )
+
+        results = list(queryset[: self.page_size + 1])
+        self.page = results[: self.page_size]
+        has_more = len(results) > len(self.page)
+
+        if reverse:
+            self.page.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, position is not None
+
+        # links point past the edge rows of this page
+        self.has_next = self.has_next and bool(self.page)
+        self.has_previous = self.has_previous and bool(self.page)
+        if self.has_next:
+            self.next_position = self._get_position_from_instance(
+                self.page[-1], self.ordering
+            )
+        if self.has_previous:
+            self.previous_position = self._get_position_from_instance(
+                self.page[0], self.ordering
+            )
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+
+        return self.page
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        return self.encode_cursor(
+            Cursor(offset=0, reverse=False, position=self.next_position)
+        )
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        return self.encode_cursor(
+            Cursor(offset=0, reverse=True, position=self.previous_position)
+        )
+
+    def parse_position(self, position):
+        if position is None:
+            return None
+        try:
+            started_at, pk = position.rsplit("|", 1)
+            return datetime.fromisoformat(started_at), int(pk)
+        except ValueError:
+            raise NotFound(self.invalid_cursor_message)
+
+    def _get_position_from_instance(self, instance, ordering):
+        if isinstance(instance, dict):
+            started_at, pk = instance["started_at"], instance["id"]
+        else:
+            started_at, pk = instance.started_at, instance.id
+        return f"{started_at.isoformat()}|{pk}"
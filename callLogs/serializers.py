@@ -4,11 +4,23 @@ from rest_framework import serializers
 from callLogs.models import (
     CallSession,
     CallTranscript,
+    CallOutcome,
+    CallStatus,
+    CallType,
 )
-from price_list.models import RepairType
+from price_list.services.repair_type_names import resolve_repair_type_id
+from callLogs.utils import parse_duration
+from callLogs.services.transcript_packing import packed_transcripts
+
+MAX_TRANSCRIPT_CHUNKS = 200
 
 
 class CallTranscriptSerializer(serializers.ModelSerializer):
+    """
+    Reads CallTranscript rows as well as PackedTranscript entries
+    unpacked from a CallTranscriptBlob
+    """
+
     class Meta:
         model = CallTranscript
         fields = ["speaker", "message", "timestamp"]
@@ -31,24 +43,41 @@ class CallSessionSerializer(serializers.ModelSerializer):
             "call_type",
             "outcome",
             "duration",
+            "duration_seconds",
             "started_at",
+            "answered_at",
             "ended_at",
             "audio_url",
+            "status",
             "transcripts",
             "created_at",
         ]
-        read_only_fields = ["id", "created_at"]
+        read_only_fields = ["id", "duration_seconds", "status", "created_at"]
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        packed = packed_transcripts(instance)
+        if packed is not None:
+            data["transcripts"] = CallTranscriptSerializer(packed, many=True).data
+        return data
+
+    def validate_duration(self, value):
+        try:
+            parse_duration(value)
+        except ValueError:
+            raise serializers.ValidationError(
+                "Duration must be in HH:MM:SS or MM:SS format."
+            )
+        return value
 
     def create(self, validated_data):
         transcripts_data = validated_data.pop("transcripts", [])
         issue_name = validated_data.pop("issue", None)
+        validated_data["duration_seconds"] = parse_duration(
+            validated_data.get("duration")
+        )
 
-        if issue_name:
-            try:
-                repair_type = RepairType.objects.get(name__iexact=issue_name)
-                validated_data["issue"] = repair_type
-            except RepairType.DoesNotExist:
-                validated_data["issue"] = None
+        validated_data["issue_id"] = resolve_repair_type_id(issue_name)
 
         try:
             with transaction.atomic():
@@ -56,8 +85,10 @@ class CallSessionSerializer(serializers.ModelSerializer):
 
                 if transcripts_data:
                     transcripts = [
-                        CallTranscript(call=call, timestamp=timezone.now(), **t)
-                        for t in transcripts_data
+                        CallTranscript(
+                            call=call, timestamp=timezone.now(), sequence=i, **t
+                        )
+                        for i, t in enumerate(transcripts_data)
                     ]
                     CallTranscript.objects.bulk_create(transcripts)
 
@@ -68,6 +99,106 @@ class CallSessionSerializer(serializers.ModelSerializer):
             raise
 
 
+class CallSessionBulkItemSerializer(CallSessionSerializer):
+    """
+    One item of a bulk ingestion request. Store IDs are checked against
+    the set prefetched by the view instead of one query per item.
+    """
+
+    store = serializers.IntegerField()
+
+    def validate_store(self, value):
+        if value not in self.context["store_ids"]:
+            raise serializers.ValidationError("Invalid store.")
+        return value
+
+
+class CallSessionStartSerializer(serializers.ModelSerializer):
+    """
+    Opens an in-progress call; transcripts are appended in chunks
+    and the call is finished with the close endpoint
+    """
+
+    issue = serializers.CharField(required=False, allow_blank=True)
+
+    class Meta:
+        model = CallSession
+        fields = ["id", "store", "phone_number", "issue", "started_at", "status"]
+        read_only_fields = ["id", "status"]
+        # set by the view from the API key or the user
+        extra_kwargs = {"store": {"required": False}}
+
+    def create(self, validated_data):
+        validated_data["issue_id"] = resolve_repair_type_id(
+            validated_data.pop("issue", None)
+        )
+        return CallSession.objects.create(
+            status=CallStatus.IN_PROGRESS, call_type="", duration="", **validated_data
+        )
+
+
+class CallTranscriptChunkSerializer(serializers.ModelSerializer):
+    sequence = serializers.IntegerField(min_value=0)
+
+    class Meta:
+        model = CallTranscript
+        fields = ["sequence", "speaker", "message"]
+
+
+class CallTranscriptAppendSerializer(serializers.Serializer):
+    chunks = CallTranscriptChunkSerializer(many=True, allow_empty=False)
+
+    def validate_chunks(self, value):
+        if len(value) > MAX_TRANSCRIPT_CHUNKS:
+            raise serializers.ValidationError(
+                f"At most {MAX_TRANSCRIPT_CHUNKS} chunks per request."
+            )
+        return value
+
+
+class CallSessionCloseSerializer(serializers.Serializer):
+    call_type = serializers.ChoiceField(choices=CallType.choices)
+    outcome = serializers.ChoiceField(
+        choices=CallOutcome.choices, required=False, allow_null=True
+    )
+    answered_at = serializers.DateTimeField(required=False, allow_null=True)
+    ended_at = serializers.DateTimeField(required=False)
+    duration = serializers.CharField(required=False, max_length=10)
+    audio_url = serializers.URLField(required=False, allow_null=True)
+
+    def validate_duration(self, value):
+        try:
+            parse_duration(value)
+        except ValueError:
+            raise serializers.ValidationError(
+                "Duration must be in HH:MM:SS or MM:SS format."
+            )
+        return value
+
+
+class CallSessionListSerializer(serializers.Serializer):
+    """
+    Read-only call row for the call log table, built from .values()
+    rows without transcripts
+    """
+
+    id = serializers.IntegerField()
+    phone_number = serializers.CharField()
+    issue = serializers.CharField(source="issue_name", allow_null=True)
+    store = serializers.IntegerField(source="store_id")
+    issue_name = serializers.CharField(allow_null=True)
+    call_type = serializers.CharField()
+    outcome = serializers.CharField(allow_null=True)
+    duration = serializers.CharField()
+    duration_seconds = serializers.IntegerField(allow_null=True)
+    started_at = serializers.DateTimeField()
+    answered_at = serializers.DateTimeField(allow_null=True)
+    ended_at = serializers.DateTimeField(allow_null=True)
+    audio_url = serializers.CharField(allow_null=True)
+    status = serializers.CharField()
+    created_at = serializers.DateTimeField()
+
+
 class StoreCallSummarySerializer(serializers.Serializer):
     store_id = serializers.IntegerField()
     store_name = serializers.CharField()
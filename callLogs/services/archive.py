@@ -0,0 +1,232 @@
+import gzip
+import json
+import logging
+import os
+import zlib
+from datetime import timedelta
+from pathlib import Path
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils import timezone
+from callLogs.models import (
+    CallRetentionPolicy,
+    CallSession,
+    CallStatus,
+    CallTranscript,
+    CallTranscriptBlob,
+)
+from callLogs.services.transcript_packing import unpack
+from store.models import Store
+
+logger = logging.getLogger(__name__)
+
+# Archive layout: <CALL_ARCHIVE_ROOT>/store_<id>/<YYYY-MM>.ndjson.gz, one
+# NDJSON line per call. Every archive run appends a new gzip member to the
+# month file (a multi-member file is still a valid gzip file), and each
+# archived call points at its member, so rehydrating one call decompresses
+# one batch instead of the whole month.
+
+TRANSCRIPT_FIELDS = ["speaker", "message", "sequence", "timestamp"]
+
+# transcript_archive of calls that had no transcripts to archive, so the
+# retention job does not scan them again
+NO_TRANSCRIPTS = "-"
+
+
+def archive_path(store_id, month):
+    return f"store_{store_id}/{month:%Y-%m}.ndjson.gz"
+
+
+def _absolute(path):
+    return Path(settings.CALL_ARCHIVE_ROOT) / path
+
+
+def retention_cutoffs(store_ids=None, now=None):
+    """
+    {store_id: datetime} before which call transcripts are archived
+    """
+    now = now or timezone.now()
+    policies = dict(
+        CallRetentionPolicy.objects.values_list("store_id", "transcript_days")
+    )
+    stores = Store.objects.all()
+    if store_ids is not None:
+        stores = stores.filter(id__in=store_ids)
+
+    return {
+        store_id: now
+        - timedelta(
+            days=policies.get(store_id, settings.CALL_TRANSCRIPT_RETENTION_DAYS)
+        )
+        for store_id in stores.values_list("id", flat=True)
+    }
+
+
+def write_archive_member(path, lines):
+    """
+    Append one gzip member with the lines, return its byte offset
+    """
+    target = _absolute(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+
+    with open(target, "ab") as archive:
+        offset = archive.seek(0, os.SEEK_END)
+        archive.write(gzip.compress("".join(lines).encode()))
+        archive.flush()
+        os.fsync(archive.fileno())
+    return offset
+
+
+def read_archive_member(path, offset):
+    """
+    Decompress only the gzip member starting at offset
+    """
+    decompressor = zlib.decompressobj(wbits=31)
+    chunks = []
+    with open(_absolute(path), "rb") as archive:
+        archive.seek(offset)
+        while not decompressor.eof:
+            data = archive.read(64 * 1024)
+            if not data:
+                break
+            chunks.append(decompressor.decompress(data))
+    return b"".join(chunks).decode()
+
+
+def read_archived_transcripts(call):
+    """
+    Transcripts of an archived call, in CallTranscriptSerializer form.
+    Empty (and logged) when the archive file is missing or unreadable.
+    """
+    if call.transcript_archive == NO_TRANSCRIPTS:
+        return []
+    try:
+        member = read_archive_member(
+            call.transcript_archive, call.transcript_archive_offset
+        )
+        records = [json.loads(line) for line in member.splitlines()]
+    except (OSError, EOFError, zlib.error, ValueError):
+        logger.exception(
+            "Archived transcripts of call %s unreadable (%s @ %s)",
+            call.id,
+            call.transcript_archive,
+            call.transcript_archive_offset,
+        )
+        return []
+
+    for record in records:
+        if record["call_id"] == call.id:
+            return [
+                {
+                    "speaker": t["speaker"],
+                    "message": t["message"],
+                    "timestamp": t["timestamp"],
+                }
+                for t in record["transcripts"]
+            ]
+    logger.error(
+        "Call %s not found in archive member %s @ %s",
+        call.id,
+        call.transcript_archive,
+        call.transcript_archive_offset,
+    )
+    return []
+
+
+def archive_transcripts(store_id, cutoff, batch_size=500):
+    """
+    Move transcripts of the store's calls started before cutoff into the
+    archive, batch_size calls at a time. Returns (calls, transcripts) moved.
+    """
+    calls = CallSession.objects.filter(
+        store_id=store_id,
+        started_at__lt=cutoff,
+        transcript_archive="",
+        status=CallStatus.COMPLETED,
+    )
+    archived_calls = 0
+    archived_transcripts = 0
+    last_id = 0
+
+    while True:
+        batch = list(
+            calls.filter(pk__gt=last_id)
+            .order_by("pk")
+            .only("id", "store_id", "phone_number", "started_at")[:batch_size]
+        )
+        if not batch:
+            break
+        last_id = batch[-1].pk
+
+        call_ids = [call.id for call in batch]
+        transcripts = {}
+        for transcript in (
+            CallTranscript.objects.filter(call_id__in=call_ids)
+            .order_by("call_id", "sequence", "id")
+            .values("call_id", *TRANSCRIPT_FIELDS)
+        ):
+            transcripts.setdefault(transcript.pop("call_id"), []).append(transcript)
+        # empty blobs are calls pack_calls found without transcripts
+        for call_id, data in CallTranscriptBlob.objects.filter(
+            call_id__in=call_ids, message_count__gt=0
+        ).values_list("call_id", "data"):
+            transcripts[call_id] = [t._asdict() for t in unpack(bytes(data))]
+
+        # calls without transcripts are marked as done, not archived
+        empty = [call.id for call in batch if call.id not in transcripts]
+        if empty:
+            CallSession.objects.filter(pk__in=empty).update(
+                transcript_archive=NO_TRANSCRIPTS
+            )
+
+        # one gzip member per month file touched by the batch
+        by_month = {}
+        for call in batch:
+            if call.id not in transcripts:
+                continue
+            month = timezone.localtime(call.started_at).date().replace(day=1)
+            by_month.setdefault(month, []).append(call)
+
+        moved = []
+        for month, month_calls in by_month.items():
+            path = archive_path(store_id, month)
+            lines = [
+                json.dumps(
+                    {
+                        "call_id": call.id,
+                        "store_id": call.store_id,
+                        "phone_number": call.phone_number,
+                        "started_at": call.started_at,
+                        "transcripts": transcripts[call.id],
+                    },
+                    cls=DjangoJSONEncoder,
+                )
+                + "\n"
+                for call in month_calls
+            ]
+            # file first: a failure below leaves an unreferenced member
+            # behind, never a pointer to missing data
+            offset = write_archive_member(path, lines)
+            for call in month_calls:
+                call.transcript_archive = path
+                call.transcript_archive_offset = offset
+                moved.append(call)
+
+        if not moved:
+            continue
+
+        with transaction.atomic():
+            CallSession.objects.bulk_update(
+                moved, ["transcript_archive", "transcript_archive_offset"]
+            )
+            moved_ids = [call.id for call in moved]
+            deleted, _ = CallTranscript.objects.filter(call_id__in=moved_ids).delete()
+            blobs = CallTranscriptBlob.objects.filter(call_id__in=moved_ids)
+            deleted += sum(blobs.values_list("message_count", flat=True))
+            blobs.delete()
+
+        archived_calls += len(moved)
+        archived_transcripts += deleted
+
+    return archived_calls, archived_transcripts
@@ -0,0 +1,58 @@
+from django.db.models import Q, Sum
+from callLogs.models import CallDailyRollup, CallType
+
+MISSED_CALL_TYPES = [CallType.DROPPED, "CALL_DROPPED"]
+
+
+def build_store_call_summary(stores, start_date, single_day=False):
+    """
+    Store-wise call summary computed with one grouped query.
+
+    Reads the daily rollup table (at most one row per day, call type and
+    outcome) with conditional aggregation instead of scanning raw calls.
+    """
+    stores = list(stores.values("id", "name"))
+
+    rollups = CallDailyRollup.objects.filter(store_id__in=[s["id"] for s in stores])
+    if single_day:
+        rollups = rollups.filter(date=start_date)
+    else:
+        rollups = rollups.filter(date__gte=start_date)
+
+    rows = (
+        rollups.values("store_id")
+        .annotate(
+            total=Sum("call_count"),
+            ai_handled=Sum("call_count", filter=Q(call_type=CallType.AI_RESOLVED)),
+            warm_transfer=Sum(
+                "call_count", filter=Q(call_type=CallType.WARM_TRANSFER)
+            ),
+            appointments=Sum("call_count", filter=Q(call_type=CallType.APPOINTMENT)),
+            missed=Sum("call_count", filter=Q(call_type__in=MISSED_CALL_TYPES)),
+            duration_total=Sum("duration_total"),
+            duration_count=Sum("duration_count"),
+        )
+        .order_by()
+    )
+    totals = {row["store_id"]: row for row in rows}
+
+    data = []
+    for store in stores:
+        row = totals.get(store["id"], {})
+        duration_count = row.get("duration_count") or 0
+        avg_seconds = row["duration_total"] / duration_count if duration_count else 0
+
+        data.append(
+            {
+                "store_id": store["id"],
+                "store_name": store["name"],
+                "total_calls": row.get("total") or 0,
+                "ai_handled": row.get("ai_handled") or 0,
+                "warm_transfer": row.get("warm_transfer") or 0,
+                "appointments_booked": row.get("appointments") or 0,
+                "missed_calls": row.get("missed") or 0,
+                "avg_call_duration": round(avg_seconds / 60, 2),
+            }
+        )
+
+    return data
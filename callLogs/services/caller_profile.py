@@ -0,0 +1,86 @@
+from django.db.models import F
+from appointments.models import Appointment
+from callLogs.models import CallSession, CallStatus
+
+
+def build_caller_profile(store_id, phone_e164, limit=5):
+    """
+    Past calls, appointments and last issue of a caller at a store,
+    read through the (store, phone_e164, ...) indexes
+    """
+    calls = CallSession.objects.filter(
+        store_id=store_id, phone_e164=phone_e164
+    ).exclude(status=CallStatus.IN_PROGRESS)
+    appointments = Appointment.objects.filter(store_id=store_id, phone_e164=phone_e164)
+
+    recent_calls = list(
+        calls.order_by("-started_at", "-id").values(
+            "id",
+            "started_at",
+            "call_type",
+            "outcome",
+            "duration",
+            "issue_id",
+            issue_name=F("issue__name"),
+        )[:limit]
+    )
+    recent_appointments = list(
+        appointments.order_by("-date", "-start_time").values(
+            "id",
+            "date",
+            "start_time",
+            "client_name",
+            "repair_type_id",
+            repair_type_name=F("repair_type__name"),
+            device_model_name=F("device_model__name"),
+        )[:limit]
+    )
+
+    # latest call that named an issue, else the latest booked repair
+    last_issue = next(
+        (
+            {"id": call["issue_id"], "name": call["issue_name"]}
+            for call in recent_calls
+            if call["issue_id"]
+        ),
+        None,
+    )
+    if last_issue is None:
+        call = (
+            calls.exclude(issue=None)
+            .order_by("-started_at")
+            .values("issue_id", "issue__name")
+            .first()
+        )
+        if call:
+            last_issue = {"id": call["issue_id"], "name": call["issue__name"]}
+    if last_issue is None and recent_appointments:
+        appointment = recent_appointments[0]
+        last_issue = {
+            "id": appointment["repair_type_id"],
+            "name": appointment["repair_type_name"],
+        }
+
+    call_count = (
+        len(recent_calls) if len(recent_calls) < limit else calls.count()
+    )
+    appointment_count = (
+        len(recent_appointments)
+        if len(recent_appointments) < limit
+        else appointments.count()
+    )
+
+    return {
+        "store": store_id,
+        "phone_number": phone_e164,
+        "returning": bool(call_count or appointment_count),
+        "customer_name": (
+            recent_appointments[0]["client_name"] if recent_appointments else None
+        ),
+        "call_count": call_count,
+        "appointment_count": appointment_count,
+        "last_issue": last_issue,
+        "recent_calls": recent_calls,
+        "recent_appointments": recent_appointments,
+    }
+
@@ -0,0 +1,93 @@
+import hashlib
+import threading
+from collections import Counter
+from django.core.cache import cache
+from api.generations import bump_generations, get_generations
+
+# Per-store generations, read through api.generations: a bump in the
+# run_jobs worker or one web worker reaches every other process.
+GENERATION_KEY = "dashboard:gen:{}"
+# generation of "all stores" responses, bumped together with every store
+ALL_STORES = "all"
+
+DEFAULT_TIMEOUT = 15 * 60
+
+# cached dashboard responses, reported by cache_stats()
+DASHBOARDS = ("store_summary", "call_trends", "call_heatmap", "call_stats")
+
+# (name, "hits" / "misses") -> count, per process: counting in the shared
+# cache would add a write to every read
+_stats = Counter()
+_stats_lock = threading.Lock()
+
+
+def _generation_keys(store_ids):
+    if store_ids is None:
+        return [GENERATION_KEY.format(ALL_STORES)]
+    return [GENERATION_KEY.format(store_id) for store_id in sorted(set(store_ids))]
+
+
+def store_generations(store_ids):
+    """
+    Current generation of each store in scope (None: all stores)
+    """
+    return get_generations(_generation_keys(store_ids))
+
+
+def bump_store_generations(store_ids):
+    """
+    Invalidate every cached response that covers one of the stores
+    """
+    bump_generations(_generation_keys(store_ids) + _generation_keys(None))
+
+
+def _count(name, outcome):
+    with _stats_lock:
+        _stats[name, outcome] += 1
+
+
+def get_or_compute(
+    name, role, store_ids, params, compute, timeout=DEFAULT_TIMEOUT
+):
+    """
+    Cached compute() for a dashboard response.
+
+    The key holds the response name, the user's role, the store scope,
+    the request params (range, ...) and the current generation of every
+    store in scope, so a write to one of the stores makes the old entry
+    unreachable instead of serving it until it expires.
+    """
+    scope = ALL_STORES if store_ids is None else ",".join(
+        map(str, sorted(set(store_ids)))
+    )
+    generations = ".".join(map(str, store_generations(store_ids)))
+    params = hashlib.md5(repr(sorted(params.items())).encode()).hexdigest()
+    key = f"dashboard:{name}:{role}:{scope}:{params}:{generations}"
+
+    data = cache.get(key)
+    if data is None:
+        _count(name, "misses")
+        data = compute()
+        cache.set(key, data, timeout)
+    else:
+        _count(name, "hits")
+    return data
+
+
+def cache_stats():
+    """
+    Hit / miss counters per dashboard of this process since it started
+    """
+    stats = {}
+    with _stats_lock:
+        for name in DASHBOARDS:
+            hits = _stats[name, "hits"]
+            misses = _stats[name, "misses"]
+            stats[name] = {
+                "hits": hits,
+                "misses": misses,
+                "hit_rate": (
+                    round(hits / (hits + misses), 4) if hits + misses else None
+                ),
+            }
+    return stats
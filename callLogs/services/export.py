@@ -0,0 +1,94 @@
+import csv
+import json
+from collections import defaultdict
+from itertools import islice
+from django.core.serializers.json import DjangoJSONEncoder
+from callLogs.models import CallTranscript, CallTranscriptBlob
+from callLogs.services.transcript_packing import unpack
+
+EXPORT_CHUNK_SIZE = 2000
+
+EXPORT_FIELDS = [
+    "id",
+    "store_id",
+    "phone_number",
+    "issue_name",
+    "call_type",
+    "outcome",
+    "status",
+    "duration",
+    "duration_seconds",
+    "started_at",
+    "answered_at",
+    "ended_at",
+    "audio_url",
+    "created_at",
+]
+
+
+class Echo:
+    """
+    File-like object for csv.writer that hands each line back
+    instead of buffering it
+    """
+
+    def write(self, value):
+        return value
+
+
+def iter_call_rows(rows, include_transcripts=False, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Yield call rows (dicts) read with a chunked server-side iterator.
+    With include_transcripts every chunk fetches its transcripts in one
+    query, so memory stays bounded by the chunk size.
+    """
+    iterator = rows.iterator(chunk_size=chunk_size)
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            return
+
+        if include_transcripts:
+            transcripts = defaultdict(list)
+            call_ids = [row["id"] for row in chunk]
+            for transcript in (
+                CallTranscript.objects.filter(call_id__in=call_ids)
+                .order_by("call_id", "sequence", "id")
+                .values("call_id", "speaker", "message", "timestamp")
+            ):
+                transcripts[transcript.pop("call_id")].append(transcript)
+            for call_id, data in CallTranscriptBlob.objects.filter(
+                call_id__in=call_ids
+            ).values_list("call_id", "data"):
+                transcripts[call_id] = [
+                    {"speaker": t.speaker, "message": t.message, "timestamp": t.timestamp}
+                    for t in unpack(bytes(data))
+                ]
+
+            for row in chunk:
+                row["transcripts"] = transcripts.get(row["id"], [])
+
+        yield from chunk
+
+
+def stream_csv(rows, include_transcripts=False):
+    fields = EXPORT_FIELDS + (["transcript"] if include_transcripts else [])
+    writer = csv.writer(Echo())
+
+    yield writer.writerow(fields)
+    for row in iter_call_rows(rows, include_transcripts):
+        values = [row[field] for field in EXPORT_FIELDS]
+        if include_transcripts:
+            values.append(
+                "\n".join(
+                    f"{t['speaker']}: {t['message']}" for t in row["transcripts"]
+                )
+            )
+        yield writer.writerow(
+            [value.isoformat() if hasattr(value, "isoformat") else value for value in values]
+        )
+
+
+def stream_ndjson(rows, include_transcripts=False):
+    for row in iter_call_rows(rows, include_transcripts):
+        yield json.dumps(row, cls=DjangoJSONEncoder) + "\n"
@@ -0,0 +1,254 @@
+from collections import Counter
+from datetime import timedelta
+from django.db.models import Count, Exists, F, OuterRef, Q, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+from appointments.models import Appointment
+from callLogs.models import CallDailyRollup, CallFunnelDay, CallOutcome, CallSession
+from callLogs.utils import day_start
+from store.models import Store
+
+# Closed days are kept in CallFunnelDay, one row per (store, date). Writes
+# to a closed day (late or edited calls, appointments, backfills, rollup
+# rebuilds) stamp its row's invalidated_at once committed; the stamps and
+# computed_at come from the clocks of different processes, which are
+# assumed to be in sync.
+MAX_FUNNEL_DAYS = 366
+
+STAGES = ["calls", "quotes_provided", "appointments_booked", "appointments_kept"]
+
+QUOTED_OUTCOMES = [CallOutcome.QUOTE_PROVIDED, CallOutcome.APPOINTMENT_BOOKED]
+
+# CallFunnelDay rows that can be reused
+REUSABLE = Q(computed_at__isnull=False, appointments_upcoming=0) & (
+    Q(invalidated_at=None) | Q(computed_at__gt=F("invalidated_at"))
+)
+
+
+def _empty_day():
+    return {stage: 0 for stage in STAGES} | {"appointments_upcoming": 0}
+
+
+def _compute_days(store_ids, start, end, today):
+    """
+    {(store_id, date): stages} for every day with activity, from the
+    rollup table and one correlated appointment query
+    """
+    days = {}
+
+    for row in (
+        CallDailyRollup.objects.filter(
+            store_id__in=store_ids, date__gte=start, date__lte=end
+        )
+        .values("store_id", "date")
+        .annotate(
+            calls=Sum("call_count"),
+            quotes=Sum("call_count", filter=Q(outcome__in=QUOTED_OUTCOMES)),
+        )
+        .order_by()
+    ):
+        day = days.setdefault((row["store_id"], row["date"]), _empty_day())
+        day["calls"] = row["calls"] or 0
+        day["quotes_provided"] = row["quotes"] or 0
+
+    # bookings from a number that called the store in the 24 hours before
+    called_before = CallSession.objects.filter(
+        store_id=OuterRef("store_id"),
+        phone_e164=OuterRef("phone_e164"),
+        started_at__gte=OuterRef("created_at") - timedelta(days=1),
+        started_at__lte=OuterRef("created_at"),
+    )
+    for row in (
+        Appointment.objects.filter(
+            store_id__in=store_ids,
+            created_at__gte=day_start(start),
+            created_at__lt=day_start(end + timedelta(days=1)),
+        )
+        .exclude(phone_e164="")
+        .filter(Exists(called_before))
+        .annotate(day=TruncDate("created_at"))
+        .values("store_id", "day")
+        .annotate(
+            booked=Count("id"),
+            kept=Count("id", filter=Q(date__lt=today)),
+        )
+        .order_by()
+    ):
+        day = days.setdefault((row["store_id"], row["day"]), _empty_day())
+        day["appointments_booked"] = row["booked"]
+        day["appointments_kept"] = row["kept"]
+        day["appointments_upcoming"] = row["booked"] - row["kept"]
+
+    return days
+
+
+def invalidate_funnel_days(days):
+    """
+    Stamp closed (store_id, date) days written to, after commit
+    """
+    today = timezone.localdate()
+    days = {(store_id, date) for store_id, date in days if date < today}
+    if not days:
+        return
+    # calls deleted together with their store: the funnel days are gone
+    store_ids = set(
+        Store.objects.filter(
+            pk__in={store_id for store_id, _ in days}
+        ).values_list("pk", flat=True)
+    )
+    now = timezone.now()
+    CallFunnelDay.objects.bulk_create(
+        [
+            CallFunnelDay(store_id=store_id, date=date, invalidated_at=now)
+            for store_id, date in sorted(days)
+            if store_id in store_ids
+        ],
+        update_conflicts=True,
+        unique_fields=["store", "date"],
+        update_fields=["invalidated_at"],
+    )
+
+
+def invalidate_call_funnel_days(calls):
+    """
+    invalidate_funnel_days() for what calls count in: their day, and the
+    next one, whose bookings are attributed to calls of the 24 hours before
+    """
+    days = set()
+    for call in calls:
+        date = timezone.localtime(call.started_at).date()
+        days |= {(call.store_id, date), (call.store_id, date + timedelta(days=1))}
+    invalidate_funnel_days(days)
+
+
+def invalidate_funnel_stores(store_ids=None):
+    """
+    Stamp every closed day of the stores (None: all stores)
+    """
+    days = CallFunnelDay.objects.all()
+    if store_ids is not None:
+        days = days.filter(store_id__in=store_ids)
+    days.update(invalidated_at=timezone.now())
+
+
+def _kept_days(store_ids, start, end):
+    """
+    ({store_id: (count, stage totals)} of the reusable days in range,
+    [(store_id, date)] of the kept days that are not)
+    """
+    days = CallFunnelDay.objects.filter(
+        store_id__in=store_ids, date__gte=start, date__lte=end
+    )
+    reusable = {
+        row.pop("store_id"): (row.pop("days"), row)
+        for row in days.filter(REUSABLE)
+        .values("store_id")
+        .annotate(days=Count("id"), **{stage: Sum(stage) for stage in STAGES})
+        .order_by()
+    }
+    stale = list(days.exclude(REUSABLE).values_list("store_id", "date"))
+    return reusable, stale
+
+
+def build_call_funnel(store_ids, start, end):
+    """
+    calls -> quotes provided -> appointments booked -> appointments kept,
+    per store over start..end (inclusive dates).
+
+    Appointments are attributed to a call when the same normalized phone
+    number called the store within the 24 hours before the booking. An
+    appointment counts as kept once its date has passed (cancelled ones
+    are deleted). Every past (store, day) is kept in CallFunnelDay and
+    reused once it is closed (none of its appointments are still
+    upcoming): the totals of those are summed by the database, and only
+    the other days are computed.
+    """
+    started = timezone.now()
+    today = timezone.localdate()
+    end = min(end, today)
+    stores = Store.objects.order_by("id")
+    if store_ids is not None:
+        stores = stores.filter(id__in=store_ids)
+    stores = list(stores.values("id", "name"))
+
+    store_ids = [store["id"] for store in stores]
+    dates = [start + timedelta(days=i) for i in range((end - start).days + 1)]
+    past_dates = [date for date in dates if date < today]
+    reusable, stale = _kept_days(store_ids, start, end)
+
+    stale_counts = Counter(store_id for store_id, _ in stale)
+
+    totals = {store_id: _empty_day() for store_id in store_ids}
+    missing = [(store_id, today) for store_id in store_ids if today in dates]
+    # stores with days never computed: finding those needs the day list
+    unknown = set()
+    for store_id in store_ids:
+        count, sums = reusable.get(store_id, (0, {}))
+        for stage in STAGES:
+            totals[store_id][stage] += sums.get(stage) or 0
+        if count + stale_counts[store_id] < len(past_dates):
+            unknown.add(store_id)
+    missing += [pair for pair in stale if pair[0] not in unknown]
+    if unknown:
+        reused = set(
+            CallFunnelDay.objects.filter(
+                REUSABLE, store_id__in=unknown, date__gte=start, date__lte=end
+            ).values_list("store_id", "date")
+        )
+        missing += [
+            (store_id, date)
+            for store_id in unknown
+            for date in past_dates
+            if (store_id, date) not in reused
+        ]
+
+    if missing:
+        computed = _compute_days(
+            {store_id for store_id, _ in missing},
+            min(date for _, date in missing),
+            max(date for _, date in missing),
+            today,
+        )
+        kept = []
+        for store_id, date in missing:
+            day = computed.get((store_id, date)) or _empty_day()
+            for stage, value in day.items():
+                totals[store_id][stage] += value
+            if date < today:
+                kept.append(
+                    CallFunnelDay(
+                        store_id=store_id, date=date, computed_at=started, **day
+                    )
+                )
+        # keeps invalidated_at: a write stamped while this was computed
+        # leaves the row stale
+        CallFunnelDay.objects.bulk_create(
+            kept,
+            batch_size=1000,
+            update_conflicts=True,
+            unique_fields=["store", "date"],
+            update_fields=[*STAGES, "appointments_upcoming", "computed_at"],
+        )
+
+    results = []
+    for store in stores:
+        store_totals = totals[store["id"]]
+        results.append(
+            {
+                "store_id": store["id"],
+                "store_name": store["name"],
+                **store_totals,
+                "quote_rate": _rate(
+                    store_totals["quotes_provided"], store_totals["calls"]
+                ),
+                "booking_rate": _rate(
+                    store_totals["appointments_booked"],
+                    store_totals["quotes_provided"],
+                ),
+            }
+        )
+    return results
+
+
+def _rate(part, whole):
+    return round(part / whole, 4) if whole else None
@@ -0,0 +1,51 @@
+import calendar
+from django.db.models import Count, Q
+from django.db.models.functions import ExtractHour, ExtractIsoWeekDay
+from callLogs.models import CallSession, CallStatus, CallType
+from callLogs.utils import day_start
+
+
+def build_call_heatmap(store_ids, start_date):
+    """
+    7x24 matrix (Monday first, local hours) of call volume and AI
+    resolution rate since start_date, computed with one grouped query.
+    """
+    calls = CallSession.objects.filter(started_at__gte=day_start(start_date)).exclude(
+        status=CallStatus.IN_PROGRESS
+    )
+    if store_ids is not None:
+        calls = calls.filter(store_id__in=store_ids)
+
+    rows = (
+        calls.annotate(
+            weekday=ExtractIsoWeekDay("started_at"), hour=ExtractHour("started_at")
+        )
+        .values("weekday", "hour")
+        .annotate(
+            total=Count("id"),
+            ai_resolved=Count("id", filter=Q(call_type=CallType.AI_RESOLVED)),
+        )
+        .order_by()
+    )
+
+    volume = [[0] * 24 for _ in range(7)]
+    resolved = [[0] * 24 for _ in range(7)]
+    for row in rows:
+        volume[row["weekday"] - 1][row["hour"]] = row["total"]
+        resolved[row["weekday"] - 1][row["hour"]] = row["ai_resolved"]
+
+    return {
+        "days": list(calendar.day_abbr),
+        "hours": list(range(24)),
+        "total_calls": sum(map(sum, volume)),
+        "calls": volume,
+        "ai_resolution_rate": [
+            [
+                round(resolved[day][hour] / volume[day][hour], 4)
+                if volume[day][hour]
+                else None
+                for hour in range(24)
+            ]
+            for day in range(7)
+        ],
+    }
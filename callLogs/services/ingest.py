@@ -0,0 +1,83 @@
+from django.db import transaction
+from django.utils import timezone
+from callLogs.models import CallSession, CallTranscript
+from callLogs.signals import calls_completed
+from callLogs.utils import normalize_phone, parse_duration
+from price_list.services.repair_type_names import normalize_name, repair_type_names
+from store.models import Store
+
+MAX_BULK_CALLS = 500
+
+
+def existing_store_ids(items):
+    ids = set()
+    for item in items:
+        try:
+            ids.add(int(item.get("store")))
+        except (AttributeError, TypeError, ValueError):
+            continue
+    return set(Store.objects.filter(id__in=ids).values_list("id", flat=True))
+
+
+def bulk_ingest_calls(items, serializer_class):
+    """
+    Validate and insert many call sessions with their transcripts.
+
+    Every item is validated on its own; valid items are written with
+    bulk_create in one transaction and invalid ones are reported back by
+    index. Returns one result dict per input item.
+    """
+    context = {"store_ids": existing_store_ids(items)}
+    results = []
+    valid = []
+
+    for index, item in enumerate(items):
+        serializer = serializer_class(data=item, context=context)
+        if serializer.is_valid():
+            valid.append((index, serializer.validated_data))
+            results.append(None)
+        else:
+            results.append(
+                {"index": index, "status": "failed", "errors": serializer.errors}
+            )
+
+    if not valid:
+        return results
+
+    issue_ids = repair_type_names()
+    calls = []
+    for _, data in valid:
+        calls.append(
+            CallSession(
+                store_id=data["store"],
+                phone_number=data["phone_number"],
+                phone_e164=normalize_phone(data["phone_number"]),
+                issue_id=issue_ids.get(normalize_name(data.get("issue") or "")),
+                call_type=data["call_type"],
+                outcome=data.get("outcome"),
+                duration=data["duration"],
+                duration_seconds=parse_duration(data["duration"]),
+                started_at=data["started_at"],
+                answered_at=data.get("answered_at"),
+                ended_at=data.get("ended_at"),
+                audio_url=data.get("audio_url"),
+            )
+        )
+
+    with transaction.atomic():
+        calls = CallSession.objects.bulk_create(calls)
+
+        now = timezone.now()
+        transcripts = [
+            CallTranscript(call=call, timestamp=now, sequence=i, **transcript)
+            for call, (_, data) in zip(calls, valid)
+            for i, transcript in enumerate(data.get("transcripts", []))
+        ]
+        CallTranscript.objects.bulk_create(transcripts, batch_size=1000)
+
+        calls_completed.send(sender=CallSession, calls=calls)
+
+    for call, (index, _) in zip(calls, valid):
+        results[index] = {"index": index, "status": "created", "id": call.id}
+
+    return results
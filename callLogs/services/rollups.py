@@ -0,0 +1,192 @@
+from collections import defaultdict
+from datetime import datetime
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from callLogs.models import CallDailyRollup, CallSession, CallStatus
+from callLogs.services.dashboard_cache import bump_store_generations
+from callLogs.services.funnel import invalidate_funnel_stores
+from callLogs.services.sketch import QuantileSketch
+from store.models import Store
+
+# CallSession fields the rollups are computed from
+ROLLUP_FIELDS = (
+    "store",
+    "started_at",
+    "answered_at",
+    "call_type",
+    "outcome",
+    "duration_seconds",
+    "status",
+)
+
+
+def rollup_key(call):
+    return (
+        call.store_id,
+        timezone.localtime(call.started_at).date(),
+        call.call_type,
+        call.outcome or "",
+    )
+
+
+def answer_seconds(call):
+    if call.answered_at is None:
+        return None
+    return max((call.answered_at - call.started_at).total_seconds(), 0)
+
+
+def rollup_values(call):
+    """
+    JSON-safe copy of what a call contributes to the rollups, for job
+    payloads: the row may change again before the job runs
+    """
+    return {
+        "store_id": call.store_id,
+        "started_at": call.started_at.isoformat(),
+        "answered_at": call.answered_at.isoformat() if call.answered_at else None,
+        "call_type": call.call_type,
+        "outcome": call.outcome,
+        "duration_seconds": call.duration_seconds,
+    }
+
+
+def call_from_values(values):
+    """
+    Unsaved CallSession carrying rollup_values()
+    """
+    return CallSession(
+        **{
+            **values,
+            "started_at": datetime.fromisoformat(values["started_at"]),
+            "answered_at": values["answered_at"]
+            and datetime.fromisoformat(values["answered_at"]),
+        }
+    )
+
+
+class RollupDelta:
+    """
+    Counters and sketches of a group of calls sharing a rollup key
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.duration_total = 0
+        self.durations = 0
+        self.duration_sketch = QuantileSketch()
+        self.answer_sketch = QuantileSketch()
+
+    def add(self, call, count=1):
+        """
+        Count a call in (count=1) or take it back out (count=-1)
+        """
+        self.calls += count
+        if call.duration_seconds is not None:
+            self.duration_total += call.duration_seconds * count
+            self.durations += count
+            self.duration_sketch.add(call.duration_seconds, count)
+        answer = answer_seconds(call)
+        if answer is not None:
+            self.answer_sketch.add(answer, count)
+
+
+def record_calls(calls, removed=()):
+    """
+    Add finished calls to their daily rollup rows, and take out the
+    previous version of updated or deleted calls (removed)
+    """
+    deltas = defaultdict(RollupDelta)
+    for call in calls:
+        deltas[rollup_key(call)].add(call)
+    for call in removed:
+        deltas[rollup_key(call)].add(call, -1)
+
+    # calls deleted together with their store: the rollups are gone too
+    store_ids = set(
+        Store.objects.filter(
+            pk__in={store_id for store_id, *_ in deltas}
+        ).values_list("pk", flat=True)
+    )
+
+    with transaction.atomic():
+        for (store_id, date, call_type, outcome), delta in deltas.items():
+            if store_id not in store_ids:
+                continue
+            CallDailyRollup.objects.get_or_create(
+                store_id=store_id, date=date, call_type=call_type, outcome=outcome
+            )
+            # sketches are merged in Python: lock the row so concurrent
+            # workers do not overwrite each other's merge
+            rollup = CallDailyRollup.objects.select_for_update().get(
+                store_id=store_id, date=date, call_type=call_type, outcome=outcome
+            )
+            CallDailyRollup.objects.filter(pk=rollup.pk).update(
+                call_count=F("call_count") + delta.calls,
+                duration_total=F("duration_total") + delta.duration_total,
+                duration_count=F("duration_count") + delta.durations,
+                duration_sketch=QuantileSketch.from_dict(rollup.duration_sketch)
+                .merge(delta.duration_sketch)
+                .to_dict(),
+                answer_sketch=QuantileSketch.from_dict(rollup.answer_sketch)
+                .merge(delta.answer_sketch)
+                .to_dict(),
+            )
+
+
+def rebuild_rollups(store_ids=None, batch_size=1000):
+    """
+    Recompute rollup rows from the raw CallSession table, one store at a
+    time so only that store's rollups are held in memory
+    """
+    # in-progress calls are counted when they are closed
+    calls = CallSession.objects.exclude(status=CallStatus.IN_PROGRESS)
+    rollups = CallDailyRollup.objects.all()
+    if store_ids:
+        calls = calls.filter(store_id__in=store_ids)
+        rollups = rollups.filter(store_id__in=store_ids)
+
+    created = 0
+    with transaction.atomic():
+        rollups.delete()
+        # cached dashboards and funnel days were computed from the old rows
+        rebuilt = store_ids or list(Store.objects.values_list("pk", flat=True))
+        transaction.on_commit(lambda: bump_store_generations(rebuilt))
+        transaction.on_commit(lambda: invalidate_funnel_stores(store_ids or None))
+
+        for store_id in calls.values_list("store_id", flat=True).distinct().order_by():
+            deltas = defaultdict(RollupDelta)
+            for call in (
+                calls.filter(store_id=store_id)
+                .only(
+                    "store_id",
+                    "started_at",
+                    "answered_at",
+                    "call_type",
+                    "outcome",
+                    "duration_seconds",
+                )
+                .iterator(chunk_size=batch_size)
+            ):
+                deltas[rollup_key(call)].add(call)
+
+            CallDailyRollup.objects.bulk_create(
+                [
+                    CallDailyRollup(
+                        store_id=store_id,
+                        date=date,
+                        call_type=call_type,
+                        outcome=outcome,
+                        call_count=delta.calls,
+                        duration_total=delta.duration_total,
+                        duration_count=delta.durations,
+                        duration_sketch=delta.duration_sketch.to_dict(),
+                        answer_sketch=delta.answer_sketch.to_dict(),
+                    )
+                    for (_, date, call_type, outcome), delta in deltas.items()
+                ],
+                batch_size=batch_size,
+            )
+            created += len(deltas)
+
+    return created
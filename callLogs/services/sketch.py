@@ -0,0 +1,81 @@
+import math
+
+# Relative accuracy of every quantile estimate (2%)
+RELATIVE_ACCURACY = 0.02
+GAMMA = (1 + RELATIVE_ACCURACY) / (1 - RELATIVE_ACCURACY)
+LOG_GAMMA = math.log(GAMMA)
+
+
+class QuantileSketch:
+    """
+    Mergeable quantile sketch over non-negative values (DDSketch style).
+
+    Values fall into logarithmic buckets, so any quantile is estimated
+    within RELATIVE_ACCURACY of the true value, and two sketches merge by
+    adding bucket counts. Stored as JSON: {"zeros": n, "buckets": {i: n}}.
+    """
+
+    def __init__(self, zeros=0, buckets=None):
+        self.zeros = zeros
+        self.buckets = buckets or {}
+
+    @classmethod
+    def from_dict(cls, data):
+        if not data:
+            return cls()
+        return cls(
+            data.get("zeros", 0),
+            {int(index): count for index, count in data.get("buckets", {}).items()},
+        )
+
+    def to_dict(self):
+        return {
+            "zeros": self.zeros,
+            "buckets": {str(index): count for index, count in self.buckets.items()},
+        }
+
+    @property
+    def count(self):
+        return self.zeros + sum(self.buckets.values())
+
+    def add(self, value, count=1):
+        """
+        Count a value; a negative count takes values added before back out
+        """
+        if value <= 0:
+            self.zeros += count
+            return
+        self._add_bucket(math.ceil(math.log(value) / LOG_GAMMA), count)
+
+    def _add_bucket(self, index, count):
+        total = self.buckets.get(index, 0) + count
+        if total:
+            self.buckets[index] = total
+        else:
+            self.buckets.pop(index, None)
+
+    def merge(self, other):
+        self.zeros += other.zeros
+        for index, count in other.buckets.items():
+            self._add_bucket(index, count)
+        return self
+
+    def quantile(self, q):
+        """
+        Estimated value at quantile q (0..1), None for an empty sketch
+        """
+        total = self.count
+        if not total:
+            return None
+
+        rank = q * (total - 1)
+        if rank < self.zeros:
+            return 0.0
+
+        seen = self.zeros
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen > rank:
+                # middle of the bucket (GAMMA^(i-1), GAMMA^i] in relative terms
+                return 2 * GAMMA**index / (GAMMA + 1)
+        return 2 * GAMMA ** max(self.buckets) / (GAMMA + 1)
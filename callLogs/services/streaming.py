@@ -0,0 +1,79 @@
+from django.db import transaction
+from django.utils import timezone
+from callLogs.models import CallSession, CallStatus, CallTranscript
+from callLogs.signals import calls_completed
+from callLogs.utils import format_duration, parse_duration
+
+
+def append_transcript_chunks(call_id, chunks):
+    """
+    Store a batch of transcript chunks for an in-progress call.
+    Chunks already stored (same sequence) are ignored so the worker
+    can safely retry a batch. Returns False when the call does not
+    exist or was already closed.
+    """
+    with transaction.atomic():
+        # the call row is locked so a concurrent close waits for the batch
+        # (or the batch sees the closed call), never one in between
+        call = (
+            CallSession.objects.select_for_update()
+            .filter(pk=call_id, status=CallStatus.IN_PROGRESS)
+            .only("id")
+            .first()
+        )
+        if call is None:
+            return False
+
+        CallTranscript.objects.bulk_create(
+            [CallTranscript(call_id=call_id, **chunk) for chunk in chunks],
+            ignore_conflicts=True,
+        )
+    return True
+
+
+def close_call(call_id, data):
+    """
+    Finish an in-progress call. Returns None when the call does not
+    exist or was already closed.
+    """
+    with transaction.atomic():
+        call = (
+            CallSession.objects.select_for_update()
+            .filter(pk=call_id, status=CallStatus.IN_PROGRESS)
+            .first()
+        )
+        if call is None:
+            return None
+
+        call.ended_at = data.get("ended_at") or timezone.now()
+        if data.get("duration"):
+            call.duration = data["duration"]
+            call.duration_seconds = parse_duration(call.duration)
+        else:
+            elapsed = (call.ended_at - call.started_at).total_seconds()
+            call.duration_seconds = max(int(elapsed), 0)
+            call.duration = format_duration(call.duration_seconds)
+
+        call.call_type = data["call_type"]
+        call.outcome = data.get("outcome")
+        if "answered_at" in data:
+            call.answered_at = data["answered_at"]
+        if "audio_url" in data:
+            call.audio_url = data["audio_url"]
+        call.status = CallStatus.COMPLETED
+        call.save(
+            update_fields=[
+                "answered_at",
+                "ended_at",
+                "duration",
+                "duration_seconds",
+                "call_type",
+                "outcome",
+                "audio_url",
+                "status",
+            ]
+        )
+
+        calls_completed.send(sender=CallSession, calls=[call])
+
+    return call
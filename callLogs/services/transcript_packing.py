@@ -0,0 +1,159 @@
+import struct
+import zlib
+from collections import namedtuple
+from datetime import datetime, timedelta, timezone as dt_timezone
+from django.core.exceptions import ObjectDoesNotExist
+from django.db import transaction
+from callLogs.models import CallSession, CallStatus, CallTranscript, CallTranscriptBlob
+
+# Packed layout (zlib compressed as a whole):
+#   header   <B B I q>  version, speaker count, message count,
+#                       base timestamp (microseconds since the epoch)
+#   speakers <B> length + UTF-8 name, per speaker
+#   entries  <B Q I>    speaker index, offset from base (microseconds),
+#                       message length
+#   messages UTF-8 text of every message, back to back
+# Messages are kept in (sequence, id) order; the sequence is their index.
+# Version 1 blobs stored the offset in milliseconds (<B I I>) and are
+# still read.
+VERSION = 2
+HEADER = struct.Struct("<BBIq")
+SPEAKER = struct.Struct("<B")
+ENTRY = struct.Struct("<BQI")
+ENTRY_V1 = struct.Struct("<BII")
+COMPRESSION_LEVEL = 6
+
+EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+
+PackedTranscript = namedtuple(
+    "PackedTranscript", ["speaker", "message", "sequence", "timestamp"]
+)
+
+
+def _micros(value):
+    return (value - EPOCH) // timedelta(microseconds=1)
+
+
+def pack(transcripts):
+    """
+    Pack (speaker, message, timestamp) tuples, in order, into bytes
+    """
+    speakers = []
+    speaker_index = {}
+    entries = []
+    messages = []
+    base = min((_micros(t[2]) for t in transcripts), default=0)
+
+    for speaker, message, timestamp in transcripts:
+        if speaker not in speaker_index:
+            speaker_index[speaker] = len(speakers)
+            speakers.append(speaker)
+        text = message.encode()
+        entries.append(
+            ENTRY.pack(speaker_index[speaker], _micros(timestamp) - base, len(text))
+        )
+        messages.append(text)
+
+    parts = [HEADER.pack(VERSION, len(speakers), len(entries), base)]
+    for speaker in speakers:
+        name = speaker.encode()
+        parts += [SPEAKER.pack(len(name)), name]
+    return zlib.compress(b"".join(parts + entries + messages), COMPRESSION_LEVEL)
+
+
+def unpack(data):
+    """
+    PackedTranscript entries of a packed blob
+    """
+    raw = zlib.decompress(data)
+    version, speaker_count, count, base = HEADER.unpack_from(raw)
+    if version == VERSION:
+        entry, unit = ENTRY, timedelta(microseconds=1)
+    elif version == 1:
+        entry, unit = ENTRY_V1, timedelta(milliseconds=1)
+    else:
+        raise ValueError(f"Unknown transcript blob version {version}")
+
+    position = HEADER.size
+    speakers = []
+    for _ in range(speaker_count):
+        (length,) = SPEAKER.unpack_from(raw, position)
+        position += SPEAKER.size
+        speakers.append(raw[position : position + length].decode())
+        position += length
+
+    entries = list(entry.iter_unpack(raw[position : position + entry.size * count]))
+    position += entry.size * count
+
+    transcripts = []
+    for sequence, (speaker, offset, length) in enumerate(entries):
+        transcripts.append(
+            PackedTranscript(
+                speaker=speakers[speaker],
+                message=raw[position : position + length].decode(),
+                sequence=sequence,
+                timestamp=EPOCH + timedelta(microseconds=base) + offset * unit,
+            )
+        )
+        position += length
+    return transcripts
+
+
+def search_text(messages):
+    """
+    Searchable text of a packed call: its messages, one per line
+    """
+    return "\n".join(messages)
+
+
+def packed_transcripts(call):
+    """
+    Unpacked transcripts of a packed call, None when it still uses rows
+    """
+    try:
+        blob = call.transcript_blob
+    except ObjectDoesNotExist:
+        return None
+    return unpack(bytes(blob.data))
+
+
+def pack_calls(call_ids):
+    """
+    Replace the transcript rows of finished calls with one blob each.
+    Calls without transcripts get an empty blob, so they are not picked
+    up again (like NO_TRANSCRIPTS of the archive). Returns (calls packed,
+    rows deleted).
+    """
+    with transaction.atomic():
+        call_ids = list(
+            CallSession.objects.select_for_update()
+            .filter(
+                pk__in=call_ids,
+                status=CallStatus.COMPLETED,
+                transcript_blob__isnull=True,
+            )
+            .values_list("pk", flat=True)
+        )
+
+        rows = {call_id: [] for call_id in call_ids}
+        for call_id, speaker, message, timestamp in (
+            CallTranscript.objects.filter(call_id__in=call_ids)
+            .order_by("call_id", "sequence", "id")
+            .values_list("call_id", "speaker", "message", "timestamp")
+        ):
+            rows[call_id].append((speaker, message, timestamp))
+
+        CallTranscriptBlob.objects.bulk_create(
+            [
+                CallTranscriptBlob(
+                    call_id=call_id,
+                    data=pack(transcripts),
+                    message_count=len(transcripts),
+                    search_text=search_text(message for _, message, _ in transcripts),
+                )
+                for call_id, transcripts in rows.items()
+            ]
+        )
+        deleted, _ = CallTranscript.objects.filter(call_id__in=call_ids).delete()
+
+    return len(rows), deleted
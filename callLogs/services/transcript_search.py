@@ -0,0 +1,307 @@
+import re
+from django.db import OperationalError, connection
+from callLogs.models import CallSession, CallTranscript, CallTranscriptBlob
+
+# SQLite: FTS5 external-content tables kept in sync by triggers (bulk_create
+# does not send signals), one over CallTranscript.message and one over
+# CallTranscriptBlob.search_text (packed calls).
+# PostgreSQL: GIN expression indexes on to_tsvector(...), always in sync.
+FTS_TABLE = "callLogs_transcript_fts"
+BLOB_FTS_TABLE = "callLogs_transcript_blob_fts"
+PG_INDEX = "calltranscript_message_fts_idx"
+PG_BLOB_INDEX = "calltranscriptblob_text_fts_idx"
+PG_CONFIG = "english"
+HIGHLIGHT = ("<mark>", "</mark>")
+
+# Matching messages scanned on SQLite before grouping them per call
+SQLITE_HIT_LIMIT = 2000
+
+_backend = None
+
+
+def _sqlite_fts_statements(conn, fts_table, table, column, rowid):
+    qn = conn.ops.quote_name
+    fts = qn(fts_table)
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+        f"{column}, content='{table}', content_rowid='{rowid}', "
+        f"tokenize='porter unicode61')",
+        f"CREATE TRIGGER IF NOT EXISTS {qn(fts_table + '_ai')} "
+        f"AFTER INSERT ON {qn(table)} BEGIN "
+        f"INSERT INTO {fts}(rowid, {column}) VALUES (new.{rowid}, new.{column}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {qn(fts_table + '_ad')} "
+        f"AFTER DELETE ON {qn(table)} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {column}) "
+        f"VALUES ('delete', old.{rowid}, old.{column}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {qn(fts_table + '_au')} "
+        f"AFTER UPDATE OF {column} ON {qn(table)} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {column}) "
+        f"VALUES ('delete', old.{rowid}, old.{column}); "
+        f"INSERT INTO {fts}(rowid, {column}) VALUES (new.{rowid}, new.{column}); END",
+        f"INSERT INTO {fts}({fts}) VALUES ('rebuild')",
+    ]
+
+
+def _sqlite_drop_statements(conn, fts_table):
+    qn = conn.ops.quote_name
+    return [
+        f"DROP TRIGGER IF EXISTS {qn(fts_table + suffix)}"
+        for suffix in ["_ai", "_ad", "_au"]
+    ] + [f"DROP TABLE IF EXISTS {qn(fts_table)}"]
+
+
+def _execute(conn, statements):
+    try:
+        with conn.cursor() as cursor:
+            for statement in statements:
+                cursor.execute(statement)
+    except OperationalError:
+        # SQLite built without FTS5
+        return False
+    return True
+
+
+def _concurrently(conn):
+    # PostgreSQL builds the GIN indexes without locking out writes to the
+    # transcript tables, which needs to run outside a transaction (the
+    # migrations that install them are non-atomic)
+    return "" if conn.in_atomic_block else " CONCURRENTLY"
+
+
+def install_search_index(conn):
+    """
+    Create the full-text indexes for the connection's database and index
+    existing transcripts. Safe to run again (rebuild_transcript_search).
+    Returns False when the database has no full-text support.
+    """
+    qn = conn.ops.quote_name
+    table = CallTranscript._meta.db_table
+
+    if conn.vendor == "sqlite":
+        statements = _sqlite_fts_statements(conn, FTS_TABLE, table, "message", "id")
+    elif conn.vendor == "postgresql":
+        statements = [
+            f"CREATE INDEX{_concurrently(conn)} IF NOT EXISTS {qn(PG_INDEX)} "
+            f"ON {qn(table)} "
+            f"USING GIN (to_tsvector('{PG_CONFIG}', message))"
+        ]
+    else:
+        return False
+
+    if not _execute(conn, statements):
+        return False
+    # the blob table comes with a later migration than the first install
+    if CallTranscriptBlob._meta.db_table in conn.introspection.table_names():
+        return install_blob_search_index(conn)
+    return True
+
+
+def install_blob_search_index(conn):
+    """
+    Full-text index over the search_text of packed transcripts
+    """
+    qn = conn.ops.quote_name
+    table = CallTranscriptBlob._meta.db_table
+
+    if conn.vendor == "sqlite":
+        statements = _sqlite_fts_statements(
+            conn, BLOB_FTS_TABLE, table, "search_text", "call_id"
+        )
+    elif conn.vendor == "postgresql":
+        statements = [
+            f"CREATE INDEX{_concurrently(conn)} IF NOT EXISTS {qn(PG_BLOB_INDEX)} "
+            f"ON {qn(table)} "
+            f"USING GIN (to_tsvector('{PG_CONFIG}', search_text))"
+        ]
+    else:
+        return False
+    return _execute(conn, statements)
+
+
+def uninstall_search_index(conn):
+    qn = conn.ops.quote_name
+
+    if conn.vendor == "sqlite":
+        statements = _sqlite_drop_statements(conn, FTS_TABLE)
+    elif conn.vendor == "postgresql":
+        statements = [f"DROP INDEX{_concurrently(conn)} IF EXISTS {qn(PG_INDEX)}"]
+    else:
+        return
+
+    with conn.cursor() as cursor:
+        for statement in statements:
+            cursor.execute(statement)
+
+
+def uninstall_blob_search_index(conn):
+    qn = conn.ops.quote_name
+
+    if conn.vendor == "sqlite":
+        statements = _sqlite_drop_statements(conn, BLOB_FTS_TABLE)
+    elif conn.vendor == "postgresql":
+        statements = [
+            f"DROP INDEX{_concurrently(conn)} IF EXISTS {qn(PG_BLOB_INDEX)}"
+        ]
+    else:
+        return
+
+    with conn.cursor() as cursor:
+        for statement in statements:
+            cursor.execute(statement)
+
+
+def search_backend():
+    """
+    "sqlite", "postgresql" or None when only the icontains fallback works
+    """
+    global _backend
+    if _backend is None:
+        if connection.vendor == "sqlite":
+            tables = connection.introspection.table_names()
+            _backend = (
+                "sqlite" if {FTS_TABLE, BLOB_FTS_TABLE} <= set(tables) else ""
+            )
+        elif connection.vendor == "postgresql":
+            _backend = "postgresql"
+        else:
+            _backend = ""
+    return _backend or None
+
+
+def search_transcripts(query, store_ids=None, limit=20):
+    """
+    Ranked call IDs whose transcripts match the query, best first.
+    Returns a list of {"call_id", "score", "snippet"}; a higher score
+    is a better match.
+    """
+    words = re.findall(r"\w+", query)
+    if not words:
+        return []
+
+    backend = search_backend()
+    if backend == "sqlite":
+        return _search_sqlite(words, store_ids, limit)
+    if backend == "postgresql":
+        return _search_postgresql(query, store_ids, limit)
+    return _search_fallback(words, store_ids, limit)
+
+
+def _store_clause(store_ids):
+    if store_ids is None:
+        return "", []
+    placeholders = ", ".join(["%s"] * len(store_ids)) or "NULL"
+    return f" AND c.store_id IN ({placeholders})", list(store_ids)
+
+
+def _search_sqlite(words, store_ids, limit):
+    qn = connection.ops.quote_name
+    fts = qn(FTS_TABLE)
+    blob_fts = qn(BLOB_FTS_TABLE)
+    store_clause, store_params = _store_clause(store_ids)
+    # every word quoted: user input never reaches the FTS5 query syntax
+    match = " ".join('"%s"' % word for word in words)
+
+    # transcript rows and packed calls; a packed call is one long document,
+    # so it ranks a little lower than the same text kept as rows
+    sql = (
+        "SELECT call_id, MIN(rank) AS best, snippet FROM ("
+        "SELECT * FROM ("
+        f"SELECT t.call_id AS call_id, {fts}.rank AS rank, "
+        f"snippet({fts}, 0, %s, %s, '…', 12) AS snippet "
+        f"FROM {fts} "
+        f"JOIN {qn(CallTranscript._meta.db_table)} t ON t.id = {fts}.rowid "
+        f"JOIN {qn(CallSession._meta.db_table)} c "
+        "ON c.id = t.call_id "
+        f"WHERE {fts} MATCH %s{store_clause} "
+        f"ORDER BY {fts}.rank LIMIT %s"
+        ") UNION ALL SELECT * FROM ("
+        f"SELECT c.id AS call_id, {blob_fts}.rank AS rank, "
+        f"snippet({blob_fts}, 0, %s, %s, '…', 12) AS snippet "
+        f"FROM {blob_fts} "
+        f"JOIN {qn(CallSession._meta.db_table)} c ON c.id = {blob_fts}.rowid "
+        f"WHERE {blob_fts} MATCH %s{store_clause} "
+        f"ORDER BY {blob_fts}.rank LIMIT %s"
+        ")) GROUP BY call_id ORDER BY best LIMIT %s"
+    )
+    params = [
+        *HIGHLIGHT,
+        match,
+        *store_params,
+        SQLITE_HIT_LIMIT,
+        *HIGHLIGHT,
+        match,
+        *store_params,
+        SQLITE_HIT_LIMIT,
+        limit,
+    ]
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        rows = cursor.fetchall()
+
+    # bm25 is negative, lower is better
+    return [
+        {"call_id": call_id, "score": round(-rank, 6), "snippet": snippet}
+        for call_id, rank, snippet in rows
+    ]
+
+
+def _search_postgresql(query, store_ids, limit):
+    qn = connection.ops.quote_name
+    store_clause, store_params = _store_clause(store_ids)
+    vector = f"to_tsvector('{PG_CONFIG}', t.message)"
+    blob_vector = f"to_tsvector('{PG_CONFIG}', b.search_text)"
+
+    # transcript rows and packed calls, best matching text per call
+    sql = (
+        f"WITH q AS (SELECT websearch_to_tsquery('{PG_CONFIG}', %s) AS query), "
+        "hits AS ("
+        "SELECT DISTINCT ON (call_id) call_id, message, rank FROM ("
+        f"SELECT t.call_id, t.message, ts_rank({vector}, q.query) AS rank "
+        f"FROM {qn(CallTranscript._meta.db_table)} t "
+        f"JOIN {qn(CallSession._meta.db_table)} c "
+        "ON c.id = t.call_id, q "
+        f"WHERE {vector} @@ q.query{store_clause} "
+        "UNION ALL "
+        f"SELECT b.call_id, b.search_text, ts_rank({blob_vector}, q.query) "
+        f"FROM {qn(CallTranscriptBlob._meta.db_table)} b "
+        f"JOIN {qn(CallSession._meta.db_table)} c "
+        "ON c.id = b.call_id, q "
+        f"WHERE {blob_vector} @@ q.query{store_clause}"
+        ") matches ORDER BY call_id, rank DESC"
+        ") "
+        f"SELECT hits.call_id, hits.rank, ts_headline('{PG_CONFIG}', hits.message, "
+        "q.query, %s) FROM hits, q ORDER BY hits.rank DESC LIMIT %s"
+    )
+    options = "StartSel=%s, StopSel=%s, MaxFragments=1" % HIGHLIGHT
+    params = [query, *store_params, *store_params, options, limit]
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        rows = cursor.fetchall()
+
+    return [
+        {"call_id": call_id, "score": round(rank, 6), "snippet": snippet}
+        for call_id, rank, snippet in rows
+    ]
+
+
+def _search_fallback(words, store_ids, limit):
+    transcripts = CallTranscript.objects.all()
+    blobs = CallTranscriptBlob.objects.all()
+    for word in words:
+        transcripts = transcripts.filter(message__icontains=word)
+        blobs = blobs.filter(search_text__icontains=word)
+    if store_ids is not None:
+        transcripts = transcripts.filter(call__store_id__in=store_ids)
+        blobs = blobs.filter(call__store_id__in=store_ids)
+
+    results = {}
+    for hits in (
+        transcripts.values_list("call_id", "message")[:SQLITE_HIT_LIMIT],
+        blobs.values_list("call_id", "search_text")[:SQLITE_HIT_LIMIT],
+    ):
+        for call_id, message in hits:
+            if call_id not in results and len(results) < limit:
+                results[call_id] = {"call_id": call_id, "score": 0, "snippet": message}
+    return list(results.values())
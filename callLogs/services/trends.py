@@ -0,0 +1,154 @@
+import calendar
+from datetime import timedelta
+from django.db.models import Count, Sum
+from django.db.models.functions import ExtractHour
+from callLogs.models import CallDailyRollup, CallSession, CallStatus
+from callLogs.utils import day_start
+
+GRANULARITIES = ("hour", "day", "week", "month")
+
+# Upper bound for custom ranges (about three years of days)
+MAX_BUCKETS = 1100
+
+
+class TrendBuckets:
+    """
+    Dense bucket layout for a date range.
+
+    Bucket i covers one period; index() maps a date (or an hour for the
+    hour-of-day granularity) to its bucket with arithmetic instead of a
+    label lookup, and key()/label() describe bucket i.
+    """
+
+    def __init__(self, start, end, granularity):
+        self.start = start
+        self.end = end
+        self.granularity = granularity
+
+        if granularity == "hour":
+            self.origin = 0
+            self.size = 24
+        elif granularity == "day":
+            self.origin = start
+            self.size = (end - start).days + 1
+        elif granularity == "week":
+            self.origin = start - timedelta(days=start.weekday())
+            self.size = (end - self.origin).days // 7 + 1
+        else:
+            self.origin = start.year * 12 + start.month - 1
+            self.size = end.year * 12 + end.month - 1 - self.origin + 1
+
+    def index(self, value):
+        if self.granularity == "hour":
+            return value
+        if self.granularity == "day":
+            return (value - self.origin).days
+        if self.granularity == "week":
+            return (value - self.origin).days // 7
+        return value.year * 12 + value.month - 1 - self.origin
+
+    def period(self, i):
+        if self.granularity == "day":
+            return self.origin + timedelta(days=i)
+        if self.granularity == "week":
+            return self.origin + timedelta(weeks=i)
+        year, month = divmod(self.origin + i, 12)
+        return self.start.replace(year=year, month=month + 1, day=1)
+
+    def key(self, i):
+        """
+        Stable, sortable ISO key (unique across the range)
+        """
+        if self.granularity == "hour":
+            return f"{i:02d}"
+        period = self.period(i)
+        if self.granularity == "day":
+            return period.isoformat()
+        if self.granularity == "week":
+            year, week, _ = period.isocalendar()
+            return f"{year}-W{week:02d}"
+        return f"{period:%Y-%m}"
+
+    def label(self, i):
+        """
+        Short display label, as the dashboard charts show it
+        """
+        if self.granularity == "hour":
+            return f"{i:02d}:00"
+        period = self.period(i)
+        if self.granularity == "day":
+            if self.size <= 7:
+                return calendar.day_abbr[period.weekday()]
+            if (self.start.year, self.start.month) == (self.end.year, self.end.month):
+                return str(period.day)
+            return f"{calendar.month_abbr[period.month]} {period.day}"
+        if self.granularity == "week":
+            return f"{calendar.month_abbr[period.month]} {period.day}"
+        if self.start.year == self.end.year:
+            return calendar.month_abbr[period.month]
+        return f"{calendar.month_abbr[period.month]} {period.year}"
+
+
+def _rows(store_ids, start, end, granularity):
+    """
+    (bucket value, call_type, count) rows from one grouped query
+    """
+    if granularity == "hour":
+        calls = CallSession.objects.filter(
+            started_at__gte=day_start(start),
+            started_at__lt=day_start(end + timedelta(days=1)),
+        ).exclude(status=CallStatus.IN_PROGRESS)
+        if store_ids is not None:
+            calls = calls.filter(store_id__in=store_ids)
+        return (
+            calls.annotate(hour=ExtractHour("started_at"))
+            .values("hour", "call_type")
+            .annotate(count=Count("id"))
+            .values_list("hour", "call_type", "count")
+            .order_by()
+        )
+
+    rollups = CallDailyRollup.objects.filter(date__gte=start, date__lte=end)
+    if store_ids is not None:
+        rollups = rollups.filter(store_id__in=store_ids)
+    return (
+        rollups.values("date", "call_type")
+        .annotate(count=Sum("call_count"))
+        .values_list("date", "call_type", "count")
+        .order_by()
+    )
+
+
+def build_call_trends(store_ids, start, end, granularity="day", series=False):
+    """
+    Call counts per period between start and end (inclusive dates).
+
+    Every period is present (zero filled). With series=True the counts
+    are also split per call type, aligned with the trend buckets, so one
+    request feeds a stacked chart.
+    """
+    buckets = TrendBuckets(start, end, granularity)
+    totals = [0] * buckets.size
+    by_type = {}
+
+    for value, call_type, count in _rows(store_ids, start, end, granularity):
+        i = buckets.index(value)
+        totals[i] += count
+        if series:
+            if call_type not in by_type:
+                by_type[call_type] = [0] * buckets.size
+            by_type[call_type][i] += count
+
+    data = {
+        "granularity": granularity,
+        "start": start,
+        "end": end,
+        "total_calls": sum(totals),
+        "trend": [
+            {"key": buckets.key(i), "label": buckets.label(i), "count": totals[i]}
+            for i in range(buckets.size)
+        ],
+    }
+    if series:
+        data["series"] = by_type
+    return data
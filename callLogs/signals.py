@@ -0,0 +1,96 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.db import transaction
+from django.dispatch import Signal, receiver
+from django.utils import timezone
+from appointments.models import Appointment
+from callLogs.models import CallSession, CallStatus
+from callLogs.services.dashboard_cache import bump_store_generations
+from callLogs.services.funnel import (
+    invalidate_call_funnel_days,
+    invalidate_funnel_days,
+)
+from callLogs.services.rollups import ROLLUP_FIELDS, rollup_values
+from jobs.services.queue import enqueue
+
+# Sent with calls=[CallSession, ...] when finished calls are stored without
+# a post_save(created=True) for them: bulk ingestion (bulk_create sends no
+# post_save) and closing a streamed in-progress call
+calls_completed = Signal()
+
+
+@receiver(pre_save, sender=CallSession, dispatch_uid="call_daily_rollup_before")
+def remember_call_rollup(sender, instance, update_fields=None, **kwargs):
+    # what an updated call counted for so far, to take it out of the
+    # rollups it moves away from
+    instance._rollup_before = None
+    if instance._state.adding or (
+        update_fields is not None and not set(update_fields) & set(ROLLUP_FIELDS)
+    ):
+        return
+    before = (
+        CallSession.objects.filter(pk=instance.pk)
+        .only(*ROLLUP_FIELDS)
+        .first()
+    )
+    # in-progress calls are counted when they are closed (calls_completed)
+    if before is not None and before.status != CallStatus.IN_PROGRESS:
+        instance._rollup_before = before
+
+
+# Dashboards of a store are invalidated by the record_rollups job once the
+# rollups it changed are committed (see callLogs/jobs.py). Bumping when the
+# call commits would let a request cache the old rollups under the new
+# generation before the job ran.
+
+
+def _invalidate_on_commit(store_ids):
+    # after commit, so a concurrent request can not cache pre-write data
+    # under the new generation
+    transaction.on_commit(lambda: bump_store_generations(store_ids))
+
+
+@receiver(post_save, sender=CallSession, dispatch_uid="call_daily_rollup")
+def update_call_rollup(sender, instance, created, **kwargs):
+    if created:
+        # in-progress calls are counted when they are closed
+        if instance.status != CallStatus.IN_PROGRESS:
+            enqueue("callLogs.record_rollups", added=[rollup_values(instance)])
+        return
+
+    before = getattr(instance, "_rollup_before", None)
+    added = (
+        [rollup_values(instance)]
+        if instance.status != CallStatus.IN_PROGRESS
+        else []
+    )
+    removed = [rollup_values(before)] if before is not None else []
+    if before is not None and added != removed:
+        enqueue("callLogs.record_rollups", added=added, removed=removed)
+    elif instance.status != CallStatus.IN_PROGRESS:
+        # rollups unchanged (phone number, issue, ...): caller profiles
+        # and funnel bookings read the calls themselves
+        _invalidate_on_commit([instance.store_id])
+        transaction.on_commit(lambda: invalidate_call_funnel_days([instance]))
+
+
+@receiver(post_delete, sender=CallSession, dispatch_uid="call_daily_rollup_delete")
+def remove_call_rollup(sender, instance, **kwargs):
+    if instance.status != CallStatus.IN_PROGRESS:
+        enqueue("callLogs.record_rollups", removed=[rollup_values(instance)])
+
+
+@receiver(calls_completed, dispatch_uid="call_daily_rollup_bulk")
+def update_call_rollups(sender, calls, **kwargs):
+    enqueue(
+        "callLogs.record_rollups", added=[rollup_values(call) for call in calls]
+    )
+
+
+@receiver(post_save, sender=Appointment, dispatch_uid="appointment_dashboard_cache")
+@receiver(
+    post_delete, sender=Appointment, dispatch_uid="appointment_dashboard_cache_delete"
+)
+def invalidate_store_dashboards(sender, instance, **kwargs):
+    _invalidate_on_commit([instance.store_id])
+    day = (instance.store_id, timezone.localtime(instance.created_at).date())
+    transaction.on_commit(lambda: invalidate_funnel_days([day]))
@@ -1,3 +1,676 @@
-from django.test import TestCase
+import csv
+import json
+import os
+import tempfile
+import zlib
+from datetime import timedelta
+from io import StringIO
+from django.conf import settings
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+from accounts.models import User, UserRole
+from ai_api_key.models import APIKey
+from callLogs.models import (
+    CallDailyRollup,
+    CallFunnelDay,
+    CallOutcome,
+    CallSession,
+    CallStatus,
+    CallTranscript,
+    CallType,
+)
+from callLogs.services.archive import NO_TRANSCRIPTS, archive_transcripts
+from callLogs.services.call_summary import build_store_call_summary
+from callLogs.services.funnel import build_call_funnel
+from callLogs.services.rollups import record_calls
+from callLogs.services.sketch import RELATIVE_ACCURACY, QuantileSketch
+from callLogs.services import transcript_packing
+from callLogs.services.transcript_packing import (
+    pack,
+    pack_calls,
+    packed_transcripts,
+    unpack,
+)
+from callLogs.utils import parse_duration
+from store.models import Store
 
-# Create your tests here.
+
+class StoreCallSummaryTests(TestCase):
+    def create_store(self, name, calls):
+        store = Store.objects.create(name=name, location="Dhaka")
+        now = timezone.now()
+        created = CallSession.objects.bulk_create(
+            [
+                CallSession(
+                    store=store,
+                    phone_number="+15550000000",
+                    call_type=call_type,
+                    duration=duration,
+                    duration_seconds=parse_duration(duration),
+                    started_at=now,
+                )
+                for call_type, duration in calls
+            ]
+        )
+        record_calls(created)
+        return store
+
+    def test_summary_counts_and_average_duration(self):
+        store = self.create_store(
+            "Store A",
+            [
+                (CallType.AI_RESOLVED, "02:00"),
+                (CallType.AI_RESOLVED, "02:00"),
+                (CallType.WARM_TRANSFER, "00:01:00"),
+                (CallType.APPOINTMENT, "05:00"),
+                (CallType.DROPPED, ""),
+            ],
+        )
+        empty_store = self.create_store("Store B", [])
+
+        data = build_store_call_summary(
+            Store.objects.order_by("id"), timezone.now().date(), single_day=True
+        )
+
+        self.assertEqual(
+            data,
+            [
+                {
+                    "store_id": store.id,
+                    "store_name": "Store A",
+                    "total_calls": 5,
+                    "ai_handled": 2,
+                    "warm_transfer": 1,
+                    "appointments_booked": 1,
+                    "missed_calls": 1,
+                    "avg_call_duration": 2.5,
+                },
+                {
+                    "store_id": empty_store.id,
+                    "store_name": "Store B",
+                    "total_calls": 0,
+                    "ai_handled": 0,
+                    "warm_transfer": 0,
+                    "appointments_booked": 0,
+                    "missed_calls": 0,
+                    "avg_call_duration": 0,
+                },
+            ],
+        )
+
+    def test_query_count_does_not_grow_with_stores(self):
+        calls = [(CallType.AI_RESOLVED, "01:00"), (CallType.WARM_TRANSFER, "03:00")]
+        self.create_store("Store 0", calls)
+        start_date = timezone.now().date()
+
+        with self.assertNumQueries(2):
+            build_store_call_summary(Store.objects.all(), start_date)
+
+        for i in range(1, 25):
+            self.create_store(f"Store {i}", calls)
+
+        with self.assertNumQueries(2):
+            data = build_store_call_summary(Store.objects.all(), start_date)
+
+        self.assertEqual(len(data), 25)
+        self.assertTrue(all(row["total_calls"] == 2 for row in data))
+
+
+@override_settings(JOBS_EAGER=True)
+class CallRollupTests(TestCase):
+    def rollups(self):
+        rows = CallDailyRollup.objects.filter(call_count__gt=0).values_list(
+            "date", "call_type", "call_count", "duration_total"
+        )
+        return {(date, call_type): counts for date, call_type, *counts in rows}
+
+    def test_updated_and_deleted_calls_move_out_of_their_rollups(self):
+        store = Store.objects.create(name="Store A", location="Dhaka")
+        started_at = timezone.now()
+        today = timezone.localtime(started_at).date()
+        with self.captureOnCommitCallbacks(execute=True):
+            call = CallSession.objects.create(
+                store=store,
+                phone_number="+15550000000",
+                call_type=CallType.AI_RESOLVED,
+                duration="02:00",
+                duration_seconds=120,
+                started_at=started_at,
+            )
+        self.assertEqual(self.rollups(), {(today, CallType.AI_RESOLVED): [1, 120]})
+
+        call.call_type = CallType.DROPPED
+        call.started_at = started_at - timedelta(days=1)
+        with self.captureOnCommitCallbacks(execute=True):
+            call.save()
+        self.assertEqual(
+            self.rollups(),
+            {(today - timedelta(days=1), CallType.DROPPED): [1, 120]},
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            call.delete()
+        self.assertEqual(self.rollups(), {})
+
+    def test_backfilled_durations_are_rebuilt_into_the_rollups(self):
+        store = Store.objects.create(name="Store A", location="Dhaka")
+        started_at = timezone.now()
+        # stored before duration_seconds existed, already in the rollups
+        calls = CallSession.objects.bulk_create(
+            [
+                CallSession(
+                    store=store,
+                    phone_number="+15550000000",
+                    call_type=CallType.AI_RESOLVED,
+                    duration="01:30",
+                    started_at=started_at,
+                )
+            ]
+        )
+        record_calls(calls)
+        today = timezone.localtime(started_at).date()
+        self.assertEqual(self.rollups(), {(today, CallType.AI_RESOLVED): [1, 0]})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command("backfill_call_durations", stdout=StringIO())
+        self.assertEqual(self.rollups(), {(today, CallType.AI_RESOLVED): [1, 90]})
+
+
+@override_settings(JOBS_EAGER=True)
+class CallFunnelTests(TestCase):
+    def add_call(self, store, started_at, outcome=CallOutcome.QUOTE_PROVIDED):
+        with self.captureOnCommitCallbacks(execute=True):
+            return CallSession.objects.create(
+                store=store,
+                phone_number="+15550000000",
+                call_type=CallType.AI_RESOLVED,
+                outcome=outcome,
+                duration="01:00",
+                duration_seconds=60,
+                started_at=started_at,
+            )
+
+    def test_closed_days_are_kept_until_a_late_write(self):
+        store = Store.objects.create(name="Store A", location="Dhaka")
+        other = Store.objects.create(name="Store B", location="Dhaka")
+        today = timezone.localdate()
+        start = today - timedelta(days=30)
+        past = timezone.now() - timedelta(days=10)
+        self.add_call(store, past)
+        self.add_call(other, past)
+
+        (first, second) = build_call_funnel(None, start, today)
+        self.assertEqual((first["calls"], first["quotes_provided"]), (1, 1))
+        # every closed day of both stores is kept
+        self.assertEqual(CallFunnelDay.objects.count(), 2 * 30)
+
+        # stores, kept totals, stale kept days, and the open day (2)
+        with self.assertNumQueries(5):
+            build_call_funnel(None, start, today)
+
+        # a late call reopens its own store's day only
+        self.add_call(store, past, outcome=CallOutcome.ESCALATED)
+        first, second = build_call_funnel(None, start, today)
+        self.assertEqual(first["calls"], 2)
+        self.assertEqual(second["calls"], 1)
+
+
+class StoreAPIKeyTests(TestCase):
+    def setUp(self):
+        store = Store.objects.create(name="Main", location="Dhaka")
+        APIKey.objects.create(store=store, api_key="store-key")
+        self.client = APIClient()
+        self.client.credentials(HTTP_X_API_KEY="store-key")
+
+    def test_key_is_accepted_by_the_ai_views_only(self):
+        response = self.client.get(
+            "/api/v1/call/caller-profile/", {"phone": "+15550000000"}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.client.get("/api/v1/call/details/").status_code, 200)
+
+        for url in ("/api/v1/call/call-stats/", "/api/v1/call/call-funnel/"):
+            self.assertEqual(self.client.get(url).status_code, 401)
+
+
+class BulkIngestTests(TestCase):
+    def test_invalid_items_are_reported_and_valid_ones_saved(self):
+        store = Store.objects.create(name="Main", location="Dhaka")
+        APIKey.objects.create(store=store, api_key="store-key")
+        client = APIClient()
+        client.credentials(HTTP_X_API_KEY="store-key")
+
+        def item(**fields):
+            return {
+                "store": store.id,
+                "phone_number": "+15550000000",
+                "call_type": CallType.AI_RESOLVED,
+                "duration": "01:30",
+                "started_at": timezone.now().isoformat(),
+                "transcripts": [{"speaker": "AI", "message": "Hello"}],
+                **fields,
+            }
+
+        items = [
+            item(),
+            item(duration="ninety seconds"),
+            item(store=store.id + 1000),
+            item(transcripts=[]),
+        ]
+        response = client.post("/api/v1/call/details/bulk/", items, format="json")
+
+        self.assertEqual(response.status_code, 207)
+        self.assertEqual((response.data["created"], response.data["failed"]), (2, 2))
+        results = response.data["results"]
+        self.assertEqual(
+            [result["status"] for result in results],
+            ["created", "failed", "failed", "created"],
+        )
+        self.assertIn("duration", results[1]["errors"])
+        self.assertIn("store", results[2]["errors"])
+
+        calls = CallSession.objects.order_by("id")
+        self.assertEqual(
+            [call.id for call in calls], [results[0]["id"], results[3]["id"]]
+        )
+        self.assertEqual(calls[0].duration_seconds, 90)
+        self.assertEqual(calls[0].transcripts.count(), 1)
+        self.assertEqual(calls[1].transcripts.count(), 0)
+
+        response = client.post("/api/v1/call/details/bulk/", [item()], format="json")
+        self.assertEqual(response.status_code, 201)
+
+
+class CallSessionPaginationTests(TestCase):
+    def test_pages_walk_ties_on_started_at_both_ways(self):
+        store = Store.objects.create(name="Main", location="Dhaka")
+        APIKey.objects.create(store=store, api_key="store-key")
+        now = timezone.now()
+        CallSession.objects.bulk_create(
+            [
+                CallSession(
+                    store=store,
+                    phone_number="+15550000000",
+                    call_type=CallType.AI_RESOLVED,
+                    duration="01:00",
+                    # runs of four calls share a started_at across pages
+                    started_at=now - timedelta(minutes=i // 4),
+                )
+                for i in range(23)
+            ]
+        )
+        expected = list(
+            CallSession.objects.order_by("-started_at", "-id").values_list(
+                "id", flat=True
+            )
+        )
+        client = APIClient()
+        client.credentials(HTTP_X_API_KEY="store-key")
+
+        pages = []
+        url = "/api/v1/call/details/?page_size=5"
+        while url:
+            response = client.get(url)
+            pages.append([call["id"] for call in response.data["results"]])
+            url = response.data["next"]
+        self.assertEqual([pk for page in pages for pk in page], expected)
+
+        url = response.data["previous"]
+        for page in reversed(pages[:-1]):
+            response = client.get(url)
+            self.assertEqual([call["id"] for call in response.data["results"]], page)
+            url = response.data["previous"]
+        self.assertIsNone(url)
+
+        response = client.get("/api/v1/call/details/", {"cursor": "cD1nYXJiYWdl"})
+        self.assertEqual(response.status_code, 404)
+
+
+class CallStreamingTests(TestCase):
+    def setUp(self):
+        self.store = Store.objects.create(name="Main", location="Dhaka")
+        self.other_store = Store.objects.create(name="Other", location="Dhaka")
+        APIKey.objects.create(store=self.store, api_key="store-key")
+        APIKey.objects.create(store=self.other_store, api_key="other-key")
+        self.client = APIClient()
+        self.client.credentials(HTTP_X_API_KEY="store-key")
+
+    def start(self, **data):
+        data.setdefault("phone_number", "+15550000000")
+        data.setdefault("started_at", timezone.now() - timedelta(minutes=3))
+        return self.client.post("/api/v1/call/details/start/", data, format="json")
+
+    def append(self, call_id, *sequences):
+        chunks = [
+            {"sequence": sequence, "speaker": "AI", "message": f"part {sequence}"}
+            for sequence in sequences
+        ]
+        return self.client.post(
+            f"/api/v1/call/details/{call_id}/transcripts/",
+            {"chunks": chunks},
+            format="json",
+        )
+
+    def close(self, call_id):
+        return self.client.post(
+            f"/api/v1/call/details/{call_id}/close/",
+            {"call_type": CallType.AI_RESOLVED},
+            format="json",
+        )
+
+    def test_streamed_call_is_started_appended_and_closed_once(self):
+        response = self.start()
+        self.assertEqual(response.status_code, 201)
+        call_id = response.data["id"]
+        self.assertEqual(response.data["status"], CallStatus.IN_PROGRESS)
+
+        self.assertEqual(self.append(call_id, 0, 1).status_code, 200)
+        # a retried batch stores nothing twice
+        self.assertEqual(self.append(call_id, 1, 2).status_code, 200)
+        call = CallSession.objects.get(pk=call_id)
+        self.assertEqual(
+            list(call.transcripts.values_list("sequence", flat=True)), [0, 1, 2]
+        )
+
+        response = self.close(call_id)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["status"], CallStatus.COMPLETED)
+        self.assertEqual(response.data["duration"], "00:03:00")
+
+        self.assertEqual(self.close(call_id).status_code, 409)
+        self.assertEqual(self.append(call_id, 3).status_code, 409)
+        self.assertEqual(call.transcripts.count(), 3)
+
+    def test_calls_belong_to_the_callers_store(self):
+        # the payload's store is ignored for the AI service
+        call_id = self.start(store=self.other_store.id).data["id"]
+        self.assertEqual(CallSession.objects.get(pk=call_id).store, self.store)
+
+        self.client.credentials(HTTP_X_API_KEY="other-key")
+        self.assertEqual(self.append(call_id, 0).status_code, 404)
+        self.assertEqual(self.close(call_id).status_code, 404)
+
+        self.client.credentials()
+        self.assertEqual(self.start().status_code, 401)
+
+        manager = User.objects.create_user(
+            email="manager@example.com",
+            password="secret",
+            first_name="Store",
+            last_name="Manager",
+            store=self.other_store,
+            role=UserRole.STORE_MANAGER,
+        )
+        self.client.force_authenticate(manager)
+        call_id = self.start(store=self.store.id).data["id"]
+        self.assertEqual(CallSession.objects.get(pk=call_id).store, self.other_store)
+
+
+class CallExportTests(TestCase):
+    def setUp(self):
+        self.store = Store.objects.create(name="Main", location="Dhaka")
+        other_store = Store.objects.create(name="Other", location="Dhaka")
+        APIKey.objects.create(store=self.store, api_key="store-key")
+        self.calls = [
+            self.add_call(self.store, CallType.AI_RESOLVED),
+            self.add_call(self.store, CallType.DROPPED),
+            self.add_call(self.store, CallType.AI_RESOLVED, days_ago=40),
+            self.add_call(other_store, CallType.AI_RESOLVED),
+        ]
+        CallTranscript.objects.create(
+            call=self.calls[0], speaker="AI", message="Hello", sequence=0
+        )
+        self.client = APIClient()
+        self.client.credentials(HTTP_X_API_KEY="store-key")
+
+    def add_call(self, store, call_type, days_ago=0):
+        call = CallSession.objects.create(
+            store=store,
+            phone_number="+15550000000",
+            call_type=call_type,
+            duration="01:00",
+            started_at=timezone.now() - timedelta(days=days_ago),
+        )
+        CallSession.objects.filter(pk=call.pk).update(created_at=call.started_at)
+        return call
+
+    def export(self, **params):
+        response = self.client.get("/api/v1/call/details/export/", params)
+        self.assertEqual(response.status_code, 200)
+        return b"".join(response.streaming_content).decode()
+
+    def test_export_applies_the_list_filters_and_store_scope(self):
+        rows = [json.loads(row) for row in self.export(output="ndjson").splitlines()]
+        self.assertEqual(
+            [row["id"] for row in rows], [call.id for call in self.calls[:3]]
+        )
+
+        rows = self.export(output="ndjson", call_type=CallType.DROPPED).splitlines()
+        self.assertEqual([json.loads(row)["id"] for row in rows], [self.calls[1].id])
+
+        rows = self.export(output="ndjson", date="this_week").splitlines()
+        self.assertEqual(
+            [json.loads(row)["id"] for row in rows],
+            [call.id for call in self.calls[:2]],
+        )
+
+        lines = list(csv.reader(StringIO(self.export(transcripts="1"))))
+        self.assertEqual(lines[0][0], "id")
+        self.assertEqual(lines[0][-1], "transcript")
+        self.assertEqual(len(lines), 4)
+        self.assertEqual(lines[1][-1], "AI: Hello")
+
+        response = self.client.get("/api/v1/call/details/export/", {"output": "xml"})
+        self.assertEqual(response.status_code, 400)
+
+
+class CallArchiveTests(TestCase):
+    def setUp(self):
+        archive_root = tempfile.TemporaryDirectory()
+        self.addCleanup(archive_root.cleanup)
+        self.enterContext(override_settings(CALL_ARCHIVE_ROOT=archive_root.name))
+
+        self.store = Store.objects.create(name="Main", location="Dhaka")
+        APIKey.objects.create(store=self.store, api_key="store-key")
+        self.client = APIClient()
+        self.client.credentials(HTTP_X_API_KEY="store-key")
+
+    def add_call(self, *messages):
+        call = CallSession.objects.create(
+            store=self.store,
+            phone_number="+15550000000",
+            call_type=CallType.AI_RESOLVED,
+            duration="01:00",
+            started_at=timezone.now() - timedelta(days=100),
+        )
+        CallTranscript.objects.bulk_create(
+            [
+                CallTranscript(call=call, speaker="AI", message=message, sequence=i)
+                for i, message in enumerate(messages)
+            ]
+        )
+        return call
+
+    def transcripts(self, call):
+        response = self.client.get(f"/api/v1/call/details/{call.id}/")
+        self.assertEqual(response.status_code, 200)
+        return [(t["speaker"], t["message"]) for t in response.data["transcripts"]]
+
+    def test_archived_transcripts_are_rehydrated_on_retrieve(self):
+        first = self.add_call("Hello", "How can I help?")
+        second = self.add_call("Goodbye")
+        silent = self.add_call()
+        expected = self.transcripts(first)
+
+        self.assertEqual(
+            archive_transcripts(self.store.id, timezone.now() - timedelta(days=30)),
+            (2, 3),
+        )
+        self.assertFalse(CallTranscript.objects.exists())
+        silent.refresh_from_db()
+        self.assertEqual(silent.transcript_archive, NO_TRANSCRIPTS)
+
+        self.assertEqual(self.transcripts(first), expected)
+        self.assertEqual(self.transcripts(second), [("AI", "Goodbye")])
+        self.assertEqual(self.transcripts(silent), [])
+
+        # a lost archive file leaves the call readable, without transcripts
+        first.refresh_from_db()
+        os.remove(os.path.join(settings.CALL_ARCHIVE_ROOT, first.transcript_archive))
+        with self.assertLogs("callLogs.services.archive", "ERROR"):
+            self.assertEqual(self.transcripts(first), [])
+
+
+class TranscriptPackingTests(TestCase):
+    def test_pack_round_trip_keeps_every_field(self):
+        base = timezone.now()
+        transcripts = [
+            ("AI", "Hello, how can I help?", base),
+            ("CUSTOMER", "Pantalla rota 📱", base + timedelta(microseconds=7)),
+            ("AI", "", base + timedelta(hours=2, microseconds=123456)),
+        ]
+        unpacked = unpack(pack(transcripts))
+        self.assertEqual(
+            [(t.speaker, t.message, t.timestamp) for t in unpacked], transcripts
+        )
+        self.assertEqual([t.sequence for t in unpacked], [0, 1, 2])
+        self.assertEqual(unpack(pack([])), [])
+
+    def test_version_1_blobs_are_still_read(self):
+        # offsets were stored in milliseconds
+        raw = (
+            transcript_packing.HEADER.pack(1, 1, 1, 0)
+            + transcript_packing.SPEAKER.pack(2)
+            + b"AI"
+            + transcript_packing.ENTRY_V1.pack(0, 1500, 2)
+            + b"Hi"
+        )
+        (transcript,) = unpack(zlib.compress(raw))
+        self.assertEqual(transcript.message, "Hi")
+        self.assertEqual(
+            transcript.timestamp, transcript_packing.EPOCH + timedelta(seconds=1.5)
+        )
+
+    def test_calls_are_packed_once(self):
+        store = Store.objects.create(name="Main", location="Dhaka")
+        calls = [
+            CallSession.objects.create(
+                store=store,
+                phone_number="+15550000000",
+                call_type=CallType.AI_RESOLVED,
+                duration="01:00",
+                started_at=timezone.now(),
+            )
+            for _ in range(2)
+        ]
+        CallTranscript.objects.bulk_create(
+            [
+                CallTranscript(call=calls[0], speaker="AI", message=message, sequence=i)
+                for i, message in enumerate(["Hello", "Bye"])
+            ]
+        )
+        rows = list(
+            CallTranscript.objects.order_by("sequence").values_list(
+                "speaker", "message", "timestamp"
+            )
+        )
+
+        call_ids = [call.id for call in calls]
+        self.assertEqual(pack_calls(call_ids), (2, 2))
+        # the call without transcripts is marked too: nothing left to pack
+        self.assertEqual(pack_calls(call_ids), (0, 0))
+
+        packed = packed_transcripts(CallSession.objects.get(pk=calls[0].id))
+        self.assertEqual([(t.speaker, t.message, t.timestamp) for t in packed], rows)
+        self.assertEqual(
+            packed_transcripts(CallSession.objects.get(pk=calls[1].id)), []
+        )
+
+
+class TranscriptSearchTests(TestCase):
+    def setUp(self):
+        self.store = Store.objects.create(name="Main", location="Dhaka")
+        self.other_store = Store.objects.create(name="Other", location="Dhaka")
+        self.client = APIClient()
+
+    def add_call(self, store, *messages):
+        call = CallSession.objects.create(
+            store=store,
+            phone_number="+15550000000",
+            call_type=CallType.AI_RESOLVED,
+            duration="01:00",
+            started_at=timezone.now(),
+        )
+        CallTranscript.objects.bulk_create(
+            [
+                CallTranscript(call=call, speaker="CUSTOMER", message=message)
+                for message in messages
+            ]
+        )
+        return call
+
+    def search(self, user, **params):
+        self.client.force_authenticate(user)
+        response = self.client.get("/api/v1/call/transcript-search/", params)
+        self.assertEqual(response.status_code, 200)
+        return [hit["call_id"] for hit in response.data["results"]]
+
+    def test_results_are_ranked_and_scoped_to_the_users_store(self):
+        weak = self.add_call(
+            self.store,
+            "My phone fell in the pool, is water damage covered by the warranty "
+            "you give on screen repairs done at the store last month?",
+        )
+        strong = self.add_call(self.store, "Water damage.", "Water damage again.")
+        self.add_call(self.store, "Screen replacement price")
+        elsewhere = self.add_call(self.other_store, "Water damage")
+
+        manager = User.objects.create_user(
+            email="manager@example.com",
+            password="secret",
+            first_name="Store",
+            last_name="Manager",
+            store=self.store,
+            role=UserRole.STORE_MANAGER,
+        )
+        self.assertEqual(self.search(manager, q="water damage"), [strong.id, weak.id])
+        # a manager can not widen the scope
+        self.assertEqual(
+            self.search(manager, q="water damage", store=self.other_store.id),
+            [strong.id, weak.id],
+        )
+
+        admin = User.objects.create_user(
+            email="admin@example.com",
+            password="secret",
+            first_name="Super",
+            last_name="Admin",
+            role=UserRole.SUPER_ADMIN,
+        )
+        self.assertEqual(
+            self.search(admin, q="water damage", store=self.other_store.id),
+            [elsewhere.id],
+        )
+        self.assertEqual(len(self.search(admin, q="water damage")), 3)
+
+
+class QuantileSketchTests(TestCase):
+    def test_merged_sketches_match_exact_percentiles(self):
+        values = [(i * 37) % 1000 + 1 for i in range(5000)]
+        merged = QuantileSketch()
+        for i in range(0, len(values), 500):
+            day = QuantileSketch()
+            for value in values[i : i + 500]:
+                day.add(value)
+            merged.merge(QuantileSketch.from_dict(day.to_dict()))
+
+        values.sort()
+        for q in (0.5, 0.9, 0.99):
+            exact = values[int(q * (len(values) - 1))]
+            self.assertLessEqual(
+                abs(merged.quantile(q) - exact), exact * RELATIVE_ACCURACY
+            )
+        self.assertEqual(merged.count, len(values))
+        self.assertIsNone(QuantileSketch().quantile(0.5))
@@ -1,6 +1,16 @@
 from django.urls import path
 from rest_framework.routers import DefaultRouter
-from callLogs.views import CallSessionViewSet,StoreCallSummaryView,CallTrendsView
+from callLogs.views import (
+    CallSessionViewSet,
+    StoreCallSummaryView,
+    CallTrendsView,
+    CallHeatmapView,
+    CallFunnelView,
+    CallStatsView,
+    DashboardCacheStatsView,
+    TranscriptSearchView,
+    CallerProfileView,
+)
 
 router = DefaultRouter()
 router.register("details", CallSessionViewSet, basename="call-logs")
@@ -9,4 +19,18 @@ urlpatterns = router.urls
 urlpatterns+=[
     path("store-summary/", StoreCallSummaryView.as_view(), name="store-summary"),
     path("call-trends/", CallTrendsView.as_view(), name="call-trends"),
-    ]
\ No newline at end of file
+    path("call-heatmap/", CallHeatmapView.as_view(), name="call-heatmap"),
+    path("call-funnel/", CallFunnelView.as_view(), name="call-funnel"),
+    path("call-stats/", CallStatsView.as_view(), name="call-stats"),
+    path(
+        "dashboard-cache-stats/",
+        DashboardCacheStatsView.as_view(),
+        name="dashboard-cache-stats",
+    ),
+    path("caller-profile/", CallerProfileView.as_view(), name="caller-profile"),
+    path(
+        "transcript-search/",
+        TranscriptSearchView.as_view(),
+        name="transcript-search",
+    ),
+]
\ No newline at end of file
@@ -0,0 +1,129 @@
+import re
+from datetime import datetime, time, timedelta
+from django.conf import settings
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from rest_framework.exceptions import NotAuthenticated, ValidationError
+from accounts.models import UserRole
+
+
+def get_store_scope(request, param="store"):
+    """
+    Store IDs the user may query:
+    - Staff / Store Manager: only their store
+    - Super Admin: the store from the query param, or None for all stores
+    """
+    user = request.user
+    if not user.is_authenticated:
+        raise NotAuthenticated()
+    if user.role in [UserRole.STAFF, UserRole.STORE_MANAGER]:
+        return [user.store_id]
+
+    store_id = request.query_params.get(param)
+    if not store_id:
+        return None
+    if not store_id.isdigit():
+        raise ValidationError({param: "Store ID must be an integer."})
+    return [int(store_id)]
+
+
+def get_range_start(range_param, now=None):
+    """
+    Returns the first date covered by a dashboard range
+    (today, this-week, this-month, this-year)
+    """
+    now = now or timezone.now()
+
+    if range_param == "this-week":
+        return (now - timedelta(days=now.weekday())).date()  # Monday of current week
+    if range_param == "this-month":
+        return now.replace(day=1).date()  # first day of month
+    if range_param == "this-year":
+        return now.replace(month=1, day=1).date()  # Jan 1st of year
+    return now.date()
+
+
+def get_date_param(params, name):
+    """
+    Date from a YYYY-MM-DD query param
+    """
+    try:
+        value = parse_date(params[name])
+    except ValueError:
+        value = None
+    if value is None:
+        raise ValidationError({name: "Date must be YYYY-MM-DD."})
+    return value
+
+
+def day_start(day):
+    """
+    Aware datetime for local midnight of a date, used to build half-open
+    ranges (field__gte=start, field__lt=end) that can use btree indexes
+    """
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def next_month(day):
+    return (day.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+
+def parse_duration(value):
+    """
+    Converts a "HH:MM:SS" or "MM:SS" duration string to seconds.
+    Raises ValueError for anything else ("-5:00", "1:2:3:4", "90").
+    """
+    if not value:
+        return None
+
+    parts = value.split(":")
+    if len(parts) not in (2, 3) or not all(
+        part.isascii() and part.isdigit() for part in parts
+    ):
+        raise ValueError(f"Invalid duration {value!r}")
+
+    seconds = 0
+    for part in parts:
+        seconds = seconds * 60 + int(part)
+    return seconds
+
+
+def format_duration(seconds):
+    """
+    Converts seconds to a "HH:MM:SS" duration string
+    """
+    hours, rest = divmod(int(seconds), 3600)
+    minutes, seconds = divmod(rest, 60)
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d}"
+
+
+def normalize_phone(value):
+    """
+    E.164 form of a free-form phone number, "" when it can not be one.
+    "(555) 010-2030" -> "+15550102030" with DEFAULT_PHONE_COUNTRY_CODE 1,
+    "0044 20 7946 0958" -> "+442079460958"
+    """
+    if not value:
+        return ""
+
+    # drop extensions ("x12", "ext. 12")
+    value = re.split(r"[A-Za-z]", value.strip())[0]
+    # "+44 (0)20 ..." national trunk prefix written next to the country code
+    value = value.replace("(0)", "")
+    digits = re.sub(r"\D", "", value)
+
+    if value.startswith("+"):
+        pass
+    elif value.startswith("00"):
+        digits = digits[2:]
+    else:
+        country_code = settings.DEFAULT_PHONE_COUNTRY_CODE
+        national = digits.lstrip("0")
+        if len(national) <= 10 or not national.startswith(country_code):
+            digits = country_code + national
+        else:
+            digits = national
+
+    if not 8 <= len(digits) <= 15:
+        return ""
+    return "+" + digits
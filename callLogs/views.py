@@ -1,18 +1,51 @@
-from rest_framework import mixins, viewsets, filters
+from rest_framework import mixins, viewsets, filters, status
+from rest_framework.decorators import action
 from rest_framework.views import APIView
 from django_filters.rest_framework import DjangoFilterBackend
 from datetime import timedelta
 from django.utils import timezone
-from callLogs.models import CallSession
+from callLogs.models import CallSession, CallTranscript
 from accounts.models import UserRole
-from callLogs.serializers import CallSessionSerializer
+from callLogs.serializers import (
+    CallSessionSerializer,
+    CallSessionListSerializer,
+    CallSessionBulkItemSerializer,
+    CallSessionStartSerializer,
+    CallTranscriptAppendSerializer,
+    CallSessionCloseSerializer,
+    MAX_TRANSCRIPT_CHUNKS,
+)
+from callLogs.services.ingest import MAX_BULK_CALLS, bulk_ingest_calls
+from callLogs.services.streaming import append_transcript_chunks, close_call
+from callLogs.services.export import stream_csv, stream_ndjson
+from callLogs.services.archive import read_archived_transcripts
+from callLogs.pagination import CallSessionCursorPagination
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 from rest_framework.response import Response
-from django.db.models.functions import TruncDay, TruncDate, TruncMonth
-from django.db.models import Count, Avg, F
+from rest_framework.exceptions import NotAuthenticated, ValidationError
+from django.db.models import F, Prefetch
+from django.shortcuts import get_object_or_404
+from django.http import StreamingHttpResponse
 from store.models import Store
-import calendar
+from callLogs.services.call_summary import build_store_call_summary
+from callLogs.utils import (
+    day_start,
+    get_date_param,
+    get_range_start,
+    get_store_scope,
+    next_month,
+    normalize_phone,
+)
+from callLogs.services.transcript_search import search_transcripts
+from callLogs.services.trends import GRANULARITIES, MAX_BUCKETS, build_call_trends
+from callLogs.services.heatmap import build_call_heatmap
+from callLogs.services.caller_profile import build_caller_profile
+from callLogs.services.funnel import MAX_FUNNEL_DAYS, build_call_funnel
+from callLogs.services.call_stats import MAX_STATS_DAYS, build_call_stats
+from callLogs.services.dashboard_cache import cache_stats, get_or_compute
+from api.permissions import IsAdminUserRole, IsAuthenticatedOrStoreAPIKey
+from ai_api_key.authentication import AI_AUTHENTICATION_CLASSES, request_api_key
 
 
 class CallSessionViewSet(
@@ -29,15 +62,33 @@ class CallSessionViewSet(
     """
 
     queryset = (
-        CallSession.objects.select_related("issue")
-        .prefetch_related("transcripts")
+        CallSession.objects.select_related("issue", "transcript_blob")
+        .prefetch_related(
+            Prefetch(
+                "transcripts",
+                queryset=CallTranscript.objects.order_by("sequence", "id"),
+            )
+        )
         .all()
     )
     serializer_class = CallSessionSerializer
+    authentication_classes = AI_AUTHENTICATION_CLASSES
 
     filter_backends = [DjangoFilterBackend, filters.SearchFilter]
     filterset_fields = ["call_type", "issue"]
     search_fields = ["phone_number", "issue__name"]
+    pagination_class = CallSessionCursorPagination
+
+    @property
+    def paginator(self):
+        # Pagination is opt-in: only when the client asks for a cursor or page size
+        if not hasattr(self, "_paginator"):
+            params = getattr(self.request, "query_params", {})
+            if "cursor" in params or "page_size" in params:
+                self._paginator = self.pagination_class()
+            else:
+                self._paginator = None
+        return self._paginator
 
     @swagger_auto_schema(
         operation_summary="List call sessions",
@@ -84,6 +135,27 @@ class CallSessionViewSet(
                 type=openapi.TYPE_INTEGER,
                 required=False,
             ),
+            openapi.Parameter(
+                "view",
+                openapi.IN_QUERY,
+                description="summary (default, no transcripts) or full",
+                type=openapi.TYPE_STRING,
+                required=False,
+            ),
+            openapi.Parameter(
+                "page_size",
+                openapi.IN_QUERY,
+                description="Enable cursor pagination with this page size (max 200)",
+                type=openapi.TYPE_INTEGER,
+                required=False,
+            ),
+            openapi.Parameter(
+                "cursor",
+                openapi.IN_QUERY,
+                description="Cursor from the previous page's `next` / `previous` link",
+                type=openapi.TYPE_STRING,
+                required=False,
+            ),
         ],
     )
     def list(self, request, *args, **kwargs):
@@ -97,13 +169,261 @@ class CallSessionViewSet(
     def create(self, request, *args, **kwargs):
         return super().create(request, *args, **kwargs)
 
+    @swagger_auto_schema(
+        method="post",
+        operation_summary="Bulk create call sessions",
+        operation_description=(
+            f"Create up to {MAX_BULK_CALLS} call sessions with their transcripts "
+            "in one request (AI worker).\n\n"
+            "Each item is validated on its own. Valid items are saved, invalid "
+            "ones are reported by index. Returns 201 when every item was "
+            "created and 207 when some failed."
+        ),
+        request_body=CallSessionSerializer(many=True),
+        tags=["Call Logs"],
+    )
+    @action(detail=False, methods=["post"], url_path="bulk")
+    def bulk(self, request):
+        items = request.data
+        if not isinstance(items, list):
+            return Response(
+                {"detail": "Expected a list of call sessions."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if len(items) > MAX_BULK_CALLS:
+            return Response(
+                {"detail": f"At most {MAX_BULK_CALLS} call sessions per request."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        results = bulk_ingest_calls(items, CallSessionBulkItemSerializer)
+        created = sum(1 for result in results if result["status"] == "created")
+        failed = len(results) - created
+
+        return Response(
+            {"created": created, "failed": failed, "results": results},
+            status=status.HTTP_207_MULTI_STATUS if failed else status.HTTP_201_CREATED,
+        )
+
+    @swagger_auto_schema(
+        method="post",
+        operation_summary="Start a streamed call session",
+        operation_description=(
+            "Create a call session in IN_PROGRESS state (AI worker). Append "
+            "transcript chunks with `transcripts/` and finish it with `close/`.\n\n"
+            "The call belongs to the store of the `X-API-Key` the AI service "
+            "sends, or to the user's store; `store` is only read for Super "
+            "Admins."
+        ),
+        request_body=CallSessionStartSerializer,
+        responses={201: CallSessionStartSerializer()},
+        tags=["Call Logs"],
+    )
+    @action(detail=False, methods=["post"], url_path="start")
+    def start(self, request):
+        serializer = CallSessionStartSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        serializer.save(store=self.get_start_store(serializer.validated_data))
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+    @swagger_auto_schema(
+        method="post",
+        operation_summary="Append transcript chunks",
+        operation_description=(
+            f"Append up to {MAX_TRANSCRIPT_CHUNKS} transcript chunks to an "
+            "in-progress call. Chunks are ordered by `sequence`; resending a "
+            "sequence that is already stored is ignored.\n\n"
+            "Only calls of the user's store, or of the store of the "
+            "`X-API-Key` the AI service sends."
+        ),
+        request_body=CallTranscriptAppendSerializer,
+        tags=["Call Logs"],
+    )
+    @action(detail=True, methods=["post"], url_path="transcripts")
+    def append_transcripts(self, request, pk=None):
+        serializer = CallTranscriptAppendSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        chunks = serializer.validated_data["chunks"]
+
+        if not append_transcript_chunks(self.get_call(pk).id, chunks):
+            return Response(
+                {"detail": "Call is already closed."}, status=status.HTTP_409_CONFLICT
+            )
+
+        return Response(
+            {
+                "received": len(chunks),
+                "last_sequence": max(chunk["sequence"] for chunk in chunks),
+            }
+        )
+
+    @swagger_auto_schema(
+        method="post",
+        operation_summary="Close a streamed call session",
+        operation_description=(
+            "Finish an in-progress call: sets call type, outcome and `ended_at`. "
+            "Duration is computed from `started_at` when not provided.\n\n"
+            "Only calls of the user's store, or of the store of the "
+            "`X-API-Key` the AI service sends."
+        ),
+        request_body=CallSessionCloseSerializer,
+        tags=["Call Logs"],
+    )
+    @action(detail=True, methods=["post"], url_path="close")
+    def close(self, request, pk=None):
+        serializer = CallSessionCloseSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        call = close_call(self.get_call(pk).id, serializer.validated_data)
+        if call is None:
+            return Response(
+                {"detail": "Call is already closed."}, status=status.HTTP_409_CONFLICT
+            )
+
+        return Response(
+            {
+                "id": call.id,
+                "status": call.status,
+                "call_type": call.call_type,
+                "outcome": call.outcome,
+                "duration": call.duration,
+                "ended_at": call.ended_at,
+            }
+        )
+
+    @swagger_auto_schema(
+        method="get",
+        operation_summary="Export call sessions",
+        operation_description=(
+            "Stream call sessions as CSV or NDJSON, optionally with their "
+            "transcripts. Accepts the same filters and role scoping as the "
+            "list endpoint; rows are read from the database in chunks so "
+            "exports of any size use constant memory."
+        ),
+        tags=["Call Logs"],
+        manual_parameters=[
+            openapi.Parameter(
+                "output",
+                openapi.IN_QUERY,
+                description="csv (default) or ndjson",
+                type=openapi.TYPE_STRING,
+                required=False,
+            ),
+            openapi.Parameter(
+                "transcripts",
+                openapi.IN_QUERY,
+                description="Include transcripts (1/true)",
+                type=openapi.TYPE_BOOLEAN,
+                required=False,
+            ),
+            openapi.Parameter(
+                "date",
+                openapi.IN_QUERY,
+                description="Filter by date: today, this_week, this_month",
+                type=openapi.TYPE_STRING,
+                required=False,
+            ),
+            openapi.Parameter(
+                "call_type",
+                openapi.IN_QUERY,
+                description="Filter by call type",
+                type=openapi.TYPE_STRING,
+                required=False,
+            ),
+            openapi.Parameter(
+                "store",
+                openapi.IN_QUERY,
+                description="Filter by store ID (only for Super Admin)",
+                type=openapi.TYPE_INTEGER,
+                required=False,
+            ),
+        ],
+    )
+    @action(detail=False, methods=["get"], url_path="export")
+    def export(self, request):
+        output = request.query_params.get("output", "csv")
+        if output not in ("csv", "ndjson"):
+            return Response(
+                {"detail": "output must be csv or ndjson."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        include_transcripts = request.query_params.get("transcripts", "").lower() in (
+            "1",
+            "true",
+        )
+
+        rows = self.filter_queryset(self.get_queryset()).order_by("id")
+        if output == "csv":
+            content = stream_csv(rows, include_transcripts)
+            content_type = "text/csv"
+        else:
+            content = stream_ndjson(rows, include_transcripts)
+            content_type = "application/x-ndjson"
+
+        filename = f"call-logs-{timezone.localdate():%Y%m%d}.{output}"
+        response = StreamingHttpResponse(content, content_type=content_type)
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
+
     @swagger_auto_schema(
         operation_summary="Retrieve call session",
-        operation_description="Get details of a single call session",
+        operation_description=(
+            "Get details of a single call session. Transcripts moved to the "
+            "cold archive are read back from it."
+        ),
         tags=["Call Logs"],
     )
     def retrieve(self, request, *args, **kwargs):
-        return super().retrieve(request, *args, **kwargs)
+        call = self.get_object()
+        data = self.get_serializer(call).data
+        if call.transcript_archive:
+            # transcripts moved to the cold archive by the retention job
+            data["transcripts"] = read_archived_transcripts(call)
+        return Response(data)
+
+    @property
+    def summary_view(self):
+        if self.action == "export":
+            return True
+        return (
+            self.action == "list"
+            and self.request.query_params.get("view", "summary") != "full"
+        )
+
+    def get_call(self, pk):
+        """
+        A call in the user's (or API key's) store scope, 404 otherwise
+        """
+        calls = (
+            self.get_queryset()
+            .select_related(None)
+            .prefetch_related(None)
+            .only("id", "status")
+        )
+        return get_object_or_404(calls, pk=pk)
+
+    def get_start_store(self, validated_data):
+        """
+        The store a streamed call is started for: the API key's or the
+        user's store, the payload's for Super Admins
+        """
+        user = self.request.user
+        api_key = request_api_key(self.request)
+
+        if api_key is not None:
+            return api_key.store
+        if not user.is_authenticated:
+            raise NotAuthenticated()
+        if user.role in [UserRole.STAFF, UserRole.STORE_MANAGER]:
+            return user.store
+        if validated_data.get("store") is None:
+            raise ValidationError({"store": "Store ID is required."})
+        return validated_data["store"]
+
+    def get_serializer_class(self):
+        if self.summary_view:
+            return CallSessionListSerializer
+        return super().get_serializer_class()
 
     def get_queryset(self):
         if getattr(self, "swagger_fake_view", False):
@@ -111,8 +431,14 @@ class CallSessionViewSet(
 
         qs = super().get_queryset()
         user = self.request.user
+        api_key = request_api_key(self.request)
 
-        if user.role in [UserRole.STAFF, UserRole.STORE_MANAGER]:
+        if api_key is not None:
+            # AI service: the calls of its key's store
+            qs = qs.filter(store_id=api_key.store_id)
+        elif not user.is_authenticated:
+            return qs.none()
+        elif user.role in [UserRole.STAFF, UserRole.STORE_MANAGER]:
             qs = qs.filter(store=user.store)
         elif user.role == UserRole.SUPER_ADMIN:
             store_id = self.request.query_params.get("store")
@@ -120,15 +446,47 @@ class CallSessionViewSet(
                 qs = qs.filter(store_id=store_id)
 
         date_filter = self.request.query_params.get("date")
-        now = timezone.now()
+        today = timezone.localdate()
 
+        # half-open ranges so the (store, created_at) index is used
         if date_filter == "today":
-            qs = qs.filter(created_at__date=now.date())
+            qs = qs.filter(
+                created_at__gte=day_start(today),
+                created_at__lt=day_start(today + timedelta(days=1)),
+            )
         elif date_filter == "this_week":
-            start_week = now - timedelta(days=now.weekday())
-            qs = qs.filter(created_at__date__gte=start_week.date())
+            start_week = today - timedelta(days=today.weekday())
+            qs = qs.filter(created_at__gte=day_start(start_week))
         elif date_filter == "this_month":
-            qs = qs.filter(created_at__year=now.year, created_at__month=now.month)
+            start_month = today.replace(day=1)
+            qs = qs.filter(
+                created_at__gte=day_start(start_month),
+                created_at__lt=day_start(next_month(start_month)),
+            )
+
+        if self.summary_view:
+            # session columns only: no transcript prefetch, no model instances
+            qs = (
+                qs.select_related(None)
+                .prefetch_related(None)
+                .annotate(issue_name=F("issue__name"))
+                .values(
+                    "id",
+                    "phone_number",
+                    "store_id",
+                    "issue_name",
+                    "call_type",
+                    "outcome",
+                    "duration",
+                    "duration_seconds",
+                    "started_at",
+                    "answered_at",
+                    "ended_at",
+                    "audio_url",
+                    "status",
+                    "created_at",
+                )
+            )
 
         return qs
 
@@ -188,82 +546,23 @@ class StoreCallSummaryView(APIView):
         },
     )
     def get(self, request):
-        today = timezone.now().date()
-        user = request.user
-
-        store_id = request.query_params.get("store_id")
         range_param = request.query_params.get("range", "today")
+        start_date = get_range_start(range_param)
+        single_day = range_param == "today"
 
-        if user.role in [UserRole.STAFF, UserRole.STORE_MANAGER]:
-            stores = Store.objects.filter(id=user.store.id)
+        store_ids = get_store_scope(request, "store_id")
+        if store_ids is None:
+            stores = Store.objects.all()
         else:
-            if store_id:
-                stores = Store.objects.filter(id=store_id)
-            else:
-                stores = Store.objects.all()
-
-        data = []
-        for store in stores:
-            # calls = CallSession.objects.filter(store=store, started_at__date=today)
-            now = timezone.now()
-
-            if range_param == "today":
-                start_date = now.date()
-            elif range_param == "this-week":
-                start_date = (
-                    now - timedelta(days=now.weekday())
-                ).date()  # Monday of current week
-            elif range_param == "this-month":
-                start_date = now.replace(day=1).date()  # first day of month
-            elif range_param == "this-year":
-                start_date = now.replace(month=1, day=1).date()  # Jan 1st of year
-            else:
-                start_date = now.date()
+            stores = Store.objects.filter(id__in=store_ids)
 
-            if range_param == "today":
-                calls = CallSession.objects.filter(
-                    store=store, started_at__date=start_date
-                )
-            else:
-                calls = CallSession.objects.filter(
-                    store=store, started_at__date__gte=start_date
-                )
-
-            total_calls = calls.count()
-            ai_handled = calls.filter(call_type="AI_RESOLVED").count()
-            warm_transfer = calls.filter(call_type="WARM_TRANSFER").count()
-            appointments = calls.filter(call_type="APPOINTMENT").count()
-            missed_calls = calls.filter(
-                call_type__in=["DROPPED", "CALL_DROPPED"]
-            ).count()
-
-            # avg duration in minutes
-            durations = []
-            for call in calls:
-                if call.duration:
-                    # assuming duration stored as "HH:MM:SS" or "MM:SS"
-                    parts = [int(x) for x in call.duration.split(":")]
-                    if len(parts) == 3:
-                        sec = parts[0] * 3600 + parts[1] * 60 + parts[2]
-                    elif len(parts) == 2:
-                        sec = parts[0] * 60 + parts[1]
-                    else:
-                        sec = 0
-                    durations.append(sec)
-            avg_duration = sum(durations) / len(durations) / 60 if durations else 0
-
-            data.append(
-                {
-                    "store_id": store.id,
-                    "store_name": store.name,
-                    "total_calls": total_calls,
-                    "ai_handled": ai_handled,
-                    "warm_transfer": warm_transfer,
-                    "appointments_booked": appointments,
-                    "missed_calls": missed_calls,
-                    "avg_call_duration": round(avg_duration, 2),
-                }
-            )
+        data = get_or_compute(
+            "store_summary",
+            request.user.role,
+            store_ids,
+            {"start": start_date, "single_day": single_day},
+            lambda: build_store_call_summary(stores, start_date, single_day),
+        )
 
         return Response(data)
 
@@ -271,7 +570,8 @@ class StoreCallSummaryView(APIView):
 class CallTrendsView(APIView):
     """
     Call trends API with dynamic range:
-    - this-week, this-month, this-year
+    - this-week, this-month, this-year or a custom start / end
+    - hour-of-day, day, week or month buckets
     Role-based:
     - Staff / Store Manager: only their store
     - Super Admin: optionally filter by store
@@ -279,7 +579,12 @@ class CallTrendsView(APIView):
 
     @swagger_auto_schema(
         operation_summary="Call Trends",
-        operation_description="Retrieve call trends for selected range",
+        operation_description=(
+            "Retrieve call trends for selected range.\n\n"
+            "Every bucket of the range is returned (zero filled) with a stable "
+            "ISO `key` and a display `label`. With `series=call_type` the "
+            "counts are also split per call type, aligned with `trend`."
+        ),
         tags=["Dashboard"],
         manual_parameters=[
             openapi.Parameter(
@@ -296,104 +601,483 @@ class CallTrendsView(APIView):
                 type=openapi.TYPE_STRING,
                 required=False,
             ),
+            openapi.Parameter(
+                "start",
+                openapi.IN_QUERY,
+                description="Custom range start (YYYY-MM-DD), overrides range",
+                type=openapi.TYPE_STRING,
+                required=False,
+            ),
+            openapi.Parameter(
+                "end",
+                openapi.IN_QUERY,
+                description="Custom range end, inclusive (YYYY-MM-DD, default today)",
+                type=openapi.TYPE_STRING,
+                required=False,
+            ),
+            openapi.Parameter(
+                "granularity",
+                openapi.IN_QUERY,
+                description="hour (hour of day), day, week or month",
+                type=openapi.TYPE_STRING,
+                required=False,
+            ),
+            openapi.Parameter(
+                "series",
+                openapi.IN_QUERY,
+                description="call_type: also return one series per call type",
+                type=openapi.TYPE_STRING,
+                required=False,
+            ),
         ],
         responses={
             200: openapi.Schema(
                 type=openapi.TYPE_OBJECT,
                 properties={
+                    "granularity": openapi.Schema(type=openapi.TYPE_STRING),
+                    "start": openapi.Schema(type=openapi.TYPE_STRING),
+                    "end": openapi.Schema(type=openapi.TYPE_STRING),
                     "total_calls": openapi.Schema(type=openapi.TYPE_INTEGER),
                     "trend": openapi.Schema(
+                        type=openapi.TYPE_ARRAY,
+                        items=openapi.Schema(
+                            type=openapi.TYPE_OBJECT,
+                            properties={
+                                "key": openapi.Schema(type=openapi.TYPE_STRING),
+                                "label": openapi.Schema(type=openapi.TYPE_STRING),
+                                "count": openapi.Schema(type=openapi.TYPE_INTEGER),
+                            },
+                        ),
+                    ),
+                    "series": openapi.Schema(
                         type=openapi.TYPE_OBJECT,
-                        additional_properties=openapi.Schema(type=openapi.TYPE_INTEGER),
+                        additional_properties=openapi.Schema(
+                            type=openapi.TYPE_ARRAY,
+                            items=openapi.Schema(type=openapi.TYPE_INTEGER),
+                        ),
                     ),
                 },
             )
         },
     )
     def get(self, request):
-        user = request.user
-        today = timezone.now().date()
-        range_param = request.query_params.get("range", "this-week")
-        store_id = request.query_params.get("store")
-
-        # Determine start date and aggregation function
-        if range_param == "today":
-            start_date = today
-            trunc_func = TruncDay
-            days = [calendar.day_abbr[today.weekday()]]
+        params = request.query_params
+        today = timezone.localdate()
+        range_param = params.get("range", "this-week")
+
+        # Determine date range and default bucket size
+        if params.get("start"):
+            start_date = get_date_param(params, "start")
+            end_date = get_date_param(params, "end") if params.get("end") else today
+            granularity = "day"
+        elif range_param == "today":
+            start_date = end_date = today
+            granularity = "day"
         elif range_param == "this-week":
             start_date = today - timedelta(days=today.weekday())
-            trunc_func = TruncDay
-            days = [
-                calendar.day_abbr[(start_date + timedelta(days=i)).weekday()]
-                for i in range(7)
-            ]
+            end_date = start_date + timedelta(days=6)
+            granularity = "day"
         elif range_param == "this-month":
-            start_date = today.replace(day=1)
-            trunc_func = TruncDate
-            days_in_month = (today - start_date).days + 1
-            days = [(start_date + timedelta(days=i)).day for i in range(days_in_month)]
+            start_date, end_date = today.replace(day=1), today
+            granularity = "day"
         elif range_param == "this-year":
-            start_date = today.replace(month=1, day=1)
-            trunc_func = TruncMonth
-            days = [calendar.month_abbr[m] for m in range(1, today.month + 1)]
+            start_date, end_date = today.replace(month=1, day=1), today
+            granularity = "month"
         else:
-            start_date = today - timedelta(days=6)
-            trunc_func = TruncDay
-            days = [
-                calendar.day_abbr[(start_date + timedelta(days=i)).weekday()]
-                for i in range(7)
-            ]
-
-        # Base queryset
-        qs = CallSession.objects.filter(started_at__date__gte=start_date)
-        if user.role in ["STAFF", "STORE_MANAGER"]:
-            qs = qs.filter(store=user.store)
-        elif user.role == "SUPER_ADMIN" and store_id:
-            qs = qs.filter(store_id=store_id)
+            start_date, end_date = today - timedelta(days=6), today
+            granularity = "day"
 
-        # Aggregate calls
-        calls = (
-            qs.annotate(period=trunc_func("started_at"))
-            .values("period")
-            .annotate(count=Count("id"))
-            .order_by("period")
+        granularity = params.get("granularity", granularity)
+        if granularity not in GRANULARITIES:
+            raise ValidationError(
+                {"granularity": f"Must be one of: {', '.join(GRANULARITIES)}."}
+            )
+        if end_date < start_date:
+            raise ValidationError({"end": "End date is before start date."})
+        if (end_date - start_date).days >= MAX_BUCKETS:
+            raise ValidationError({"start": f"Range is limited to {MAX_BUCKETS} days."})
+
+        store_ids = get_store_scope(request)
+        series = params.get("series") == "call_type"
+
+        data = get_or_compute(
+            "call_trends",
+            request.user.role,
+            store_ids,
+            {
+                "start": start_date,
+                "end": end_date,
+                "granularity": granularity,
+                "series": series,
+            },
+            lambda: build_call_trends(
+                store_ids, start_date, end_date, granularity, series=series
+            ),
         )
+        return Response(data)
 
-        # Prepare trend dict
-        # trend = {str(d): 0 for d in days}
 
-        # for c in calls:
-        #     if range_param in ["this-week", "today"]:
-        #         label = calendar.day_abbr[c["period"].weekday()]
-        #     elif range_param == "this-month":
-        #         label = c["period"].day
-        #     elif range_param == "this-year":
-        #         label = calendar.month_abbr[c["period"].month]
-        #     trend[label] = c["count"]
+class CallHeatmapView(APIView):
+    """
+    Day-of-week x hour-of-day call heatmap
+    Role-based:
+    - Staff / Store Manager: only their store
+    - Super Admin: all stores (optional filter by store)
+    """
 
-        trend = []
+    @swagger_auto_schema(
+        operation_summary="Call Heatmap",
+        operation_description=(
+            "7x24 matrix (Monday first, rows are days, columns are hours) of "
+            "call volume and AI resolution rate for the selected range. "
+            "`ai_resolution_rate` is null for hours without calls."
+        ),
+        tags=["Dashboard"],
+        manual_parameters=[
+            openapi.Parameter(
+                "store",
+                openapi.IN_QUERY,
+                description="Store ID to filter (Super Admin only)",
+                type=openapi.TYPE_INTEGER,
+                required=False,
+            ),
+            openapi.Parameter(
+                "range",
+                openapi.IN_QUERY,
+                description="Data range: today / this-week / this-month / this-year",
+                type=openapi.TYPE_STRING,
+                required=False,
+            ),
+        ],
+    )
+    def get(self, request):
+        range_param = request.query_params.get("range", "this-month")
+        start_date = get_range_start(range_param)
+        store_ids = get_store_scope(request)
+
+        data = get_or_compute(
+            "call_heatmap",
+            request.user.role,
+            store_ids,
+            {"start": start_date},
+            lambda: build_call_heatmap(store_ids, start_date),
+        )
+        return Response(data)
+
+
+class CallFunnelView(APIView):
+    """
+    Call outcome funnel per store
+    Role-based:
+    - Staff / Store Manager: only their store
+    - Super Admin: all stores (optional filter by store)
+    """
+
+    @swagger_auto_schema(
+        operation_summary="Call Funnel",
+        operation_description=(
+            "Calls -> quotes provided -> appointments booked -> appointments "
+            "kept, per store for the selected range.\n\n"
+            "- `quotes_provided`: calls that ended with a quote or a booking\n"
+            "- `appointments_booked`: appointments booked by a number that "
+            "called the store in the 24 hours before\n"
+            "- `appointments_kept`: booked appointments whose date has passed; "
+            "`appointments_upcoming` are still ahead"
+        ),
+        tags=["Dashboard"],
+        manual_parameters=[
+            openapi.Parameter(
+                "store",
+                openapi.IN_QUERY,
+                description="Store ID to filter (Super Admin only)",
+                type=openapi.TYPE_INTEGER,
+                required=False,
+            ),
+            openapi.Parameter(
+                "range",
+                openapi.IN_QUERY,
+                description="Data range: today / this-week / this-month / this-year",
+                type=openapi.TYPE_STRING,
+                required=False,
+            ),
+            openapi.Parameter(
+                "start",
+                openapi.IN_QUERY,
+                description="Custom range start (YYYY-MM-DD), overrides range",
+                type=openapi.TYPE_STRING,
+                required=False,
+            ),
+            openapi.Parameter(
+                "end",
+                openapi.IN_QUERY,
+                description="Custom range end, inclusive (YYYY-MM-DD, default today)",
+                type=openapi.TYPE_STRING,
+                required=False,
+            ),
+        ],
+    )
+    def get(self, request):
+        params = request.query_params
+        today = timezone.localdate()
+
+        if params.get("start"):
+            start_date = get_date_param(params, "start")
+            end_date = get_date_param(params, "end") if params.get("end") else today
+        else:
+            start_date = get_range_start(params.get("range", "this-month"))
+            end_date = today
 
-        for d in days:
-            trend.append({"label": str(d), "count": 0})  # always string
+        if end_date < start_date:
+            raise ValidationError({"end": "End date is before start date."})
+        if (end_date - start_date).days >= MAX_FUNNEL_DAYS:
+            raise ValidationError(
+                {"start": f"Range is limited to {MAX_FUNNEL_DAYS} days."}
+            )
 
-        # Fill counts from queryset
+        return Response(
+            build_call_funnel(get_store_scope(request), start_date, end_date)
+        )
 
-        for c in calls:
-            if range_param in ["this-week", "today"]:
-                label = calendar.day_abbr[c["period"].weekday()]
-            elif range_param == "this-month":
-                label = str(c["period"].day)
-            elif range_param == "this-year":
-                label = calendar.month_abbr[c["period"].month]
 
-            # find and update in trend
-            for item in trend:
-                if item["label"] == label:
-                    item["count"] = c["count"]
-                    break
+class CallStatsView(APIView):
+    """
+    Call duration and time-to-answer percentiles per store
+    Role-based:
+    - Staff / Store Manager: only their store
+    - Super Admin: all stores (optional filter by store)
+    """
+
+    @swagger_auto_schema(
+        operation_summary="Call Duration Statistics",
+        operation_description=(
+            "Average and p50 / p90 / p99 call duration and time to answer, "
+            "in seconds, per store for the selected range.\n\n"
+            "Percentiles come from the quantile sketches of the daily rollups "
+            "and are accurate to within 2%. They are null when the range has "
+            "no calls with a duration / answer time."
+        ),
+        tags=["Dashboard"],
+        manual_parameters=[
+            openapi.Parameter(
+                "store",
+                openapi.IN_QUERY,
+                description="Store ID to filter (Super Admin only)",
+                type=openapi.TYPE_INTEGER,
+                required=False,
+            ),
+            openapi.Parameter(
+                "range",
+                openapi.IN_QUERY,
+                description="Data range: today / this-week / this-month / this-year",
+                type=openapi.TYPE_STRING,
+                required=False,
+            ),
+            openapi.Parameter(
+                "start",
+                openapi.IN_QUERY,
+                description="Custom range start (YYYY-MM-DD), overrides range",
+                type=openapi.TYPE_STRING,
+                required=False,
+            ),
+            openapi.Parameter(
+                "end",
+                openapi.IN_QUERY,
+                description="Custom range end, inclusive (YYYY-MM-DD, default today)",
+                type=openapi.TYPE_STRING,
+                required=False,
+            ),
+        ],
+    )
+    def get(self, request):
+        params = request.query_params
+        today = timezone.localdate()
 
-        # Calculate total calls after filling trend
-        total_calls = sum(item["count"] for item in trend)
+        if params.get("start"):
+            start_date = get_date_param(params, "start")
+            end_date = get_date_param(params, "end") if params.get("end") else today
+        else:
+            start_date = get_range_start(params.get("range", "this-month"))
+            end_date = today
+
+        if end_date < start_date:
+            raise ValidationError({"end": "End date is before start date."})
+        if (end_date - start_date).days >= MAX_STATS_DAYS:
+            raise ValidationError(
+                {"start": f"Range is limited to {MAX_STATS_DAYS} days."}
+            )
+
+        store_ids = get_store_scope(request)
+        data = get_or_compute(
+            "call_stats",
+            request.user.role,
+            store_ids,
+            {"start": start_date, "end": end_date},
+            lambda: build_call_stats(store_ids, start_date, end_date),
+        )
+        return Response(data)
+
+
+class DashboardCacheStatsView(APIView):
+    """
+    Dashboard response cache hit / miss counters (Super Admin only)
+    """
+
+    permission_classes = [IsAdminUserRole]
+
+    @swagger_auto_schema(
+        operation_summary="Dashboard cache stats",
+        operation_description=(
+            "Hit / miss counters of the cached dashboard responses "
+            "(store summary, call trends, call heatmap, call stats) in the "
+            "process that serves the request, since it started."
+        ),
+        tags=["Dashboard"],
+    )
+    def get(self, request):
+        return Response(cache_stats())
+
+
+class CallerProfileView(APIView):
+    """
+    Caller history lookup by phone number (AI greeting / staff)
+    - AI worker (X-API-Key): the key's store
+    - Staff / Store Manager: their store
+    - Super Admin: store query param
+    """
+
+    authentication_classes = AI_AUTHENTICATION_CLASSES
+    permission_classes = [IsAuthenticatedOrStoreAPIKey]
+
+    @swagger_auto_schema(
+        operation_summary="Caller profile",
+        operation_description=(
+            "Past calls, appointments and last issue of a caller at a store. "
+            "The phone number may be in any common format; it is matched in "
+            "E.164 form.\n\n"
+            "Requires a logged in user or the AI service's `X-API-Key`; "
+            "results are limited to the user's / key's store."
+        ),
+        tags=["Call Logs"],
+        manual_parameters=[
+            openapi.Parameter(
+                "phone",
+                openapi.IN_QUERY,
+                description="Caller phone number",
+                type=openapi.TYPE_STRING,
+                required=True,
+            ),
+            openapi.Parameter(
+                "store",
+                openapi.IN_QUERY,
+                description="Store ID (Super Admin only, required)",
+                type=openapi.TYPE_INTEGER,
+                required=False,
+            ),
+            openapi.Parameter(
+                "limit",
+                openapi.IN_QUERY,
+                description="Recent calls / appointments returned (default 5, max 20)",
+                type=openapi.TYPE_INTEGER,
+                required=False,
+            ),
+        ],
+    )
+    def get(self, request):
+        params = request.query_params
+        phone = normalize_phone(params.get("phone", ""))
+        if not phone:
+            return Response(
+                {"phone": "A valid phone number is required."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        user = request.user
+        api_key = request_api_key(request)
+        if api_key is not None:
+            store_id = api_key.store_id
+        elif user.role in [UserRole.STAFF, UserRole.STORE_MANAGER]:
+            store_id = user.store_id
+        else:
+            store_id = params.get("store", "")
+            if not store_id.isdigit():
+                return Response(
+                    {"store": "Store ID is required."},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            store_id = int(store_id)
+
+        limit = params.get("limit", "5")
+        limit = min(int(limit), 20) if limit.isdigit() else 5
+
+        return Response(build_caller_profile(store_id, phone, limit))
+
+
+class TranscriptSearchView(APIView):
+    """
+    Full-text search over call transcripts
+    Role-based:
+    - Staff / Store Manager: only their store
+    - Super Admin: all stores (optional filter by store)
+    """
+
+    @swagger_auto_schema(
+        operation_summary="Search call transcripts",
+        operation_description=(
+            "Find calls whose transcripts contain all the given words "
+            "(e.g. `water damage`). Results are ranked best first with a "
+            "highlighted snippet (`<mark>` tags)."
+        ),
+        tags=["Call Logs"],
+        manual_parameters=[
+            openapi.Parameter(
+                "q",
+                openapi.IN_QUERY,
+                description="Words to search for",
+                type=openapi.TYPE_STRING,
+                required=True,
+            ),
+            openapi.Parameter(
+                "store",
+                openapi.IN_QUERY,
+                description="Store ID to filter (Super Admin only)",
+                type=openapi.TYPE_INTEGER,
+                required=False,
+            ),
+            openapi.Parameter(
+                "limit",
+                openapi.IN_QUERY,
+                description="Maximum number of calls (default 20, max 100)",
+                type=openapi.TYPE_INTEGER,
+                required=False,
+            ),
+        ],
+    )
+    def get(self, request):
+        query = request.query_params.get("q", "").strip()
+        if not query:
+            return Response(
+                {"q": "Search query is required."}, status=status.HTTP_400_BAD_REQUEST
+            )
+
+        limit = request.query_params.get("limit", "20")
+        limit = min(int(limit), 100) if limit.isdigit() else 20
+
+        hits = search_transcripts(query, store_ids=get_store_scope(request), limit=limit)
+
+        calls = CallSession.objects.in_bulk([hit["call_id"] for hit in hits])
+        results = []
+        for hit in hits:
+            call = calls.get(hit["call_id"])
+            if call is None:
+                continue
+            results.append(
+                {
+                    **hit,
+                    "store": call.store_id,
+                    "phone_number": call.phone_number,
+                    "call_type": call.call_type,
+                    "started_at": call.started_at,
+                }
+            )
 
-        return Response({"total_calls": total_calls, "trend": trend})
+        return Response({"query": query, "results": results})
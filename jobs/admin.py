@@ -0,0 +1,16 @@
+from django.contrib import admin
+from django.utils import timezone
+from jobs.models import Job, JobStatus
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ["id", "name", "key", "status", "attempts", "run_at", "created_at"]
+    list_filter = ["status", "name"]
+    actions = ["retry_jobs"]
+
+    @admin.action(description="Retry selected jobs")
+    def retry_jobs(self, request, queryset):
+        queryset.exclude(status=JobStatus.DONE).update(
+            status=JobStatus.PENDING, attempts=0, run_at=timezone.now(), locked_at=None
+        )
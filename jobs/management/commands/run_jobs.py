@@ -0,0 +1,43 @@
+import time
+from django.core.management.base import BaseCommand
+from jobs.services.queue import claim_jobs, run_job
+
+
+class Command(BaseCommand):
+    help = "Run queued background jobs (post-call notifications, call stats, ...)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=50)
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=1.0,
+            help="Seconds to wait when the queue is empty",
+        )
+        parser.add_argument(
+            "--once", action="store_true", help="Exit once no job is due"
+        )
+
+    def handle(self, *args, **options):
+        done = 0
+        failed = 0
+
+        while True:
+            jobs = claim_jobs(options["batch_size"])
+            if not jobs:
+                if options["once"]:
+                    break
+                time.sleep(options["sleep"])
+                continue
+
+            for claimed in jobs:
+                if run_job(claimed):
+                    done += 1
+                else:
+                    failed += 1
+                    self.stderr.write(
+                        f"{claimed.name} #{claimed.pk} failed "
+                        f"(attempt {claimed.attempts} of {claimed.max_attempts})"
+                    )
+
+        self.stdout.write(self.style.SUCCESS(f"Done: {done} jobs run, {failed} failed"))
@@ -0,0 +1,35 @@
+# Generated by Django 6.0 on 2026-10-18 13:05
+
+from django.db import migrations, models
+
+
+def drop_duplicate_pending(apps, schema_editor):
+    # racing triggers could queue a key twice: the oldest job does the work
+    Job = apps.get_model("jobs", "Job")
+    seen = set()
+    duplicates = []
+    for pk, name, key in (
+        Job.objects.filter(status="PENDING")
+        .exclude(key="")
+        .order_by("id")
+        .values_list("id", "name", "key")
+    ):
+        if (name, key) in seen:
+            duplicates.append(pk)
+        seen.add((name, key))
+    Job.objects.filter(pk__in=duplicates).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0002_job_key'),
+    ]
+
+    operations = [
+        migrations.RunPython(drop_duplicate_pending, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='job',
+            constraint=models.UniqueConstraint(condition=models.Q(('status', 'PENDING'), models.Q(('key', ''), _negated=True)), fields=('name', 'key'), name='job_pending_key_uniq'),
+        ),
+    ]
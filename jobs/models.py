@@ -0,0 +1,48 @@
+from django.db import models
+from django.utils import timezone
+
+
+class JobStatus(models.TextChoices):
+    PENDING = "PENDING", "Pending"
+    RUNNING = "RUNNING", "Running"
+    DONE = "DONE", "Done"
+    DEAD = "DEAD", "Dead"
+
+
+class Job(models.Model):
+    """
+    Background job run by the run_jobs worker. Jobs that keep failing
+    end up DEAD (dead letter) and are kept for inspection / retry.
+    """
+
+    name = models.CharField(max_length=100)
+    # debounce key: at most one PENDING job per (name, key), see
+    # enqueue_debounced()
+    key = models.CharField(max_length=100, blank=True, default="")
+    payload = models.JSONField(default=dict)
+    status = models.CharField(
+        max_length=10, choices=JobStatus.choices, default=JobStatus.PENDING
+    )
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=5)
+    run_at = models.DateTimeField(default=timezone.now)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True, default="")
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "run_at"], name="job_status_run_at_idx"),
+            models.Index(fields=["name", "key", "status"], name="job_name_key_status_idx"),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["name", "key"],
+                condition=models.Q(status=JobStatus.PENDING) & ~models.Q(key=""),
+                name="job_pending_key_uniq",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.name} #{self.id} ({self.status})"
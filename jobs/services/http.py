@@ -0,0 +1,9 @@
+import requests
+from requests.adapters import HTTPAdapter
+
+# One connection pool per worker process for job handlers calling other
+# services, instead of a new connection (and TLS handshake) per request.
+# No adapter retries: failed jobs are retried by the queue with backoff.
+session = requests.Session()
+session.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
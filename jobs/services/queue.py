@@ -0,0 +1,187 @@
+import logging
+import threading
+import traceback
+from datetime import timedelta
+from django.conf import settings
+from django.db import IntegrityError, connections, transaction
+from django.utils import timezone
+from jobs.models import Job, JobStatus
+
+logger = logging.getLogger(__name__)
+
+# name -> handler(**payload), filled by @job in each app's jobs.py
+HANDLERS = {}
+
+# JOBS_EAGER: (name, key) -> timer of the debounced run waiting to start
+_eager_lock = threading.Lock()
+_eager_timers = {}
+
+# RUNNING jobs locked longer than this belong to a dead worker
+LOCK_TIMEOUT = timedelta(minutes=10)
+RETRY_BASE_SECONDS = 30
+
+
+def job(name):
+    """
+    Register a job handler under a name
+    """
+
+    def register(func):
+        HANDLERS[name] = func
+        return func
+
+    return register
+
+
+def enqueue(name, **payload):
+    """
+    Queue a job. Called inside the transaction that produced the work,
+    so the job row commits (or rolls back) together with it and workers
+    only see it once the data is durable.
+    With JOBS_EAGER the handler runs right after commit instead.
+    """
+    if name not in HANDLERS:
+        raise KeyError(f"Unknown job {name!r}")
+
+    if settings.JOBS_EAGER:
+        transaction.on_commit(lambda: _run_eager(name, payload))
+        return None
+    return Job.objects.create(name=name, payload=payload)
+
+
+def _run_eager(name, payload):
+    # the work is committed already: a failing handler is logged, not
+    # raised into the request that queued it
+    try:
+        HANDLERS[name](**payload)
+    except Exception:
+        logger.exception("Job %s failed", name)
+
+
+def _run_eager_debounced(name, key, payload):
+    with _eager_lock:
+        _eager_timers.pop((name, key), None)
+    try:
+        _run_eager(name, payload)
+    finally:
+        connections.close_all()
+
+
+def _schedule_eager(name, key, delay, payload):
+    with _eager_lock:
+        if (name, key) in _eager_timers:
+            return
+        timer = threading.Timer(delay, _run_eager_debounced, (name, key, payload))
+        timer.daemon = True
+        _eager_timers[name, key] = timer
+        timer.start()
+
+
+def enqueue_debounced(name, key, delay, **payload):
+    """
+    Queue a job to run delay seconds from now, unless a job with the same
+    name and key is still PENDING: that one has not read the data yet, so
+    a burst of triggers collapses into a single run.
+    With JOBS_EAGER the burst collapses the same way into one run on a
+    timer thread of this process.
+    """
+    if name not in HANDLERS:
+        raise KeyError(f"Unknown job {name!r}")
+
+    if settings.JOBS_EAGER:
+        transaction.on_commit(lambda: _schedule_eager(name, key, delay, payload))
+        return None
+    if Job.objects.filter(name=name, key=key, status=JobStatus.PENDING).exists():
+        return None
+    try:
+        with transaction.atomic():
+            return Job.objects.create(
+                name=name,
+                key=key,
+                payload=payload,
+                run_at=timezone.now() + timedelta(seconds=delay),
+            )
+    except IntegrityError:
+        # a concurrent trigger queued it first (job_pending_key_uniq)
+        return None
+
+
+def _requeue(jobs, **fields):
+    """
+    Put jobs back to PENDING. A debounced job whose key got a new PENDING
+    job meanwhile is marked DONE instead: the new one does the work.
+    """
+    for pk in jobs.values_list("pk", flat=True):
+        try:
+            with transaction.atomic():
+                Job.objects.filter(pk=pk).update(status=JobStatus.PENDING, **fields)
+        except IntegrityError:
+            Job.objects.filter(pk=pk).update(
+                status=JobStatus.DONE, finished_at=timezone.now(), **fields
+            )
+
+
+def claim_jobs(limit):
+    """
+    Lock up to limit due jobs for this worker (skip_locked: concurrent
+    workers never claim the same job)
+    """
+    now = timezone.now()
+
+    # jobs of workers that died mid-run go back to the queue
+    _requeue(
+        Job.objects.filter(status=JobStatus.RUNNING, locked_at__lt=now - LOCK_TIMEOUT),
+        locked_at=None,
+    )
+
+    with transaction.atomic():
+        jobs = list(
+            Job.objects.select_for_update(skip_locked=True)
+            .filter(status=JobStatus.PENDING, run_at__lte=now)
+            .order_by("run_at", "id")[:limit]
+        )
+        for claimed in jobs:
+            claimed.status = JobStatus.RUNNING
+            claimed.locked_at = now
+            claimed.attempts += 1
+        Job.objects.bulk_update(jobs, ["status", "locked_at", "attempts"])
+    return jobs
+
+
+def run_job(claimed):
+    """
+    Run a claimed job. The handler and marking the job DONE share one
+    transaction, so a job whose handler committed is never run again.
+    Failures are retried with exponential backoff; after max_attempts
+    the job is DEAD.
+    """
+    try:
+        with transaction.atomic():
+            HANDLERS[claimed.name](**claimed.payload)
+            Job.objects.filter(pk=claimed.pk).update(
+                status=JobStatus.DONE,
+                locked_at=None,
+                finished_at=timezone.now(),
+                last_error="",
+            )
+        return True
+    except Exception:
+        logger.exception("Job %s #%s failed", claimed.name, claimed.pk)
+        error = traceback.format_exc()
+
+    if claimed.attempts >= claimed.max_attempts:
+        Job.objects.filter(pk=claimed.pk).update(
+            status=JobStatus.DEAD,
+            locked_at=None,
+            finished_at=timezone.now(),
+            last_error=error,
+        )
+    else:
+        delay = RETRY_BASE_SECONDS * 2 ** (claimed.attempts - 1)
+        _requeue(
+            Job.objects.filter(pk=claimed.pk),
+            locked_at=None,
+            run_at=timezone.now() + timedelta(seconds=delay),
+            last_error=error,
+        )
+    return False
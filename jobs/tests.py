@@ -0,0 +1,110 @@
+from datetime import timedelta
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from jobs.models import Job, JobStatus
+from jobs.services.queue import (
+    LOCK_TIMEOUT,
+    RETRY_BASE_SECONDS,
+    claim_jobs,
+    enqueue,
+    enqueue_debounced,
+    job,
+    run_job,
+)
+
+handled = []
+
+
+@job("jobs.tests.record")
+def record(**payload):
+    handled.append(payload)
+
+
+@job("jobs.tests.fail")
+def fail():
+    raise RuntimeError("handler failed")
+
+
+@override_settings(JOBS_EAGER=False)
+class JobQueueTests(TestCase):
+    def setUp(self):
+        handled.clear()
+
+    def test_job_runs_once_and_is_done(self):
+        queued = enqueue("jobs.tests.record", value=1)
+
+        (claimed,) = claim_jobs(10)
+        self.assertEqual(claimed.pk, queued.pk)
+        self.assertEqual(claim_jobs(10), [])
+        self.assertTrue(run_job(claimed))
+
+        queued.refresh_from_db()
+        self.assertEqual(queued.status, JobStatus.DONE)
+        self.assertEqual(handled, [{"value": 1}])
+
+    def test_failing_job_backs_off_then_goes_dead(self):
+        queued = enqueue("jobs.tests.fail")
+        Job.objects.filter(pk=queued.pk).update(max_attempts=2)
+
+        before = timezone.now()
+        (claimed,) = claim_jobs(10)
+        with self.assertLogs("jobs.services.queue", "ERROR"):
+            self.assertFalse(run_job(claimed))
+        queued.refresh_from_db()
+        self.assertEqual(queued.status, JobStatus.PENDING)
+        self.assertEqual(queued.attempts, 1)
+        self.assertIn("handler failed", queued.last_error)
+        self.assertGreaterEqual(
+            queued.run_at, before + timedelta(seconds=RETRY_BASE_SECONDS)
+        )
+        # not due until the backoff has passed
+        self.assertEqual(claim_jobs(10), [])
+
+        Job.objects.filter(pk=queued.pk).update(run_at=timezone.now())
+        (claimed,) = claim_jobs(10)
+        with self.assertLogs("jobs.services.queue", "ERROR"):
+            self.assertFalse(run_job(claimed))
+        queued.refresh_from_db()
+        self.assertEqual(queued.status, JobStatus.DEAD)
+        self.assertEqual(queued.attempts, 2)
+        self.assertIsNotNone(queued.finished_at)
+        self.assertEqual(claim_jobs(10), [])
+
+    def test_job_of_a_dead_worker_is_claimed_again(self):
+        queued = enqueue("jobs.tests.record")
+        claim_jobs(10)
+        self.assertEqual(claim_jobs(10), [])
+
+        Job.objects.filter(pk=queued.pk).update(
+            locked_at=timezone.now() - LOCK_TIMEOUT - timedelta(seconds=1)
+        )
+        (claimed,) = claim_jobs(10)
+        self.assertEqual(claimed.pk, queued.pk)
+        self.assertEqual(claimed.attempts, 2)
+
+    def test_debounced_triggers_collapse_into_one_pending_job(self):
+        first = enqueue_debounced("jobs.tests.record", "store-1", 60, value=1)
+        self.assertIsNone(enqueue_debounced("jobs.tests.record", "store-1", 60))
+        other = enqueue_debounced("jobs.tests.record", "store-2", 60)
+        self.assertNotEqual(first.pk, other.pk)
+        self.assertEqual(Job.objects.count(), 2)
+        self.assertGreater(first.run_at, timezone.now())
+
+        # once running, the job may have read the data: a new trigger queues
+        Job.objects.filter(pk=first.pk).update(status=JobStatus.RUNNING)
+        self.assertIsNotNone(enqueue_debounced("jobs.tests.record", "store-1", 60))
+
+    def test_requeued_job_is_done_when_its_key_is_queued_again(self):
+        stale = enqueue_debounced("jobs.tests.record", "store-1", 0)
+        claim_jobs(10)
+        Job.objects.filter(pk=stale.pk).update(
+            locked_at=timezone.now() - LOCK_TIMEOUT - timedelta(seconds=1)
+        )
+        newer = enqueue_debounced("jobs.tests.record", "store-1", 60)
+
+        self.assertEqual(claim_jobs(10), [])
+        stale.refresh_from_db()
+        self.assertEqual(stale.status, JobStatus.DONE)
+        self.assertEqual(
+            Job.objects.get(status=JobStatus.PENDING, key="store-1").pk, newer.pk
+        )
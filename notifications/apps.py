@@ -6,6 +6,7 @@ class NotificationsConfig(AppConfig):
     name = "notifications"
 
     def ready(self):
+        import notifications.jobs
         import notifications.signals.accounts
         import notifications.signals.calls
         import notifications.signals.call_transfer
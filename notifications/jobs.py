@@ -0,0 +1,10 @@
+from callLogs.models import CallSession
+from jobs.services.queue import job
+from notifications.signals.calls import notify_new_calls
+
+
+@job("notifications.notify_calls")
+def notify_calls(call_ids):
+    notify_new_calls(
+        CallSession.objects.filter(pk__in=call_ids).only("id", "store_id", "call_type")
+    )
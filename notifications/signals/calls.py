@@ -2,33 +2,62 @@
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 from callLogs.models import CallSession
+from callLogs.signals import calls_completed
+from jobs.services.queue import enqueue
 from notifications.models import Notification, NotificationCategory
-from notifications.utils import get_recipients
+from notifications.utils import get_recipients_by_store
 
+CALL_NOTIFICATIONS = {
+    "AI_RESOLVED": (
+        "AI Resolved Call Completed",
+        "AI successfully resolved the customer call.",
+    ),
+    "WARM_TRANSFER": (
+        "Warm Transfer Completed",
+        "Call successfully transferred to a technician.",
+    ),
+}
 
-@receiver(post_save, sender=CallSession)
-def call_log_notification(sender, instance, created, **kwargs):
-    if not created:
+
+def notify_new_calls(calls):
+    """
+    Create call notifications for many calls with one recipient query
+    and one bulk insert
+    """
+    calls = [call for call in calls if call.call_type in CALL_NOTIFICATIONS]
+    if not calls:
         return
 
-    recipients = get_recipients(instance.store)
+    recipients = get_recipients_by_store({call.store_id for call in calls})
+
+    notifications = []
+    for call in calls:
+        title, message = CALL_NOTIFICATIONS[call.call_type]
+        for user_id in recipients[call.store_id]:
+            notifications.append(
+                Notification(
+                    recipient_id=user_id,
+                    store_id=call.store_id,
+                    category=NotificationCategory.CALLS,
+                    title=title,
+                    message=message,
+                )
+            )
 
-    if instance.call_type == "AI_RESOLVED":
-        title = "AI Resolved Call Completed"
-        message = "AI successfully resolved the customer call."
+    Notification.objects.bulk_create(notifications)
 
-    elif instance.call_type == "WARM_TRANSFER":
-        title = "Warm Transfer Completed"
-        message = "Call successfully transferred to a technician."
 
-    else:
+@receiver(post_save, sender=CallSession)
+def call_log_notification(sender, instance, created, **kwargs):
+    if not created or instance.call_type not in CALL_NOTIFICATIONS:
         return
 
-    for user in recipients:
-        Notification.objects.create(
-            recipient=user,
-            store=instance.store,
-            category=NotificationCategory.CALLS,
-            title=title,
-            message=message,
-        )
+    # sent by the run_jobs worker, off the ingestion request
+    enqueue("notifications.notify_calls", call_ids=[instance.id])
+
+
+@receiver(calls_completed, dispatch_uid="bulk_call_log_notification")
+def bulk_call_log_notification(sender, calls, **kwargs):
+    call_ids = [call.id for call in calls if call.call_type in CALL_NOTIFICATIONS]
+    if call_ids:
+        enqueue("notifications.notify_calls", call_ids=call_ids)
@@ -1,3 +1,4 @@
+from collections import defaultdict
 from django.db.models import Q
 from accounts.models import User, UserRole
 
@@ -6,3 +7,25 @@ def get_recipients(store):
     return User.objects.filter(Q(role=UserRole.SUPER_ADMIN) | Q(store=store)).filter(
         is_active=True
     )
+
+
+def get_recipients_by_store(store_ids):
+    """
+    Recipient user IDs for several stores with a single query
+    """
+    users = (
+        User.objects.filter(
+            Q(role=UserRole.SUPER_ADMIN) | Q(store_id__in=store_ids), is_active=True
+        )
+        .values_list("id", "role", "store_id")
+        .order_by("id")
+    )
+
+    recipients = defaultdict(list)
+    for user_id, role, user_store_id in users:
+        if role == UserRole.SUPER_ADMIN:
+            for store_id in store_ids:
+                recipients[store_id].append(user_id)
+        elif user_store_id in store_ids:
+            recipients[user_store_id].append(user_id)
+    return recipients
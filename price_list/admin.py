@@ -1,9 +1,17 @@
 from django.contrib import admin
-from price_list.models import Category, Brand, RepairType, PriceList, DeviceModel
+from price_list.models import (
+    Category,
+    Brand,
+    RepairType,
+    RepairTypeAlias,
+    PriceList,
+    DeviceModel,
+)
 
 # Register your models here.
 admin.site.register(Category)
 admin.site.register(Brand)
 admin.site.register(RepairType)
+admin.site.register(RepairTypeAlias)
 admin.site.register(DeviceModel)
 admin.site.register(PriceList)
@@ -3,3 +3,7 @@ from django.apps import AppConfig
 
 class PriceListConfig(AppConfig):
     name = 'price_list'
+
+    def ready(self):
+        import price_list.jobs
+        import price_list.signals
@@ -0,0 +1,7 @@
+from jobs.services.queue import job
+from price_list.services.ai_trigger import trigger_ai_rag_update
+
+
+@job("price_list.ai_rag_update")
+def ai_rag_update(store_id):
+    trigger_ai_rag_update(store_id)
@@ -0,0 +1,130 @@
+import random
+import time
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.test import APIRequestFactory, force_authenticate
+from accounts.models import User, UserRole
+from price_list.models import Brand, Category, DeviceModel, PriceList, RepairType
+from price_list.services.quote_index import get_quote, store_quotes
+from price_list.views import PriceListViewSet, QuoteView
+from store.models import Store
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a throwaway price list and compare answering one price "
+        "question through the filtered price list endpoint, the quote "
+        "endpoint and the quote index directly. Everything is rolled back "
+        "at the end."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--devices", type=int, default=500)
+        parser.add_argument("--repair-types", type=int, default=20)
+        parser.add_argument("--lookups", type=int, default=2000)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            store, user, keys = self.seed(options)
+            lookups = [random.choice(keys) for _ in range(options["lookups"])]
+            factory = APIRequestFactory()
+
+            list_view = PriceListViewSet.as_view({"get": "list"})
+            quote_view = QuoteView.as_view()
+
+            def through_list(device_model_id, repair_type_id):
+                request = factory.get(
+                    "/",
+                    {
+                        "store": store.id,
+                        "device_model": device_model_id,
+                        "repair_type": repair_type_id,
+                    },
+                )
+                force_authenticate(request, user)
+                return list_view(request).render()
+
+            def through_quote(device_model_id, repair_type_id):
+                request = factory.get(
+                    "/",
+                    {
+                        "store": store.id,
+                        "device_model": device_model_id,
+                        "repair_type": repair_type_id,
+                    },
+                )
+                force_authenticate(request, user)
+                return quote_view(request).render()
+
+            def through_index(device_model_id, repair_type_id):
+                return get_quote(store.id, device_model_id, repair_type_id)
+
+            started = time.perf_counter()
+            store_quotes(store.id)
+            self.stdout.write(
+                f"Index build: {(time.perf_counter() - started) * 1000:.1f} ms "
+                f"for {len(keys)} prices"
+            )
+
+            for label, lookup in [
+                ("price list endpoint", through_list),
+                ("quote endpoint", through_quote),
+                ("quote index", through_index),
+            ]:
+                self.report(label, lookup, lookups)
+
+            transaction.set_rollback(True)
+
+    def seed(self, options):
+        store = Store.objects.create(name="Bench store", location="bench")
+        user = User.objects.create_user(
+            email="bench-quotes@example.com",
+            password=None,
+            first_name="Bench",
+            last_name="User",
+            role=UserRole.SUPER_ADMIN,
+        )
+        category = Category.objects.create(name="Bench phones")
+        brand = Brand.objects.create(name="Bench", category=category)
+        devices = DeviceModel.objects.bulk_create(
+            [
+                DeviceModel(name=f"Bench phone {i}", brand=brand)
+                for i in range(options["devices"])
+            ]
+        )
+        repair_types = RepairType.objects.bulk_create(
+            [RepairType(name=f"Bench repair {i}") for i in range(options["repair_types"])]
+        )
+
+        self.stdout.write(
+            f"Seeding {len(devices) * len(repair_types)} price list rows ..."
+        )
+        PriceList.objects.bulk_create(
+            [
+                PriceList(
+                    store=store,
+                    category=category,
+                    brand=brand,
+                    device_model=device,
+                    repair_type=repair_type,
+                    price=random.randint(2000, 40000) / 100,
+                )
+                for device in devices
+                for repair_type in repair_types
+            ],
+            batch_size=1000,
+        )
+        keys = [(device.id, repair_type.id) for device in devices for repair_type in repair_types]
+        return store, user, keys
+
+    def report(self, label, lookup, lookups):
+        timings = []
+        for device_model_id, repair_type_id in lookups:
+            started = time.perf_counter()
+            lookup(device_model_id, repair_type_id)
+            timings.append(time.perf_counter() - started)
+        timings.sort()
+        self.stdout.write(
+            f"{label}: median {timings[len(timings) // 2] * 1e6:.0f} us, "
+            f"p95 {timings[int(len(timings) * 0.95)] * 1e6:.0f} us"
+        )
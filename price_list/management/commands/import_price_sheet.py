@@ -0,0 +1,55 @@
+from pathlib import Path
+from django.core.management.base import BaseCommand, CommandError
+from price_list.services.price_import import FORMATS, import_price_sheet
+from store.models import Store
+
+
+class Command(BaseCommand):
+    help = (
+        "Import a wide price sheet (one row per device, one column per repair "
+        "type) into a store's price list, creating missing brands, device "
+        "models and repair types"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path")
+        parser.add_argument("--store", type=int, required=True)
+        parser.add_argument("--brand", required=True)
+        parser.add_argument("--category", required=True)
+        parser.add_argument(
+            "--device-column", help="Column holding the device (default: first)"
+        )
+        parser.add_argument(
+            "--format", choices=FORMATS, help="Default: from the file extension"
+        )
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        path = Path(options["path"])
+        format = options["format"] or path.suffix.lstrip(".").lower()
+        if format not in FORMATS:
+            raise CommandError(f"Unknown format {format!r}, use --format.")
+        if not Store.objects.filter(pk=options["store"]).exists():
+            raise CommandError(f"Store {options['store']} does not exist.")
+
+        try:
+            with open(path, encoding="utf-8-sig", newline="") as stream:
+                stats = import_price_sheet(
+                    stream,
+                    format,
+                    options["store"],
+                    options["brand"],
+                    options["category"],
+                    device_column=options["device_column"],
+                    batch_size=options["batch_size"],
+                )
+        except (OSError, ValueError) as e:
+            raise CommandError(str(e))
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                "Imported {prices} prices ({prices_changed} changed) from {rows} rows "
+                "({devices_created} new devices, {repair_types_created} new "
+                "repair types, {skipped_cells} cells skipped)".format(**stats)
+            )
+        )
@@ -0,0 +1,25 @@
+# Generated by Django 6.0 on 2026-10-17 23:55
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('price_list', '0004_alter_pricelist_unique_together'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RepairTypeAlias',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=200, unique=True)),
+                ('repair_type', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='aliases', to='price_list.repairtype')),
+            ],
+            options={
+                'verbose_name_plural': 'repair type aliases',
+            },
+        ),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 6.0 on 2026-10-18 00:08
+
+from django.db import migrations, models
+
+
+def log_existing_prices(apps, schema_editor):
+    # existing rows as INSERTs, so since=0 returns the whole price list
+    PriceList = apps.get_model("price_list", "PriceList")
+    PriceListChange = apps.get_model("price_list", "PriceListChange")
+
+    batch = []
+    for row in (
+        PriceList.objects.order_by("store_id", "id")
+        .values_list("id", "store_id", "device_model_id", "repair_type_id")
+        .iterator(chunk_size=2000)
+    ):
+        pk, store_id, device_model_id, repair_type_id = row
+        batch.append(
+            PriceListChange(
+                store_id=store_id,
+                price_list_id=pk,
+                device_model_id=device_model_id,
+                repair_type_id=repair_type_id,
+                action="INSERT",
+            )
+        )
+        if len(batch) >= 2000:
+            PriceListChange.objects.bulk_create(batch)
+            batch = []
+    PriceListChange.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('price_list', '0005_repairtypealias'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PriceListChange',
+            fields=[
+                ('seq', models.BigAutoField(primary_key=True, serialize=False)),
+                ('store_id', models.BigIntegerField()),
+                ('price_list_id', models.BigIntegerField()),
+                ('device_model_id', models.BigIntegerField()),
+                ('repair_type_id', models.BigIntegerField()),
+                ('action', models.CharField(choices=[('INSERT', 'Insert'), ('UPDATE', 'Update'), ('DELETE', 'Delete')], max_length=10)),
+                ('changed_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['store_id', 'seq'], name='pricelistchange_store_idx')],
+            },
+        ),
+        migrations.RunPython(log_existing_prices, migrations.RunPython.noop),
+    ]
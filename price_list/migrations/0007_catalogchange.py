@@ -0,0 +1,30 @@
+# Generated by Django 6.0 on 2026-10-18 12:40
+
+from django.db import migrations, models
+
+
+def add_first_entry(apps, schema_editor):
+    # writers lock the first entry of the log (see record_catalog_changes);
+    # brand 0 does not exist, so applying it changes nothing
+    CatalogChange = apps.get_model("price_list", "CatalogChange")
+    CatalogChange.objects.create(kind="brand", object_id=0)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('price_list', '0006_pricelistchange'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CatalogChange',
+            fields=[
+                ('seq', models.BigAutoField(primary_key=True, serialize=False)),
+                ('kind', models.CharField(choices=[('device', 'Device model'), ('brand', 'Brand'), ('repair_type', 'Repair type')], max_length=20)),
+                ('object_id', models.BigIntegerField()),
+                ('changed_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.RunPython(add_first_entry, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 6.0 on 2026-10-18 14:30
+
+from django.db import migrations, models
+
+
+def add_lock_row(apps, schema_editor):
+    # locked by writers of the change log (see record_catalog_changes)
+    CatalogChangeLock = apps.get_model("price_list", "CatalogChangeLock")
+    CatalogChangeLock.objects.create(pk=1)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('price_list', '0007_catalogchange'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CatalogChangeLock',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+            ],
+        ),
+        migrations.RunPython(add_lock_row, migrations.RunPython.noop),
+    ]
@@ -40,6 +40,24 @@ class RepairType(models.Model):
         return self.name
 
 
+class RepairTypeAlias(models.Model):
+    """
+    Other names callers and the AI use for a repair type
+    ("screen" for "Glass/LCD")
+    """
+
+    repair_type = models.ForeignKey(
+        RepairType, on_delete=models.CASCADE, related_name="aliases"
+    )
+    name = models.CharField(max_length=200, unique=True)
+
+    class Meta:
+        verbose_name_plural = "repair type aliases"
+
+    def __str__(self):
+        return f"{self.name} -> {self.repair_type_id}"
+
+
 class ServiceStatus(models.TextChoices):
     ACTIVE = "ACTIVE", "Active"
     DISABLED = "DISABLED", "Disabled"
@@ -80,3 +98,61 @@ class PriceList(models.Model):
 
     def __str__(self):
         return f"PriceList #{self.id} - {self.price}"
+
+
+class PriceListChangeAction(models.TextChoices):
+    INSERT = "INSERT", "Insert"
+    UPDATE = "UPDATE", "Update"
+    DELETE = "DELETE", "Delete"
+
+
+class PriceListChange(models.Model):
+    """
+    Change log of PriceList rows for the RAG indexer's delta feed.
+    Plain IDs instead of foreign keys: entries outlive the rows they
+    describe.
+    """
+
+    seq = models.BigAutoField(primary_key=True)
+    store_id = models.BigIntegerField()
+    price_list_id = models.BigIntegerField()
+    device_model_id = models.BigIntegerField()
+    repair_type_id = models.BigIntegerField()
+    action = models.CharField(max_length=10, choices=PriceListChangeAction.choices)
+    changed_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["store_id", "seq"], name="pricelistchange_store_idx"),
+        ]
+
+    def __str__(self):
+        return f"#{self.seq} {self.action} {self.price_list_id}"
+
+
+class CatalogChangeKind(models.TextChoices):
+    DEVICE = "device", "Device model"
+    BRAND = "brand", "Brand"
+    REPAIR_TYPE = "repair_type", "Repair type"
+
+
+class CatalogChange(models.Model):
+    """
+    Change log of catalog names for the catalog resolver's in-process
+    indexes: each process applies the entries after the last one it saw.
+    """
+
+    seq = models.BigAutoField(primary_key=True)
+    kind = models.CharField(max_length=20, choices=CatalogChangeKind.choices)
+    object_id = models.BigIntegerField()
+    changed_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"#{self.seq} {self.kind} {self.object_id}"
+
+
+class CatalogChangeLock(models.Model):
+    """
+    Single row locked by writers of the CatalogChange log, so entries
+    commit in seq order (see record_catalog_changes)
+    """
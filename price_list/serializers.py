@@ -88,3 +88,53 @@ class PriceListWriteSerializer(serializers.ModelSerializer):
             "price",
             "status",
         ]
+
+
+class QuoteQuerySerializer(serializers.Serializer):
+    store = serializers.IntegerField(required=False)
+    device_model = serializers.IntegerField()
+    repair_type = serializers.IntegerField()
+
+
+class QuoteSerializer(serializers.Serializer):
+    """
+    Reads price_list.services.quote_index.Quote entries
+    """
+
+    id = serializers.IntegerField()
+    device_model = serializers.IntegerField(source="device_model_id")
+    device_model_name = serializers.CharField()
+    brand_name = serializers.CharField()
+    repair_type = serializers.IntegerField(source="repair_type_id")
+    repair_type_name = serializers.CharField()
+    price = serializers.DecimalField(max_digits=10, decimal_places=2)
+    status = serializers.CharField()
+
+
+class CatalogResolveQuerySerializer(serializers.Serializer):
+    q = serializers.CharField(max_length=200)
+    limit = serializers.IntegerField(min_value=1, max_value=20, default=5)
+
+
+class PriceSheetImportSerializer(serializers.Serializer):
+    file = serializers.FileField()
+    brand = serializers.CharField(max_length=100)
+    category = serializers.CharField(max_length=200)
+    device_column = serializers.CharField(required=False, allow_blank=True)
+    format = serializers.ChoiceField(choices=["json", "csv"], required=False)
+
+    def validate(self, attrs):
+        if not attrs.get("format"):
+            extension = attrs["file"].name.rsplit(".", 1)[-1].lower()
+            if extension not in ("json", "csv"):
+                raise serializers.ValidationError(
+                    {"format": "Can not tell the format from the file name."}
+                )
+            attrs["format"] = extension
+        return attrs
+
+
+class PriceDeltaQuerySerializer(serializers.Serializer):
+    store = serializers.IntegerField(required=False)
+    since = serializers.IntegerField(min_value=0, default=0)
+    limit = serializers.IntegerField(min_value=1, default=500)
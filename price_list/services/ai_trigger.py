@@ -1,14 +1,30 @@
-import requests
-import logging
-from decouple import config
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from jobs.services.http import session
+from jobs.services.queue import enqueue_debounced
 
-logger = logging.getLogger(__name__)
 
-AI_RAG_URL = config("AI_RAG_URL")
+def trigger_ai_rag_update(store_id):
+    """
+    Ask the AI to re-index a store's price list. Raises on failure so
+    the job is retried.
+    """
+    if not settings.AI_RAG_URL:
+        raise ImproperlyConfigured("AI_RAG_URL is not set.")
+    response = session.post(
+        settings.AI_RAG_URL, json={"store_id": store_id}, timeout=5
+    )
+    response.raise_for_status()
 
 
-def trigger_ai_rag_update():
-    try:
-        requests.post(AI_RAG_URL, timeout=5)
-    except Exception as e:
-        logger.error(f"AI RAG trigger failed: {str(e)}")
+def schedule_ai_rag_update(store_id):
+    """
+    Queue a RAG refresh for the store; refreshes scheduled within
+    AI_TRIGGER_DEBOUNCE_SECONDS of each other are sent once
+    """
+    enqueue_debounced(
+        "price_list.ai_rag_update",
+        f"store:{store_id}",
+        settings.AI_TRIGGER_DEBOUNCE_SECONDS,
+        store_id=store_id,
+    )
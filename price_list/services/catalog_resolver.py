@@ -0,0 +1,432 @@
+import re
+import threading
+import time
+from collections import namedtuple
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Max, Q
+from price_list.models import (
+    CatalogChange,
+    CatalogChangeKind,
+    CatalogChangeLock,
+    DeviceModel,
+    RepairType,
+    RepairTypeAlias,
+)
+from price_list.services.repair_type_names import normalize_name
+
+# Catalog changes are appended to the CatalogChange log in the same
+# transaction as the change itself. Each process reads the log at most
+# once per CACHE_GENERATION_CHECK_SECONDS (at once after its own writes),
+# applies the entries it has not seen to a copy of its index and swaps
+# the copy in, and rebuilds from scratch when it fell too far behind.
+# Writers keep only the last MAX_REPLAY + 1 entries: a process older than
+# all of them reads more than MAX_REPLAY and rebuilds.
+MAX_REPLAY = 500
+
+DEVICE = CatalogChangeKind.DEVICE
+BRAND = CatalogChangeKind.BRAND
+REPAIR_TYPE = CatalogChangeKind.REPAIR_TYPE
+
+# query tokens without an exact match are matched against vocabulary
+# tokens sharing a trigram and at most one typo away, two from
+# LONG_TOKEN letters on ("galxy" -> "galaxy", "batery" -> "battery")
+LONG_TOKEN = 6
+BRAND_BONUS = 0.05
+
+ONES = {
+    word: number
+    for number, word in enumerate(
+        "zero one two three four five six seven eight nine ten eleven twelve "
+        "thirteen fourteen fifteen sixteen seventeen eighteen nineteen".split()
+    )
+}
+TENS = {
+    word: number * 10
+    for number, word in enumerate(
+        "twenty thirty forty fifty sixty seventy eighty ninety".split(), start=2
+    )
+}
+
+Device = namedtuple(
+    "Device", ["id", "name", "brand_id", "brand_name", "tokens", "brand_tokens"]
+)
+Repair = namedtuple("Repair", ["id", "name", "names"])
+
+
+def tokenize(text):
+    """
+    "Galaxy S-Twenty two" -> ["galaxy", "s", "22"]
+
+    Splits letter / digit runs ("s22" -> "s", "22") and turns spoken
+    numbers into digits, so names and speech produce the same tokens.
+    """
+    words = re.findall(r"[^\W\d_]+|\d+", normalize_name(text))
+    tokens = []
+    i = 0
+    while i < len(words):
+        word = words[i]
+        if word in TENS:
+            number = TENS[word]
+            if i + 1 < len(words) and 0 < ONES.get(words[i + 1], 0) < 10:
+                number += ONES[words[i + 1]]
+                i += 1
+            tokens.append(str(number))
+        elif word in ONES:
+            tokens.append(str(ONES[word]))
+        else:
+            tokens.append(word)
+        i += 1
+    return tokens
+
+
+def trigrams(token):
+    padded = f" {token} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+def edit_distance(a, b, limit):
+    """
+    Typos (insertions, deletions, substitutions, swaps of neighbouring
+    letters) between a and b, or limit + 1 once there are more than limit
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous = None
+    row = list(range(len(b) + 1))
+    for i, x in enumerate(a, 1):
+        before, previous, row = previous, row, [i]
+        for j, y in enumerate(b, 1):
+            distance = min(
+                previous[j] + 1, row[j - 1] + 1, previous[j - 1] + (x != y)
+            )
+            if i > 1 and j > 1 and x == b[j - 2] and a[i - 2] == y:
+                distance = min(distance, before[j - 2] + 1)
+            row.append(distance)
+        if min(row) > limit:
+            return limit + 1
+    return row[-1]
+
+
+class CatalogIndex:
+    """
+    Token index over device model names (with their brand) and repair
+    type names and aliases. Entries are added and removed one at a time,
+    so catalog changes are applied without a rebuild; an index in use is
+    never changed, the changes go to a copy().
+    """
+
+    def __init__(self):
+        self.devices = {}
+        self.repairs = {}
+        # token -> {(kind, id)}
+        self.postings = {}
+        # vocabulary token -> number of entries using it, trigram -> tokens
+        self.vocabulary = {}
+        self.trigram_tokens = {}
+
+    def copy(self):
+        index = CatalogIndex()
+        index.devices = dict(self.devices)
+        index.repairs = dict(self.repairs)
+        index.postings = {token: set(keys) for token, keys in self.postings.items()}
+        index.vocabulary = dict(self.vocabulary)
+        index.trigram_tokens = {
+            gram: set(tokens) for gram, tokens in self.trigram_tokens.items()
+        }
+        return index
+
+    def _index_tokens(self, key, tokens):
+        for token in tokens:
+            self.postings.setdefault(token, set()).add(key)
+            if token not in self.vocabulary:
+                self.vocabulary[token] = 0
+                for gram in trigrams(token):
+                    self.trigram_tokens.setdefault(gram, set()).add(token)
+            self.vocabulary[token] += 1
+
+    def _unindex_tokens(self, key, tokens):
+        for token in tokens:
+            self.postings[token].discard(key)
+            if not self.postings[token]:
+                del self.postings[token]
+            self.vocabulary[token] -= 1
+            if not self.vocabulary[token]:
+                del self.vocabulary[token]
+                for gram in trigrams(token):
+                    self.trigram_tokens[gram].discard(token)
+
+    def set_device(self, device_id, name, brand_id, brand_name):
+        self.remove_device(device_id)
+        tokens = tuple(dict.fromkeys(tokenize(name)))
+        device = Device(
+            device_id,
+            name,
+            brand_id,
+            brand_name,
+            tokens,
+            tuple(t for t in tokenize(brand_name) if t not in tokens),
+        )
+        self.devices[device_id] = device
+        self._index_tokens((DEVICE, device_id), {*device.tokens, *device.brand_tokens})
+
+    def remove_device(self, device_id):
+        device = self.devices.pop(device_id, None)
+        if device is not None:
+            self._unindex_tokens(
+                (DEVICE, device_id), {*device.tokens, *device.brand_tokens}
+            )
+
+    def set_repair_type(self, repair_type_id, name, aliases):
+        self.remove_repair_type(repair_type_id)
+        names = tuple(
+            (label, tuple(dict.fromkeys(tokenize(label))))
+            for label in dict.fromkeys([name, *aliases])
+        )
+        self.repairs[repair_type_id] = Repair(repair_type_id, name, names)
+        self._index_tokens(
+            (REPAIR_TYPE, repair_type_id),
+            {token for _, tokens in names for token in tokens},
+        )
+
+    def remove_repair_type(self, repair_type_id):
+        repair = self.repairs.pop(repair_type_id, None)
+        if repair is not None:
+            self._unindex_tokens(
+                (REPAIR_TYPE, repair_type_id),
+                {token for _, tokens in repair.names for token in tokens},
+            )
+
+    def _expand(self, token):
+        """
+        Vocabulary tokens a query token stands for, with a weight
+        """
+        if token in self.vocabulary:
+            return {token: 1.0}
+        # numbers and very short tokens must match exactly
+        if token.isdigit() or len(token) < 3:
+            return {}
+
+        limit = 2 if len(token) >= LONG_TOKEN else 1
+        candidates = set()
+        for gram in trigrams(token):
+            candidates.update(self.trigram_tokens.get(gram, ()))
+
+        matches = {}
+        for candidate in candidates:
+            distance = edit_distance(token, candidate, limit)
+            if distance <= limit:
+                matches[candidate] = 1 - distance / max(len(token), len(candidate))
+        return matches
+
+    def _match(self, tokens):
+        """
+        {(kind, id): {vocabulary token: weight}} of entries sharing a token
+        with the query
+        """
+        matched = {}
+        for token in tokens:
+            for candidate, weight in self._expand(token).items():
+                for key in self.postings.get(candidate, ()):
+                    entry = matched.setdefault(key, {})
+                    entry[candidate] = max(entry.get(candidate, 0), weight)
+        return matched
+
+    @staticmethod
+    def _score(name_tokens, matched):
+        """
+        (share of the name's tokens found in the query, tokens found):
+        a full name beats a partial one, a longer full name a shorter one
+        """
+        hits = sum(matched.get(token, 0) for token in name_tokens)
+        return hits / len(name_tokens), hits
+
+    def resolve(self, text, limit=5):
+        """
+        Ranked [(score, Device or None, Repair or None)] for a free text
+        query
+        """
+        devices = []
+        repairs = []
+        for (kind, pk), matched in self._match(tokenize(text)).items():
+            if kind == DEVICE:
+                device = self.devices[pk]
+                share, hits = self._score(device.tokens, matched)
+                # the brand only breaks ties ("galaxy" of Samsung vs others)
+                if any(t in matched for t in device.brand_tokens):
+                    hits += BRAND_BONUS
+                if share:
+                    devices.append(((share, hits), device))
+            else:
+                repair = self.repairs[pk]
+                score = max(
+                    self._score(name_tokens, matched)
+                    for _, name_tokens in repair.names
+                )
+                if score[0]:
+                    repairs.append((score, repair))
+
+        if not devices and not repairs:
+            return []
+        devices = sorted(devices, key=lambda item: item[0], reverse=True)[:limit]
+        repairs = sorted(repairs, key=lambda item: item[0], reverse=True)[:limit]
+
+        # one side unmatched: candidates for the other side only
+        candidates = [
+            (
+                (device_share * repair_share, device_hits + repair_hits),
+                device,
+                repair,
+            )
+            for (device_share, device_hits), device in devices or [((1, 0), None)]
+            for (repair_share, repair_hits), repair in repairs or [((1, 0), None)]
+        ]
+        candidates.sort(key=lambda item: item[0], reverse=True)
+        return [
+            (round(score, 3), device, repair)
+            for (score, _), device, repair in candidates[:limit]
+        ]
+
+
+_lock = threading.Lock()
+# built: (seq of the last change applied, CatalogIndex), replaced as a
+# whole; checked: monotonic time the log was last read, None to read it
+# on the next lookup
+_state = {"built": None, "checked": None}
+
+
+def _check_log_now():
+    _state["checked"] = None
+
+
+def record_catalog_changes(changes):
+    """
+    Log [(kind, pk)] catalog changes for every process to apply to its
+    index, and prune the entries no process replays any more.
+
+    The CatalogChangeLock row stays locked until the surrounding
+    transaction commits, so entries commit in seq order and a process
+    that saw seq N never gets a smaller seq later.
+    """
+    if not changes:
+        return
+    with transaction.atomic():
+        CatalogChangeLock.objects.select_for_update().get_or_create(pk=1)
+        CatalogChange.objects.bulk_create(
+            [CatalogChange(kind=kind, object_id=pk) for kind, pk in changes]
+        )
+        oldest_kept = list(
+            CatalogChange.objects.order_by("-seq").values_list("seq", flat=True)[
+                MAX_REPLAY : MAX_REPLAY + 1
+            ]
+        )
+        if oldest_kept:
+            CatalogChange.objects.filter(seq__lt=oldest_kept[0]).delete()
+
+    # this process sees its own changes on the next lookup
+    _check_log_now()
+    transaction.on_commit(_check_log_now)
+
+
+def record_catalog_change(kind, pk):
+    record_catalog_changes([(kind, pk)])
+
+
+def _changes_after(seq):
+    return list(
+        CatalogChange.objects.filter(seq__gt=seq)
+        .order_by("seq")
+        .values_list("seq", "kind", "object_id")[: MAX_REPLAY + 1]
+    )
+
+
+def _load_devices(index, devices):
+    for pk, name, brand_id, brand_name in devices.values_list(
+        "id", "name", "brand_id", "brand__name"
+    ):
+        index.set_device(pk, name, brand_id, brand_name)
+
+
+def _load_repair_types(index, repair_types):
+    aliases = {}
+    for repair_type_id, name in RepairTypeAlias.objects.filter(
+        repair_type__in=repair_types
+    ).values_list("repair_type_id", "name"):
+        aliases.setdefault(repair_type_id, []).append(name)
+    for pk, name in repair_types.values_list("id", "name"):
+        index.set_repair_type(pk, name, aliases.get(pk, []))
+
+
+def _build_index():
+    index = CatalogIndex()
+    _load_devices(index, DeviceModel.objects.all())
+    _load_repair_types(index, RepairType.objects.all())
+    return index
+
+
+def _apply_changes(index, changes):
+    device_ids = {pk for kind, pk in changes if kind == DEVICE}
+    brand_ids = {pk for kind, pk in changes if kind == BRAND}
+    repair_type_ids = {pk for kind, pk in changes if kind == REPAIR_TYPE}
+
+    # a renamed brand changes the tokens of all its devices
+    device_ids |= {
+        device.id for device in index.devices.values() if device.brand_id in brand_ids
+    }
+    if device_ids or brand_ids:
+        for pk in device_ids:
+            index.remove_device(pk)
+        _load_devices(
+            index,
+            DeviceModel.objects.filter(Q(id__in=device_ids) | Q(brand_id__in=brand_ids)),
+        )
+    if repair_type_ids:
+        for pk in repair_type_ids:
+            index.remove_repair_type(pk)
+        _load_repair_types(index, RepairType.objects.filter(id__in=repair_type_ids))
+
+
+def catalog_index():
+    """
+    The process's CatalogIndex, brought up to date with the change log
+    """
+    now = time.monotonic()
+    built = _state["built"]
+    checked = _state.get("checked")
+    if (
+        built is not None
+        and checked is not None
+        and now - checked < settings.CACHE_GENERATION_CHECK_SECONDS
+    ):
+        return built[1]
+
+    changes = None if built is None else _changes_after(built[0])
+    if changes == []:
+        _state["checked"] = now
+        return built[1]
+
+    with _lock:
+        if _state["built"] is not built:
+            # another thread caught up meanwhile
+            built = _state["built"]
+            changes = None if built is None else _changes_after(built[0])
+            if changes == []:
+                _state["checked"] = now
+                return built[1]
+
+        if changes is None or len(changes) > MAX_REPLAY:
+            # entries logged while building are applied again later, which
+            # changes nothing
+            sequence = CatalogChange.objects.aggregate(seq=Max("seq"))["seq"] or 0
+            index = _build_index()
+        else:
+            sequence = changes[-1][0]
+            index = built[1].copy()
+            _apply_changes(index, [(kind, pk) for _, kind, pk in changes])
+        _state["built"] = (sequence, index)
+        _state["checked"] = now
+    return index
+
+
+def resolve_catalog(text, limit=5):
+    return catalog_index().resolve(text, limit)
@@ -0,0 +1,122 @@
+from django.db import transaction
+from django.db.models import F
+from price_list.models import (
+    PriceList,
+    PriceListChange,
+    PriceListChangeAction,
+)
+from store.models import Store
+
+MAX_DELTA_LIMIT = 1000
+
+
+def record_price_changes(store_id, changes):
+    """
+    Log [(action, price_list_id, device_model_id, repair_type_id)] of one
+    store.
+
+    The store row stays locked until the surrounding transaction commits,
+    so a store's changes commit in seq order and a reader that saw seq N
+    never gets a smaller seq for that store later.
+    """
+    if not changes:
+        return
+    with transaction.atomic():
+        list(Store.objects.select_for_update().filter(pk=store_id).values_list("pk"))
+        PriceListChange.objects.bulk_create(
+            [
+                PriceListChange(
+                    store_id=store_id,
+                    price_list_id=price_list_id,
+                    device_model_id=device_model_id,
+                    repair_type_id=repair_type_id,
+                    action=action,
+                )
+                for action, price_list_id, device_model_id, repair_type_id in changes
+            ]
+        )
+
+
+def record_price_list_updates(price_lists):
+    """
+    Log UPDATE for the rows of a PriceList queryset, e.g. the rows showing
+    a renamed brand, so the delta feed sends their new names
+    """
+    changes = {}
+    for pk, store_id, device_model_id, repair_type_id in price_lists.order_by(
+        "store_id", "id"
+    ).values_list("id", "store_id", "device_model_id", "repair_type_id"):
+        changes.setdefault(store_id, []).append(
+            (PriceListChangeAction.UPDATE, pk, device_model_id, repair_type_id)
+        )
+    # stores locked in ID order, so concurrent renames can not deadlock
+    for store_id, store_changes in changes.items():
+        record_price_changes(store_id, store_changes)
+
+
+def build_price_delta(store_id, since, limit):
+    """
+    PriceList rows of a store changed after seq since, latest state only,
+    denormalized with category / brand / model / repair type names.
+    Rows deleted since are reported as DELETE with their IDs.
+    """
+    log = list(
+        PriceListChange.objects.filter(store_id=store_id, seq__gt=since)
+        .order_by("seq")
+        .values_list(
+            "seq", "price_list_id", "device_model_id", "repair_type_id", "action"
+        )[: limit + 1]
+    )
+    has_more = len(log) > limit
+    log = log[:limit]
+
+    # several changes of a row in the page: its current state once
+    latest = {}
+    for entry in log:
+        latest[entry[1]] = entry
+
+    current = {
+        row["id"]: row
+        for row in PriceList.objects.filter(
+            id__in=[
+                pk
+                for pk, entry in latest.items()
+                if entry[4] != PriceListChangeAction.DELETE
+            ]
+        ).values(
+            "id",
+            "price",
+            "status",
+            "updated_at",
+            category_name=F("device_model__brand__category__name"),
+            brand_name=F("device_model__brand__name"),
+            device_model_name=F("device_model__name"),
+            repair_type_name=F("repair_type__name"),
+        )
+    }
+
+    changes = []
+    for seq, pk, device_model_id, repair_type_id, action in sorted(
+        latest.values()
+    ):
+        row = current.get(pk)
+        change = {
+            "seq": seq,
+            # deleted after this page: the delete is in a later one
+            "action": action if row else PriceListChangeAction.DELETE,
+            "id": pk,
+            "device_model": device_model_id,
+            "repair_type": repair_type_id,
+        }
+        if row:
+            # as PriceListReadSerializer renders it
+            change.update(row, price=str(row["price"]))
+        changes.append(change)
+
+    return {
+        "store": store_id,
+        "since": since,
+        "next_since": log[-1][0] if log else since,
+        "has_more": has_more,
+        "changes": changes,
+    }
@@ -0,0 +1,313 @@
+import csv
+import json
+import re
+from decimal import Decimal, InvalidOperation
+from django.db import transaction
+from django.utils import timezone
+from price_list.models import (
+    Brand,
+    Category,
+    DeviceModel,
+    PriceList,
+    PriceListChangeAction,
+    RepairType,
+)
+from price_list.services.ai_trigger import schedule_ai_rag_update
+from price_list.services.catalog_resolver import (
+    DEVICE,
+    REPAIR_TYPE,
+    record_catalog_changes,
+)
+from price_list.services.price_changes import record_price_changes
+from price_list.services.quote_index import bump_store_quotes
+from price_list.services.repair_type_names import (
+    invalidate_repair_type_names,
+    normalize_name,
+    repair_type_names,
+)
+
+# Price sheets are wide: one row per device, one column per repair type,
+# e.g. {"iPads": "ipad air 2", "Glass/LCD": "$199.99", "Battery": "N/A"}.
+# Cells that are not a price ("", "N/A", "Glass/LCD" pointing at another
+# column) are skipped; a trailing "*" footnote marker is ignored.
+
+FORMATS = ("json", "csv")
+PRICE_RE = re.compile(r"^\$?\s*(\d[\d,]*(?:\.\d+)?)\s*\**$")
+READ_SIZE = 64 * 1024
+
+
+def parse_price(value):
+    """
+    "$1,164.99*" -> Decimal("1164.99"), None when the cell holds no price
+    """
+    match = PRICE_RE.match(str(value).strip())
+    if not match:
+        return None
+    try:
+        return Decimal(match.group(1).replace(",", "")).quantize(Decimal("0.01"))
+    except InvalidOperation:
+        return None
+
+
+def iter_json_rows(stream):
+    """
+    Objects of a top-level JSON array, decoded one at a time so the whole
+    file is never held in memory
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    started = False
+    eof = False
+
+    while True:
+        buffer = buffer.lstrip()
+        if not started:
+            if not buffer and not eof:
+                chunk = stream.read(READ_SIZE)
+                eof = not chunk
+                buffer += chunk
+                continue
+            if not buffer.startswith("["):
+                raise ValueError("Price sheet must be a JSON array of rows.")
+            buffer = buffer[1:]
+            started = True
+            continue
+
+        if buffer.startswith(","):
+            buffer = buffer[1:]
+            continue
+        if buffer.startswith("]"):
+            return
+
+        try:
+            row, end = decoder.raw_decode(buffer)
+        except json.JSONDecodeError:
+            if eof:
+                raise ValueError("Price sheet is not valid JSON.")
+            chunk = stream.read(READ_SIZE)
+            eof = not chunk
+            buffer += chunk
+            continue
+
+        if not isinstance(row, dict):
+            raise ValueError("Price sheet rows must be JSON objects.")
+        yield row
+        buffer = buffer[end:]
+
+
+def iter_sheet_rows(stream, format):
+    if format == "json":
+        return iter_json_rows(stream)
+    if format == "csv":
+        return csv.DictReader(stream)
+    raise ValueError(f"Unknown price sheet format {format!r}.")
+
+
+def _batches(rows, size):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class PriceSheetImport:
+    """
+    Upserts the PriceList rows of one store from wide price sheet rows,
+    creating missing Brand / DeviceModel / RepairType rows on the way
+    """
+
+    def __init__(self, store_id, brand_name, category_name, device_column=None):
+        self.store_id = store_id
+        self.device_column = device_column
+        self.category, _ = Category.objects.get_or_create(name=category_name.strip())
+        self.brand, _ = Brand.objects.get_or_create(
+            name=brand_name.strip(), category=self.category
+        )
+        self.devices = {
+            normalize_name(name): pk
+            for pk, name in DeviceModel.objects.filter(brand=self.brand).values_list(
+                "id", "name"
+            )
+        }
+        self.repair_types = dict(repair_type_names())
+        self.created_devices = []
+        self.created_repair_types = []
+        self.stats = {
+            "rows": 0,
+            "prices": 0,
+            "prices_changed": 0,
+            "skipped_cells": 0,
+            "devices_created": 0,
+            "repair_types_created": 0,
+        }
+
+    def _device_column(self, row):
+        if self.device_column is None:
+            # the first column holds the device ("iPads": "ipad air 2")
+            self.device_column = next(iter(row))
+        return self.device_column
+
+    def _create_missing(self, mapping, names, create):
+        missing = {}
+        for name in names:
+            key = normalize_name(name)
+            if key and key not in mapping:
+                missing.setdefault(key, name)
+        if missing:
+            created = create(list(missing.values()))
+            for key, obj in zip(missing, created):
+                mapping[key] = obj.pk
+        return [mapping[key] for key in missing]
+
+    def _import_batch(self, rows):
+        device_column = self._device_column(rows[0])
+        cells = []
+        for row in rows:
+            self.stats["rows"] += 1
+            device = str(row.get(device_column) or "").strip()
+            if not device:
+                self.stats["skipped_cells"] += len(row) - 1
+                continue
+            for column, value in row.items():
+                if column == device_column:
+                    continue
+                repair_type = str(column or "").strip().rstrip("*").strip()
+                price = parse_price(value or "")
+                if price is None or not repair_type:
+                    self.stats["skipped_cells"] += 1
+                    continue
+                cells.append((device, repair_type, price))
+
+        created = self._create_missing(
+            self.devices,
+            [device for device, _, _ in cells],
+            lambda names: DeviceModel.objects.bulk_create(
+                [DeviceModel(name=name, brand=self.brand) for name in names]
+            ),
+        )
+        self.created_devices += created
+        created = self._create_missing(
+            self.repair_types,
+            [repair_type for _, repair_type, _ in cells],
+            lambda names: RepairType.objects.bulk_create(
+                [RepairType(name=name) for name in names]
+            ),
+        )
+        self.created_repair_types += created
+
+        # one price per (device, repair type): the last cell of the sheet wins
+        prices = {}
+        for device, repair_type, price in cells:
+            key = (
+                self.devices[normalize_name(device)],
+                self.repair_types[normalize_name(repair_type)],
+            )
+            prices[key] = price
+
+        # unchanged prices are not written (nor logged for the delta feed)
+        existing = {
+            (device_model_id, repair_type_id): (pk, price, brand_id)
+            for pk, device_model_id, repair_type_id, price, brand_id in (
+                PriceList.objects.filter(
+                    store_id=self.store_id,
+                    device_model_id__in={key[0] for key in prices},
+                    repair_type_id__in={key[1] for key in prices},
+                ).values_list(
+                    "id", "device_model_id", "repair_type_id", "price", "brand_id"
+                )
+            )
+        }
+        self.stats["prices"] += len(prices)
+        prices = {
+            key: price
+            for key, price in prices.items()
+            if key not in existing
+            or existing[key][1:] != (price, self.brand.pk)
+        }
+        if not prices:
+            return
+
+        now = timezone.now()
+        PriceList.objects.bulk_create(
+            [
+                PriceList(
+                    store_id=self.store_id,
+                    category=self.category,
+                    brand=self.brand,
+                    device_model_id=device_model_id,
+                    repair_type_id=repair_type_id,
+                    price=price,
+                    created_at=now,
+                    updated_at=now,
+                )
+                for (device_model_id, repair_type_id), price in prices.items()
+            ],
+            update_conflicts=True,
+            unique_fields=["store", "device_model", "repair_type"],
+            update_fields=["category", "brand", "price", "updated_at"],
+        )
+        self.stats["prices_changed"] += len(prices)
+
+        # bulk_create sends no signals: log the changes the way the
+        # PriceList save signal does
+        inserted = PriceList.objects.filter(
+            store_id=self.store_id,
+            device_model_id__in={key[0] for key in prices if key not in existing},
+            repair_type_id__in={key[1] for key in prices if key not in existing},
+        ).values_list("id", "device_model_id", "repair_type_id")
+        changes = [
+            (PriceListChangeAction.INSERT, pk, device_model_id, repair_type_id)
+            for pk, device_model_id, repair_type_id in inserted
+            if (device_model_id, repair_type_id) in prices
+            and (device_model_id, repair_type_id) not in existing
+        ] + [
+            (PriceListChangeAction.UPDATE, existing[key][0], *key)
+            for key in prices
+            if key in existing
+        ]
+        record_price_changes(self.store_id, changes)
+
+    def run(self, rows, batch_size=500):
+        for batch in _batches(rows, batch_size):
+            self._import_batch(batch)
+        self.stats["devices_created"] = len(self.created_devices)
+        self.stats["repair_types_created"] = len(self.created_repair_types)
+        # bulk_create sends no signals: log what the save signals would have
+        record_catalog_changes(
+            [(DEVICE, pk) for pk in self.created_devices]
+            + [(REPAIR_TYPE, pk) for pk in self.created_repair_types]
+        )
+        return self.stats
+
+    def after_commit(self):
+        # bulk_create sends no signals: refresh what the save signals would
+        # have
+        if self.created_repair_types:
+            invalidate_repair_type_names()
+        bump_store_quotes([self.store_id])
+
+
+def import_price_sheet(
+    stream,
+    format,
+    store_id,
+    brand_name,
+    category_name,
+    device_column=None,
+    batch_size=500,
+):
+    """
+    Import a wide price sheet (JSON array or CSV) into a store's price
+    list. All or nothing; returns counters of what was imported.
+    """
+    with transaction.atomic():
+        importer = PriceSheetImport(store_id, brand_name, category_name, device_column)
+        stats = importer.run(iter_sheet_rows(stream, format), batch_size)
+        transaction.on_commit(importer.after_commit)
+        # one AI refresh for the whole sheet
+        schedule_ai_rag_update(store_id)
+    return stats
@@ -0,0 +1,88 @@
+import threading
+from collections import namedtuple
+from api.generations import bump_generations, get_generations
+from price_list.models import PriceList
+
+# Generation counters, one per store plus one for the catalog (device
+# model / repair type names), read through api.generations: a price edit
+# made through one process reaches the indexes of all others within
+# CACHE_GENERATION_CHECK_SECONDS, without a cache round trip per lookup.
+# A PriceList write bumps its store after commit, a catalog rename bumps
+# every store; each process rebuilds a store index when the generations
+# it was built from are no longer current.
+STORE_GENERATION_KEY = "price_quotes:gen:{}"
+CATALOG_GENERATION_KEY = "price_quotes:gen:catalog"
+
+Quote = namedtuple(
+    "Quote",
+    [
+        "id",
+        "price",
+        "status",
+        "device_model_id",
+        "device_model_name",
+        "brand_name",
+        "repair_type_id",
+        "repair_type_name",
+    ],
+)
+
+_lock = threading.Lock()
+# store_id -> (generations, {(device_model_id, repair_type_id): Quote})
+_indexes = {}
+
+
+def _generations(store_id):
+    return tuple(
+        get_generations([STORE_GENERATION_KEY.format(store_id), CATALOG_GENERATION_KEY])
+    )
+
+
+def bump_store_quotes(store_ids):
+    bump_generations([STORE_GENERATION_KEY.format(store_id) for store_id in store_ids])
+
+
+def bump_catalog_quotes():
+    bump_generations([CATALOG_GENERATION_KEY])
+
+
+def _build_index(store_id):
+    quotes = (
+        Quote(*row)
+        for row in PriceList.objects.filter(store_id=store_id).values_list(
+            "id",
+            "price",
+            "status",
+            "device_model_id",
+            "device_model__name",
+            "device_model__brand__name",
+            "repair_type_id",
+            "repair_type__name",
+        )
+    )
+    return {(quote.device_model_id, quote.repair_type_id): quote for quote in quotes}
+
+
+def store_quotes(store_id):
+    """
+    {(device_model_id, repair_type_id): Quote} of a store, built on first
+    use and again after the store's price list changed
+    """
+    generations = _generations(store_id)
+    built = _indexes.get(store_id)
+    if built is not None and built[0] == generations:
+        return built[1]
+
+    with _lock:
+        built = _indexes.get(store_id)
+        if built is None or built[0] != generations:
+            built = (generations, _build_index(store_id))
+            _indexes[store_id] = built
+    return built[1]
+
+
+def get_quote(store_id, device_model_id, repair_type_id):
+    """
+    Quote for a repair at a store, or None when the store has no price
+    """
+    return store_quotes(store_id).get((device_model_id, repair_type_id))
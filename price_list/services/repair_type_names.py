@@ -0,0 +1,64 @@
+import re
+import threading
+from api.generations import bump_generations, get_generations
+from price_list.models import RepairType, RepairTypeAlias
+
+# Bumped on every RepairType / RepairTypeAlias write; each process rebuilds
+# its map when the version it was built from is no longer current. The
+# version is read through api.generations, so a write in any web worker
+# or the run_jobs worker reaches every other one within
+# CACHE_GENERATION_CHECK_SECONDS, and ingestion pays no cache round trip
+# per call.
+VERSION_KEY = "repair_type_names:version"
+
+_lock = threading.Lock()
+_state = {"version": None, "names": {}}
+
+
+def normalize_name(value):
+    """
+    "  Glass/LCD " -> "glass lcd"
+    """
+    return " ".join(re.sub(r"[\W_]+", " ", value.casefold()).split())
+
+
+def _current_version():
+    return get_generations([VERSION_KEY])[0]
+
+
+def invalidate_repair_type_names():
+    bump_generations([VERSION_KEY])
+
+
+def repair_type_names():
+    """
+    {normalized name or alias: RepairType ID}, built once per version
+    """
+    version = _current_version()
+    if _state["version"] == version:
+        return _state["names"]
+
+    with _lock:
+        if _state["version"] != version:
+            names = {}
+            for pk, name in RepairTypeAlias.objects.values_list(
+                "repair_type_id", "name"
+            ):
+                names[normalize_name(name)] = pk
+            # real names win over aliases
+            for pk, name in RepairType.objects.order_by("-pk").values_list(
+                "pk", "name"
+            ):
+                names[normalize_name(name)] = pk
+            _state["names"] = names
+            _state["version"] = version
+    return _state["names"]
+
+
+def resolve_repair_type_id(name):
+    """
+    RepairType ID for a name or alias as the AI reports it, or None
+    """
+    if not name:
+        return None
+    return repair_type_names().get(normalize_name(name))
@@ -0,0 +1,141 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from price_list.models import (
+    Brand,
+    Category,
+    DeviceModel,
+    PriceList,
+    PriceListChangeAction,
+    RepairType,
+    RepairTypeAlias,
+)
+from price_list.services.catalog_resolver import (
+    BRAND,
+    DEVICE,
+    REPAIR_TYPE,
+    record_catalog_change,
+)
+from price_list.services.price_changes import (
+    record_price_changes,
+    record_price_list_updates,
+)
+from price_list.services.quote_index import bump_catalog_quotes, bump_store_quotes
+from price_list.services.repair_type_names import invalidate_repair_type_names
+
+
+@receiver(post_save, sender=RepairType, dispatch_uid="repair_type_names")
+@receiver(post_delete, sender=RepairType, dispatch_uid="repair_type_names_delete")
+@receiver(post_save, sender=RepairTypeAlias, dispatch_uid="repair_type_alias_names")
+@receiver(
+    post_delete, sender=RepairTypeAlias, dispatch_uid="repair_type_alias_names_delete"
+)
+def invalidate_names(sender, **kwargs):
+    transaction.on_commit(invalidate_repair_type_names)
+
+
+@receiver(post_save, sender=PriceList, dispatch_uid="price_list_quotes")
+@receiver(post_delete, sender=PriceList, dispatch_uid="price_list_quotes_delete")
+def invalidate_store_quotes(sender, instance, **kwargs):
+    transaction.on_commit(lambda: bump_store_quotes([instance.store_id]))
+
+
+@receiver(post_save, sender=DeviceModel, dispatch_uid="device_model_quotes")
+@receiver(post_save, sender=Brand, dispatch_uid="brand_quotes")
+@receiver(post_save, sender=RepairType, dispatch_uid="repair_type_quotes")
+def invalidate_catalog_quotes(sender, created, **kwargs):
+    # quotes carry the names; new catalog rows have no prices yet
+    if not created:
+        transaction.on_commit(bump_catalog_quotes)
+
+
+@receiver(post_save, sender=DeviceModel, dispatch_uid="device_model_resolver")
+@receiver(post_delete, sender=DeviceModel, dispatch_uid="device_model_resolver_delete")
+def device_model_changed(sender, instance, **kwargs):
+    # logged in the transaction of the change, see record_catalog_changes
+    record_catalog_change(DEVICE, instance.pk)
+
+
+@receiver(post_save, sender=Brand, dispatch_uid="brand_resolver")
+def brand_changed(sender, instance, created, **kwargs):
+    # deleting a brand deletes its devices, which are recorded one by one
+    if not created:
+        record_catalog_change(BRAND, instance.pk)
+
+
+@receiver(post_save, sender=RepairType, dispatch_uid="repair_type_resolver")
+@receiver(post_delete, sender=RepairType, dispatch_uid="repair_type_resolver_delete")
+def repair_type_changed(sender, instance, **kwargs):
+    record_catalog_change(REPAIR_TYPE, instance.pk)
+
+
+@receiver(post_save, sender=RepairTypeAlias, dispatch_uid="repair_type_alias_resolver")
+@receiver(
+    post_delete,
+    sender=RepairTypeAlias,
+    dispatch_uid="repair_type_alias_resolver_delete",
+)
+def repair_type_alias_changed(sender, instance, **kwargs):
+    record_catalog_change(REPAIR_TYPE, instance.repair_type_id)
+
+
+@receiver(post_save, sender=PriceList, dispatch_uid="price_list_change_log")
+def log_price_list_save(sender, instance, created, **kwargs):
+    action = PriceListChangeAction.INSERT if created else PriceListChangeAction.UPDATE
+    record_price_changes(
+        instance.store_id,
+        [(action, instance.pk, instance.device_model_id, instance.repair_type_id)],
+    )
+
+
+@receiver(post_delete, sender=PriceList, dispatch_uid="price_list_change_log_delete")
+def log_price_list_delete(sender, instance, **kwargs):
+    record_price_changes(
+        instance.store_id,
+        [
+            (
+                PriceListChangeAction.DELETE,
+                instance.pk,
+                instance.device_model_id,
+                instance.repair_type_id,
+            )
+        ],
+    )
+
+
+# catalog fields shown in the delta feed entries of PriceList rows, and the
+# lookup from a PriceList row to the catalog row
+CATALOG_DELTA_FIELDS = {
+    Category: (("name",), "device_model__brand__category"),
+    Brand: (("name", "category_id"), "device_model__brand"),
+    DeviceModel: (("name", "brand_id"), "device_model"),
+    RepairType: (("name",), "repair_type"),
+}
+
+
+@receiver(pre_save, sender=Category, dispatch_uid="category_delta_before")
+@receiver(pre_save, sender=Brand, dispatch_uid="brand_delta_before")
+@receiver(pre_save, sender=DeviceModel, dispatch_uid="device_model_delta_before")
+@receiver(pre_save, sender=RepairType, dispatch_uid="repair_type_delta_before")
+def remember_catalog_names(sender, instance, **kwargs):
+    instance._delta_before = None
+    if not instance._state.adding:
+        fields, _ = CATALOG_DELTA_FIELDS[sender]
+        instance._delta_before = (
+            sender.objects.filter(pk=instance.pk).values_list(*fields).first()
+        )
+
+
+@receiver(post_save, sender=Category, dispatch_uid="category_delta")
+@receiver(post_save, sender=Brand, dispatch_uid="brand_delta")
+@receiver(post_save, sender=DeviceModel, dispatch_uid="device_model_delta")
+@receiver(post_save, sender=RepairType, dispatch_uid="repair_type_delta")
+def log_catalog_rename(sender, instance, created, **kwargs):
+    # the delta feed shows the names: the PriceList rows of a renamed
+    # catalog row changed too
+    fields, lookup = CATALOG_DELTA_FIELDS[sender]
+    before = getattr(instance, "_delta_before", None)
+    if created or before is None:
+        return
+    if before != tuple(getattr(instance, field) for field in fields):
+        record_price_list_updates(PriceList.objects.filter(**{lookup: instance.pk}))
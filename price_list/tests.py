@@ -1,3 +1,351 @@
-from django.test import TestCase
+import json
+import threading
+from datetime import timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+from accounts.models import User, UserRole
+from jobs.models import Job, JobStatus
+from jobs.services.queue import claim_jobs, run_job
+from price_list.models import (
+    Brand,
+    CatalogChange,
+    CatalogChangeKind,
+    Category,
+    DeviceModel,
+    PriceList,
+    PriceListChangeAction,
+    RepairType,
+    RepairTypeAlias,
+)
+from price_list.services import catalog_resolver
+from price_list.services.ai_trigger import schedule_ai_rag_update
+from price_list.services.catalog_resolver import resolve_catalog, tokenize
+from price_list.services.price_changes import build_price_delta
+from store.models import Store
 
-# Create your tests here.
+
+class StubAIServer(ThreadingHTTPServer):
+    """
+    Local stand-in for the AI service: records the JSON bodies it gets
+    and answers with the queued status codes (200 once they run out)
+    """
+
+    def __init__(self):
+        self.requests = []
+        self.statuses = []
+        super().__init__(("127.0.0.1", 0), StubAIHandler)
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_port}/rag"
+
+
+class StubAIHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        self.server.requests.append(json.loads(body))
+        status = self.server.statuses.pop(0) if self.server.statuses else 200
+        self.send_response(status)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+@override_settings(JOBS_EAGER=False, AI_TRIGGER_DEBOUNCE_SECONDS=30)
+class AIRagTriggerTests(TestCase):
+    def setUp(self):
+        self.server = StubAIServer()
+        thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        url = override_settings(AI_RAG_URL=self.server.url)
+        url.enable()
+        self.addCleanup(url.disable)
+
+        self.store_a = Store.objects.create(name="A", location="Dhaka")
+        self.store_b = Store.objects.create(name="B", location="Dhaka")
+
+    def run_due_jobs(self):
+        # jump past the debounce window
+        Job.objects.filter(status=JobStatus.PENDING).update(run_at=timezone.now())
+        for claimed in claim_jobs(100):
+            run_job(claimed)
+
+    def test_burst_collapses_into_one_request_per_store(self):
+        for _ in range(50):
+            schedule_ai_rag_update(self.store_a.id)
+        for _ in range(5):
+            schedule_ai_rag_update(self.store_b.id)
+
+        pending = Job.objects.get(key=f"store:{self.store_a.id}")
+        self.assertGreater(pending.run_at, timezone.now() + timedelta(seconds=20))
+        self.assertEqual(self.server.requests, [])
+
+        self.run_due_jobs()
+
+        self.assertCountEqual(
+            self.server.requests,
+            [{"store_id": self.store_a.id}, {"store_id": self.store_b.id}],
+        )
+
+        # a change after the refresh was sent schedules a new one
+        schedule_ai_rag_update(self.store_a.id)
+        self.run_due_jobs()
+        self.assertEqual(len(self.server.requests), 3)
+
+    def test_failed_refresh_is_retried_with_backoff(self):
+        self.server.statuses = [503]
+        schedule_ai_rag_update(self.store_a.id)
+        self.run_due_jobs()
+
+        job = Job.objects.get()
+        self.assertEqual(job.status, JobStatus.PENDING)
+        self.assertEqual(job.attempts, 1)
+        self.assertGreater(job.run_at, timezone.now())
+
+        # triggers during the backoff join the pending retry
+        schedule_ai_rag_update(self.store_a.id)
+        self.assertEqual(Job.objects.count(), 1)
+
+        self.run_due_jobs()
+        job.refresh_from_db()
+        self.assertEqual(job.status, JobStatus.DONE)
+        self.assertEqual(len(self.server.requests), 2)
+
+    def test_trigger_during_a_failed_run_supersedes_the_retry(self):
+        self.server.statuses = [503]
+        schedule_ai_rag_update(self.store_a.id)
+        Job.objects.update(run_at=timezone.now())
+        (claimed,) = claim_jobs(10)
+
+        # the running job no longer counts as pending
+        schedule_ai_rag_update(self.store_a.id)
+        run_job(claimed)
+
+        claimed.refresh_from_db()
+        self.assertEqual(claimed.status, JobStatus.DONE)
+        self.assertEqual(Job.objects.filter(status=JobStatus.PENDING).count(), 1)
+
+    @override_settings(JOBS_EAGER=True, AI_TRIGGER_DEBOUNCE_SECONDS=0)
+    def test_eager_failure_is_not_raised(self):
+        self.server.statuses = [503]
+        with mock.patch("jobs.services.queue.threading.Timer") as timer:
+            with self.captureOnCommitCallbacks(execute=True):
+                schedule_ai_rag_update(self.store_a.id)
+                schedule_ai_rag_update(self.store_a.id)
+        # one debounced run for the burst
+        timer.assert_called_once()
+        _, run, args = timer.call_args.args
+        # the timer thread closes its own connection, not the test's
+        with mock.patch("jobs.services.queue.connections"):
+            run(*args)
+        self.assertEqual(len(self.server.requests), 1)
+        self.assertEqual(Job.objects.count(), 0)
+
+
+class CatalogResolverTests(TestCase):
+    def setUp(self):
+        # the process's index outlives the rolled back test transactions
+        patcher = mock.patch.dict(catalog_resolver._state, {"built": None})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        phones = Category.objects.create(name="Phones")
+        self.samsung = Brand.objects.create(name="Samsung", category=phones)
+        self.apple = Brand.objects.create(name="Apple", category=phones)
+        self.s22 = DeviceModel.objects.create(name="Galaxy S22", brand=self.samsung)
+        DeviceModel.objects.create(name="Galaxy S21", brand=self.samsung)
+        DeviceModel.objects.create(name="iPhone 13", brand=self.apple)
+        self.battery = RepairType.objects.create(name="Battery")
+        self.screen = RepairType.objects.create(name="Glass/LCD")
+        RepairTypeAlias.objects.create(repair_type=self.screen, name="cracked screen")
+
+    def best(self, text):
+        score, device, repair = resolve_catalog(text)[0]
+        return score, device and device.name, repair and repair.name
+
+    def test_tokenize(self):
+        self.assertEqual(tokenize("Galaxy S-Twenty two"), ["galaxy", "s", "22"])
+        self.assertEqual(tokenize("iPhone13 Pro"), ["iphone", "13", "pro"])
+        self.assertEqual(tokenize("forty"), ["40"])
+        self.assertEqual(tokenize("twenty zero"), ["20", "0"])
+
+    def test_resolves_spoken_and_misspelled_names(self):
+        self.assertEqual(
+            self.best("galaxy s twenty two battery"), (1.0, "Galaxy S22", "Battery")
+        )
+        score, device, repair = self.best("galxy s twenty two batery")
+        self.assertEqual((device, repair), ("Galaxy S22", "Battery"))
+        self.assertGreater(score, 0.8)
+        self.assertEqual(
+            self.best("iphon 13 cracked screen")[1:], ("iPhone 13", "Glass/LCD")
+        )
+
+    def test_unrelated_words_do_not_match(self):
+        self.assertEqual(resolve_catalog("hello there"), [])
+
+    def test_catalog_changes_reach_the_index(self):
+        self.assertEqual(self.best("galaxy s22")[1], "Galaxy S22")
+        self.s22.name = "Galaxy S23"
+        self.s22.save()
+        self.assertEqual(self.best("galaxy s23")[1], "Galaxy S23")
+
+        self.samsung.name = "Samsung Mobile"
+        self.samsung.save()
+        device = resolve_catalog("galaxy s23")[0][1]
+        self.assertEqual(device.brand_name, "Samsung Mobile")
+
+        self.battery.delete()
+        self.assertEqual(self.best("galaxy s23 battery")[2], None)
+
+    @override_settings(CACHE_GENERATION_CHECK_SECONDS=60)
+    def test_log_is_read_once_per_interval_and_pruned(self):
+        self.best("galaxy s22")
+        with self.assertNumQueries(0):
+            self.best("galaxy s22")
+
+        # a change made by another process shows up after the interval
+        CatalogChange.objects.create(
+            kind=CatalogChangeKind.DEVICE, object_id=self.s22.pk
+        )
+        DeviceModel.objects.filter(pk=self.s22.pk).update(name="Galaxy S23")
+        self.assertEqual(self.best("galaxy s22")[1], "Galaxy S22")
+        with mock.patch.dict(catalog_resolver._state, {"checked": None}):
+            self.assertEqual(self.best("galaxy s23")[1], "Galaxy S23")
+
+        with mock.patch.object(catalog_resolver, "MAX_REPLAY", 3):
+            for name in ["A", "B", "C", "D", "E"]:
+                RepairType.objects.create(name=name)
+            self.assertEqual(CatalogChange.objects.count(), 4)
+            # this process's own changes are seen at once
+            self.assertEqual(self.best("e")[2], "E")
+
+
+@override_settings(JOBS_EAGER=False)
+class PriceSheetImportTests(TestCase):
+    def setUp(self):
+        self.store = Store.objects.create(name="A", location="Dhaka")
+        self.other_store = Store.objects.create(name="B", location="Dhaka")
+        self.admin = User.objects.create_user(
+            email="admin@example.com",
+            password="secret",
+            first_name="Super",
+            last_name="Admin",
+            role=UserRole.SUPER_ADMIN,
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def upload(self, name, content, store=None):
+        url = "/api/v1/services/price-list/import/"
+        if store is not None:
+            url += f"?store={store}"
+        # the name / quote caches are refreshed once the import commits
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(
+                url,
+                {
+                    "file": SimpleUploadedFile(name, content.encode()),
+                    "brand": "Apple",
+                    "category": "Tablets",
+                },
+            )
+
+    def test_sheet_is_imported_then_upserted(self):
+        sheet = [
+            {"iPads": "ipad 2", "Glass": "$89.99", "Battery*": "$1,099.00"},
+            {"iPads": "ipad air", "Glass": "N/A", "Battery*": "$99.99"},
+        ]
+        response = self.upload("ipad.json", json.dumps(sheet), self.store.id)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(
+            response.data,
+            {
+                "rows": 2,
+                "prices": 3,
+                "prices_changed": 3,
+                "skipped_cells": 1,
+                "devices_created": 2,
+                "repair_types_created": 2,
+            },
+        )
+        price = PriceList.objects.get(
+            store=self.store, device_model__name="ipad 2", repair_type__name="Battery"
+        )
+        self.assertEqual(str(price.price), "1099.00")
+        # one AI refresh for the whole sheet
+        self.assertEqual(Job.objects.filter(key=f"store:{self.store.id}").count(), 1)
+
+        csv_sheet = "iPads,Glass,Battery\nipad 2,$89.99,$79.99\n"
+        response = self.upload("ipad.csv", csv_sheet, self.store.id)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(
+            (response.data["prices"], response.data["prices_changed"]), (2, 1)
+        )
+        self.assertEqual(response.data["devices_created"], 0)
+        price.refresh_from_db()
+        self.assertEqual(str(price.price), "79.99")
+        self.assertEqual(PriceList.objects.count(), 3)
+
+    def test_unknown_store_and_bad_sheets_are_rejected(self):
+        sheet = json.dumps([{"iPads": "ipad 2", "Glass": "$89.99"}])
+        for store in (None, "abc", self.other_store.id + 1000):
+            response = self.upload("ipad.json", sheet, store)
+            self.assertEqual(response.status_code, 400)
+            self.assertIn("store", response.data)
+
+        response = self.upload("ipad.json", '{"iPads": "ipad 2"}', self.store.id)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("file", response.data)
+        self.assertFalse(PriceList.objects.exists())
+        self.assertFalse(DeviceModel.objects.exists())
+
+    def test_manager_imports_into_their_own_store(self):
+        manager = User.objects.create_user(
+            email="manager@example.com",
+            password="secret",
+            first_name="Store",
+            last_name="Manager",
+            store=self.store,
+            role=UserRole.STORE_MANAGER,
+        )
+        self.client.force_authenticate(manager)
+        sheet = json.dumps([{"iPads": "ipad 2", "Glass": "$89.99"}])
+        response = self.upload("ipad.json", sheet, self.other_store.id)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(PriceList.objects.get().store, self.store)
+
+
+class PriceDeltaTests(TestCase):
+    def test_catalog_rename_updates_the_delta_feed(self):
+        store = Store.objects.create(name="A", location="Dhaka")
+        phones = Category.objects.create(name="Phones")
+        brand = Brand.objects.create(name="Samsung", category=phones)
+        device = DeviceModel.objects.create(name="Galaxy S22", brand=brand)
+        battery = RepairType.objects.create(name="Battery")
+        price = PriceList.objects.create(
+            store=store,
+            category=phones,
+            brand=brand,
+            device_model=device,
+            repair_type=battery,
+            price="99.00",
+        )
+        since = build_price_delta(store.id, 0, 100)["next_since"]
+
+        brand.save()
+        self.assertEqual(build_price_delta(store.id, since, 100)["changes"], [])
+
+        brand.name = "Samsung Mobile"
+        brand.save()
+        (change,) = build_price_delta(store.id, since, 100)["changes"]
+        self.assertEqual(change["id"], price.id)
+        self.assertEqual(change["action"], PriceListChangeAction.UPDATE)
+        self.assertEqual(change["brand_name"], "Samsung Mobile")
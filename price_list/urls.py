@@ -1,3 +1,4 @@
+from django.urls import path
 from rest_framework.routers import DefaultRouter
 from price_list.views import (
     CategoryViewSet,
@@ -5,6 +6,8 @@ from price_list.views import (
     DeviceModelViewSet,
     RepairTypeViewSet,
     PriceListViewSet,
+    QuoteView,
+    CatalogResolveView,
 )
 
 router = DefaultRouter()
@@ -15,3 +18,7 @@ router.register("repair-types", RepairTypeViewSet)
 router.register("price-list", PriceListViewSet, basename="price-list")
 
 urlpatterns = router.urls
+urlpatterns += [
+    path("quote/", QuoteView.as_view(), name="quote"),
+    path("resolve/", CatalogResolveView.as_view(), name="catalog-resolve"),
+]
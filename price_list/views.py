@@ -1,15 +1,26 @@
 from django_filters.rest_framework import DjangoFilterBackend
+from django.db import transaction
 from django.db.models import F, Q
-from rest_framework import viewsets, serializers
+import io
+from rest_framework import viewsets, serializers, status
+from rest_framework.decorators import action
+from rest_framework.parsers import FormParser, MultiPartParser
+from rest_framework.response import Response
+from rest_framework.views import APIView
 from api.permissions import PriceListPermission
 from price_list.models import Category, Brand, PriceList, RepairType, DeviceModel
 from price_list import serializers as sz, priceListFilter
 from accounts.models import UserRole
-from price_list.services.ai_trigger import trigger_ai_rag_update
+from price_list.services.ai_trigger import schedule_ai_rag_update
+from price_list.services.catalog_resolver import resolve_catalog
+from price_list.services.price_changes import MAX_DELTA_LIMIT, build_price_delta
+from price_list.services.price_import import import_price_sheet
+from price_list.services.quote_index import get_quote
+from store.models import Store
 
 # from services.ai_trigger import trigger_ai_rag_update
 from drf_yasg.utils import swagger_auto_schema
-import threading
+from drf_yasg import openapi
 
 
 class CategoryViewSet(viewsets.ModelViewSet):
@@ -327,6 +338,8 @@ class PriceListViewSet(viewsets.ModelViewSet):
             qs = qs.filter(store=user.store)
         return qs
 
+    # the row and its PriceListChange entry commit together
+    @transaction.atomic
     def perform_create(self, serializer):
         user = self.request.user
 
@@ -355,11 +368,16 @@ class PriceListViewSet(viewsets.ModelViewSet):
                 brand=device.brand,
                 store_id=store_id,
             )
-        threading.Thread(target=trigger_ai_rag_update).start()
+        schedule_ai_rag_update(serializer.instance.store_id)
 
+    @transaction.atomic
     def perform_update(self, serializer):
         serializer.save()
-        threading.Thread(target=trigger_ai_rag_update).start()
+        schedule_ai_rag_update(serializer.instance.store_id)
+
+    @transaction.atomic
+    def perform_destroy(self, instance):
+        instance.delete()
 
     def get_serializer_class(self):
         if self.action in ["list", "retrieve"]:
@@ -409,6 +427,142 @@ class PriceListViewSet(viewsets.ModelViewSet):
     def partial_update(self, request, *args, **kwargs):
         return super().partial_update(request, *args, **kwargs)
 
+    @swagger_auto_schema(
+        method="post",
+        operation_summary="Import a price sheet",
+        operation_description=(
+            "Upload a wide price sheet (JSON array or CSV): one row per "
+            "device, one column per repair type, prices like `$89.99`. "
+            "Missing brands, device models and repair types are created and "
+            "prices are upserted for the store. Cells without a price "
+            "(`N/A`, empty) are skipped. The AI is refreshed once at the end.\n\n"
+            "Super Admin: `store` query param is required."
+        ),
+        manual_parameters=[
+            openapi.Parameter(
+                "file", openapi.IN_FORM, type=openapi.TYPE_FILE, required=True
+            ),
+            openapi.Parameter(
+                "brand", openapi.IN_FORM, type=openapi.TYPE_STRING, required=True
+            ),
+            openapi.Parameter(
+                "category", openapi.IN_FORM, type=openapi.TYPE_STRING, required=True
+            ),
+            openapi.Parameter(
+                "device_column",
+                openapi.IN_FORM,
+                description="Column holding the device (default: first column)",
+                type=openapi.TYPE_STRING,
+                required=False,
+            ),
+            openapi.Parameter(
+                "format",
+                openapi.IN_FORM,
+                description="json / csv (default: from the file name)",
+                type=openapi.TYPE_STRING,
+                required=False,
+            ),
+        ],
+        tags=["Price List"],
+    )
+    @action(
+        detail=False,
+        methods=["post"],
+        url_path="import",
+        parser_classes=[MultiPartParser, FormParser],
+    )
+    def import_sheet(self, request):
+        serializer = sz.PriceSheetImportSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        user = request.user
+        if user.role == UserRole.SUPER_ADMIN:
+            store_id = request.query_params.get("store")
+            if not store_id:
+                raise serializers.ValidationError(
+                    {"store": "store query param is required for super admin"}
+                )
+            store = Store.objects.filter(pk=store_id) if store_id.isdigit() else None
+            if not store or not store.exists():
+                raise serializers.ValidationError({"store": "Store not found."})
+            store_id = int(store_id)
+        else:
+            store_id = user.store_id
+
+        stream = io.TextIOWrapper(data["file"], encoding="utf-8-sig", newline="")
+        try:
+            stats = import_price_sheet(
+                stream,
+                data["format"],
+                store_id,
+                data["brand"],
+                data["category"],
+                device_column=data.get("device_column") or None,
+            )
+        except ValueError as e:
+            return Response({"file": [str(e)]}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response(stats, status=status.HTTP_201_CREATED)
+
+    @swagger_auto_schema(
+        method="get",
+        operation_summary="Price list changes since a sequence number",
+        operation_description=(
+            "Delta feed for the RAG indexer: price list rows of a store "
+            "inserted, updated or deleted after `since`, latest state only, "
+            "with category, brand, model and repair type names. Pass the "
+            "returned `next_since` on the next call; `has_more` means another "
+            "page is ready.\n\n"
+            "Super Admin: `store` query param is required."
+        ),
+        manual_parameters=[
+            openapi.Parameter(
+                "store",
+                openapi.IN_QUERY,
+                description="Store ID (required for Super Admin)",
+                type=openapi.TYPE_INTEGER,
+                required=False,
+            ),
+            openapi.Parameter(
+                "since",
+                openapi.IN_QUERY,
+                description="Last sequence number seen (default 0: everything)",
+                type=openapi.TYPE_INTEGER,
+                required=False,
+            ),
+            openapi.Parameter(
+                "limit",
+                openapi.IN_QUERY,
+                description=f"Changes per page (default 500, max {MAX_DELTA_LIMIT})",
+                type=openapi.TYPE_INTEGER,
+                required=False,
+            ),
+        ],
+        tags=["Price List"],
+    )
+    @action(detail=False, methods=["get"], url_path="changes")
+    def changes(self, request):
+        query = sz.PriceDeltaQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        params = query.validated_data
+
+        user = request.user
+        if user.role == UserRole.SUPER_ADMIN:
+            store_id = params.get("store")
+            if store_id is None:
+                raise serializers.ValidationError(
+                    {"store": "store query param is required for super admin"}
+                )
+        else:
+            store_id = user.store_id
+
+        return Response(
+            build_price_delta(
+                store_id, params["since"], min(params["limit"], MAX_DELTA_LIMIT)
+            )
+        )
+
     @swagger_auto_schema(
         operation_summary="Delete price list entry",
         responses={204: "No Content"},
@@ -416,3 +570,123 @@ class PriceListViewSet(viewsets.ModelViewSet):
     )
     def destroy(self, request, *args, **kwargs):
         return super().destroy(request, *args, **kwargs)
+
+
+class QuoteView(APIView):
+    """
+    Price of one repair at one store, for the AI price question path.
+    Served from an in-process per-store index instead of the price list
+    query.
+    Role-based:
+    - Staff / Store Manager: their store
+    - Super Admin: store query param is required
+    """
+
+    permission_classes = [PriceListPermission]
+
+    @swagger_auto_schema(
+        operation_summary="Quote a repair",
+        operation_description=(
+            "Price and status of a repair type for a device model at a "
+            "store. 404 when the store has no price for it."
+        ),
+        tags=["Price List"],
+        manual_parameters=[
+            openapi.Parameter(
+                "store",
+                openapi.IN_QUERY,
+                description="Store ID (required for Super Admin)",
+                type=openapi.TYPE_INTEGER,
+                required=False,
+            ),
+            openapi.Parameter(
+                "device_model",
+                openapi.IN_QUERY,
+                description="Device model ID",
+                type=openapi.TYPE_INTEGER,
+                required=True,
+            ),
+            openapi.Parameter(
+                "repair_type",
+                openapi.IN_QUERY,
+                description="Repair type ID",
+                type=openapi.TYPE_INTEGER,
+                required=True,
+            ),
+        ],
+        responses={200: sz.QuoteSerializer()},
+    )
+    def get(self, request):
+        query = sz.QuoteQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        params = query.validated_data
+
+        if request.user.role == UserRole.SUPER_ADMIN:
+            store_id = params.get("store")
+            if store_id is None:
+                raise serializers.ValidationError(
+                    {"store": "store query param is required for super admin"}
+                )
+        else:
+            store_id = request.user.store_id
+
+        quote = get_quote(store_id, params["device_model"], params["repair_type"])
+        if quote is None:
+            return Response({"detail": "No price for this repair."}, status=404)
+        return Response(sz.QuoteSerializer(quote).data)
+
+
+class CatalogResolveView(APIView):
+    """
+    Map spoken device / repair names to ranked catalog candidates
+    """
+
+    permission_classes = [PriceListPermission]
+
+    @swagger_auto_schema(
+        operation_summary="Resolve device and repair names",
+        operation_description=(
+            "Ranked (device model, repair type) candidates for free text such "
+            "as `galaxy s twenty two screen`. Spoken numbers are read as "
+            "digits and words up to two typos off still match. "
+            "`device_model` or `repair_type` is null when the text names only "
+            "the other one."
+        ),
+        tags=["Price List"],
+        manual_parameters=[
+            openapi.Parameter(
+                "q",
+                openapi.IN_QUERY,
+                description="Text as the caller said it",
+                type=openapi.TYPE_STRING,
+                required=True,
+            ),
+            openapi.Parameter(
+                "limit",
+                openapi.IN_QUERY,
+                description="Number of candidates (1-20, default 5)",
+                type=openapi.TYPE_INTEGER,
+                required=False,
+            ),
+        ],
+    )
+    def get(self, request):
+        query = sz.CatalogResolveQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        params = query.validated_data
+
+        return Response(
+            [
+                {
+                    "score": score,
+                    "device_model": device and device.id,
+                    "device_model_name": device and device.name,
+                    "brand_name": device and device.brand_name,
+                    "repair_type": repair and repair.id,
+                    "repair_type_name": repair and repair.name,
+                }
+                for score, device, repair in resolve_catalog(
+                    params["q"], params["limit"]
+                )
+            ]
+        )